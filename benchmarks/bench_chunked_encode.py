@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Chunked Encode Benchmark.
+
+Compares wall time of the single-process timeline encode against the
+segment-parallel chunked encode (segments joined by stream copy) on a
+synthetic deck. Run it on a many-core machine; with one core both paths
+take about the same time.
+
+Usage:
+    python benchmarks/bench_chunked_encode.py
+    python benchmarks/bench_chunked_encode.py --slides 30 --workers 4 8 16
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_composer import CPU_COUNT, DEFAULT_FPS, DEFAULT_RESOLUTION, VideoComposer
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+DEFAULT_SLIDES = 12
+DEFAULT_SLIDE_DURATION = 3
+DEFAULT_TRANSITION_DURATION = 2
+
+
+# =============================================================================
+# Synthetic Deck
+# =============================================================================
+
+def build_deck(
+    composer: VideoComposer,
+    work_dir: str,
+    num_slides: int,
+    slide_duration: float,
+    transition_duration: float,
+    resolution: str,
+    fps: int,
+) -> List[Dict[str, Any]]:
+    """Create slide images and transition clips and return their timeline."""
+    timeline: List[Dict[str, Any]] = []
+
+    for i in range(num_slides):
+        image_path = os.path.join(work_dir, f"slide-{i + 1:02d}.png")
+        subprocess.run(
+            [
+                composer.ffmpeg_path, "-v", "error", "-y",
+                "-f", "lavfi", "-i", f"testsrc2=s={resolution}:d=1",
+                "-vf", f"hue=h={i * 30}", "-frames:v", "1",
+                image_path,
+            ],
+            check=True,
+        )
+
+        if i > 0:
+            transition_path = os.path.join(work_dir, f"transition-{i:02d}.mp4")
+            subprocess.run(
+                [
+                    composer.ffmpeg_path, "-v", "error", "-y",
+                    "-f", "lavfi",
+                    "-i", f"testsrc2=s={resolution}:r={fps}:d={transition_duration}",
+                    "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+                    transition_path,
+                ],
+                check=True,
+            )
+            timeline.append({
+                "type": "video",
+                "path": transition_path,
+                "label": f"transition-{i:02d}",
+            })
+
+        timeline.append({
+            "type": "image",
+            "path": image_path,
+            "duration": slide_duration,
+            "label": f"slide-{i + 1:02d}",
+        })
+
+    return timeline
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def bench(
+    composer: VideoComposer,
+    timeline: List[Dict[str, Any]],
+    output_path: str,
+    resolution: str,
+    fps: int,
+    chunked: bool,
+    max_workers: Optional[int] = None,
+) -> float:
+    """Measure wall time of one timeline encode (NaN on failure)."""
+    start = time.perf_counter()
+    ok = composer.encode_timeline(
+        timeline, output_path, resolution, fps,
+        chunked=chunked, max_workers=max_workers,
+    )
+    return time.perf_counter() - start if ok else float("nan")
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark chunked timeline encoding")
+    parser.add_argument("--slides", type=int, default=DEFAULT_SLIDES, help="Slides in the deck")
+    parser.add_argument("--slide-duration", type=float, default=DEFAULT_SLIDE_DURATION)
+    parser.add_argument("--transition-duration", type=float, default=DEFAULT_TRANSITION_DURATION)
+    parser.add_argument("--resolution", default=DEFAULT_RESOLUTION)
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS)
+    parser.add_argument("--workers", type=int, nargs="+", default=[CPU_COUNT],
+                        help="Segment worker counts to try (default: CPU count)")
+    args = parser.parse_args()
+
+    composer = VideoComposer()
+
+    with tempfile.TemporaryDirectory(prefix="bench_chunked_") as work_dir:
+        print("\nBuilding synthetic deck...")
+        timeline = build_deck(
+            composer, work_dir, args.slides, args.slide_duration,
+            args.transition_duration, args.resolution, args.fps,
+        )
+        output_path = os.path.join(work_dir, "output.mp4")
+
+        baseline = bench(composer, timeline, output_path, args.resolution, args.fps, False)
+        rows = [("single process", baseline)]
+        for workers in args.workers:
+            elapsed = bench(
+                composer, timeline, output_path, args.resolution, args.fps, True, workers
+            )
+            rows.append((f"chunked x{workers}", elapsed))
+
+    print(f"\nDeck: {args.slides} slides, {len(timeline)} clips, {args.resolution}, "
+          f"{CPU_COUNT} CPU(s)")
+    print(f"\n{'Mode':<20}{'Wall time (s)':>15}{'Speedup':>10}")
+    print("-" * 45)
+    for name, elapsed in rows:
+        print(f"{name:<20}{elapsed:>15.1f}{baseline / elapsed:>9.2f}x")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Encoding Profile Benchmark.
+
+Encodes the same synthetic deck with every encoding profile and reports
+wall time, encode speed (output frames per second of wall time) and output
+size, to pick a profile for a given turnaround or delivery target.
+
+Usage:
+    python benchmarks/bench_encoding_profiles.py
+    python benchmarks/bench_encoding_profiles.py --slides 20 --profiles draft balanced
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_chunked_encode import build_deck
+from video_composer import DEFAULT_FPS, DEFAULT_RESOLUTION, ENCODING_PROFILES, VideoComposer
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+DEFAULT_SLIDES = 8
+DEFAULT_SLIDE_DURATION = 3
+DEFAULT_TRANSITION_DURATION = 2
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def bench(
+    profile: str,
+    timeline: list,
+    output_path: str,
+    resolution: str,
+    fps: int,
+) -> Tuple[float, int]:
+    """Measure wall time and output size of one timeline encode (NaN/0 on failure)."""
+    composer = VideoComposer(encoding_profile=profile)
+    start = time.perf_counter()
+    ok = composer.encode_timeline(timeline, output_path, resolution, fps)
+    elapsed = time.perf_counter() - start
+
+    if not ok:
+        return float("nan"), 0
+    return elapsed, os.path.getsize(output_path)
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark encoding profiles")
+    parser.add_argument("--slides", type=int, default=DEFAULT_SLIDES, help="Slides in the deck")
+    parser.add_argument("--slide-duration", type=float, default=DEFAULT_SLIDE_DURATION)
+    parser.add_argument("--transition-duration", type=float, default=DEFAULT_TRANSITION_DURATION)
+    parser.add_argument("--resolution", default=DEFAULT_RESOLUTION)
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS)
+    parser.add_argument("--profiles", nargs="+", choices=list(ENCODING_PROFILES),
+                        default=list(ENCODING_PROFILES), help="Profiles to compare")
+    args = parser.parse_args()
+
+    rows: List[Tuple[str, float, int]] = []
+
+    with tempfile.TemporaryDirectory(prefix="bench_profiles_") as work_dir:
+        print("\nBuilding synthetic deck...")
+        timeline = build_deck(
+            VideoComposer(), work_dir, args.slides, args.slide_duration,
+            args.transition_duration, args.resolution, args.fps,
+        )
+        total_duration = (
+            args.slides * args.slide_duration
+            + (args.slides - 1) * args.transition_duration
+        )
+        total_frames = total_duration * args.fps
+
+        for profile in args.profiles:
+            output_path = os.path.join(work_dir, f"output_{profile}.mp4")
+            elapsed, size = bench(profile, timeline, output_path, args.resolution, args.fps)
+            rows.append((profile, elapsed, size))
+
+    print(f"\nDeck: {args.slides} slides, {total_duration:g}s, {args.resolution} @ {args.fps}fps")
+    print(f"\n{'Profile':<12}{'Wall time (s)':>15}{'Encode fps':>12}{'Size (MB)':>12}")
+    print("-" * 51)
+    for profile, elapsed, size in rows:
+        print(f"{profile:<12}{elapsed:>15.1f}{total_frames / elapsed:>12.1f}"
+              f"{size / (1024 * 1024):>12.2f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Frame Renderer Benchmark.
+
+Measures NumPy transition rendering throughput (frames/sec) at 1080p and 4K,
+both for frame computation alone and end-to-end with rawvideo streamed into
+an FFmpeg encoder.
+
+Usage:
+    python benchmarks/bench_frame_renderer.py
+    python benchmarks/bench_frame_renderer.py --effects crossfade parallax --frames 48
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from frame_renderer import RENDERED_EFFECTS, TransitionRenderer
+from video_composer import DEFAULT_FPS, VideoComposer
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+RESOLUTIONS = {
+    "1080p": (1920, 1080),
+    "4K": (3840, 2160),
+}
+DEFAULT_FRAMES = 48
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def synthetic_frame(width: int, height: int, seed: int) -> np.ndarray:
+    """Build a gradient-plus-noise test frame."""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None, None]
+    base = (x * [1.0, 0.3, 0.6] + y * [0.2, 1.0, 0.4]) / 1.5
+    noise = rng.integers(0, 24, size=(height, width, 3))
+    return np.clip(base + noise, 0, 255).astype(np.uint8)
+
+
+def bench_render(renderer: TransitionRenderer, effect: str, frames: int) -> float:
+    """Measure frames/sec for frame computation only."""
+    start = time.perf_counter()
+    for _ in renderer.iter_batches(effect, frames):
+        pass
+    return frames / (time.perf_counter() - start)
+
+
+def bench_encode(
+    renderer: TransitionRenderer,
+    composer: VideoComposer,
+    effect: str,
+    frames: int,
+    output_dir: str,
+) -> float:
+    """Measure frames/sec for rendering streamed into an FFmpeg encoder."""
+    output_path = os.path.join(output_dir, f"{effect}.mp4")
+    start = time.perf_counter()
+    if not renderer.render_to_video(
+        composer, output_path, effect, duration=frames / DEFAULT_FPS, fps=DEFAULT_FPS
+    ):
+        return 0.0
+    return frames / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark NumPy transition rendering")
+    parser.add_argument("--effects", nargs="+", default=list(RENDERED_EFFECTS), choices=RENDERED_EFFECTS)
+    parser.add_argument("--resolutions", nargs="+", default=list(RESOLUTIONS), choices=list(RESOLUTIONS))
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="Frames per run")
+    parser.add_argument("--batch-frames", type=int, help="Override frames per vectorized batch")
+    parser.add_argument("--skip-encode", action="store_true", help="Only measure frame computation")
+    args = parser.parse_args()
+
+    composer = None if args.skip_encode else VideoComposer()
+
+    print(f"\n{'Resolution':<12}{'Effect':<15}{'Batch':>6}{'Render fps':>12}{'Encode fps':>12}")
+    print("-" * 57)
+
+    with tempfile.TemporaryDirectory(prefix="bench_renderer_") as output_dir:
+        for name in args.resolutions:
+            width, height = RESOLUTIONS[name]
+            renderer = TransitionRenderer(
+                synthetic_frame(width, height, 1),
+                synthetic_frame(width, height, 2),
+                batch_frames=args.batch_frames,
+            )
+            for effect in args.effects:
+                render_fps = bench_render(renderer, effect, args.frames)
+                encode_fps = (
+                    bench_encode(renderer, composer, effect, args.frames, output_dir)
+                    if composer else float("nan")
+                )
+                print(f"{name:<12}{effect:<15}{renderer.batch_frames:>6}"
+                      f"{render_fps:>12.1f}{encode_fps:>12.1f}")
+
+    print()
+
+
+if __name__ == "__main__":
+    main()
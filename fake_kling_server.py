@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+"""
+Fake Kling API Server.
+
+Local stand-in for the Kling image-to-video API, used to load-test the client
+and concurrency settings without touching api-beijing.klingai.com. Implements
+task creation, task query and video download with the same code/data envelope,
+plus configurable latency, failure, rate-limit and concurrency behaviour.
+
+Usage:
+    python fake_kling_server.py --port 8765 --latency uniform:5,15 --max-concurrent 5
+    KLING_API_BASE_URL=http://127.0.0.1:8765 python generate_ppt_video.py ...
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+# Same paths as kling_api; kept local so the server runs without client deps
+API_CREATE_TASK = "/v1/videos/image2video"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_LATENCY = "uniform:90,120"
+DEFAULT_API_LATENCY = "fixed:0"
+DEFAULT_MAX_CONCURRENT = 3
+DEFAULT_VIDEO_SIZE_KB = 512
+DEFAULT_VIDEO_RESOLUTION = "1280x720"
+DEFAULT_VIDEO_FPS = 24
+
+# Fraction of a task's lifetime spent in "submitted" before "processing"
+SUBMITTED_FRACTION = 0.1
+
+# Kling error codes mirrored by the fake server
+CODE_SUCCEED = 0
+CODE_AUTH_FAILED = 1000
+CODE_BAD_REQUEST = 1201
+CODE_NOT_FOUND = 1203
+CODE_RATE_LIMITED = 1302
+CODE_CONCURRENCY_LIMITED = 1303
+
+QUERY_PATH_PATTERN = re.compile(rf"^{re.escape(API_CREATE_TASK)}/([\w-]+)$")
+VIDEO_PATH_PATTERN = re.compile(r"^/videos/([\w-]+)\.mp4$")
+
+
+# =============================================================================
+# Latency Distributions
+# =============================================================================
+
+def parse_latency_spec(spec: str) -> Callable[[random.Random], float]:
+    """
+    Parse a latency distribution spec into a sampler.
+
+    Supported specs (all values in seconds):
+        fixed:S
+        uniform:MIN,MAX
+        normal:MEAN,STDDEV
+        lognormal:MEDIAN,SIGMA
+
+    Args:
+        spec: Distribution spec string.
+
+    Returns:
+        Function drawing a non-negative latency from a random generator.
+
+    Raises:
+        ValueError: If the spec cannot be parsed.
+    """
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(v) for v in params.split(",")] if params else []
+    except ValueError:
+        raise ValueError(f"Invalid latency spec: {spec}")
+
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: max(0.0, values[0])
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: max(0.0, rng.uniform(values[0], values[1]))
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2 and values[0] > 0:
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+
+    raise ValueError(
+        f"Invalid latency spec: {spec}\n"
+        "Expected one of: fixed:S, uniform:MIN,MAX, normal:MEAN,STDDEV, lognormal:MEDIAN,SIGMA"
+    )
+
+
+# =============================================================================
+# Synthetic Video
+# =============================================================================
+
+def build_synthetic_video(
+    duration: int,
+    resolution: str = DEFAULT_VIDEO_RESOLUTION,
+    fps: int = DEFAULT_VIDEO_FPS,
+    size_kb: int = DEFAULT_VIDEO_SIZE_KB,
+) -> bytes:
+    """
+    Build the mp4 payload served for every finished task.
+
+    Encodes a short test pattern with FFmpeg when available, so downloads can
+    be fed to VideoComposer. Falls back to random bytes of the given size when
+    FFmpeg is missing, which is enough for exercising the download path.
+
+    Args:
+        duration: Clip duration in seconds.
+        resolution: Clip resolution (WxH format).
+        fps: Clip frame rate.
+        size_kb: Payload size for the random fallback.
+
+    Returns:
+        Video file bytes.
+    """
+    if shutil.which("ffmpeg"):
+        temp_dir = tempfile.mkdtemp(prefix="fake_kling_")
+        video_path = os.path.join(temp_dir, "synthetic.mp4")
+        try:
+            result = subprocess.run(
+                [
+                    "ffmpeg", "-y",
+                    "-f", "lavfi",
+                    "-i", f"testsrc2=size={resolution}:rate={fps}",
+                    "-t", str(duration),
+                    "-c:v", "libx264",
+                    "-preset", "ultrafast",
+                    "-pix_fmt", "yuv420p",
+                    "-movflags", "+faststart",
+                    video_path,
+                ],
+                capture_output=True,
+                timeout=60,
+            )
+            if result.returncode == 0:
+                with open(video_path, "rb") as f:
+                    return f.read()
+            print("Warning: FFmpeg failed to build synthetic video, using random bytes")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return os.urandom(size_kb * 1024)
+
+
+# =============================================================================
+# Task Store
+# =============================================================================
+
+class FakeKlingBackend:
+    """In-memory task store simulating Kling task lifecycle."""
+
+    def __init__(
+        self,
+        latency: str = DEFAULT_LATENCY,
+        api_latency: str = DEFAULT_API_LATENCY,
+        failure_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize fake backend.
+
+        Args:
+            latency: Task completion latency distribution spec.
+            api_latency: Per-request HTTP latency distribution spec.
+            failure_rate: Fraction of tasks ending in "failed" status.
+            rate_limit_rate: Fraction of create requests rejected with HTTP 429.
+            max_concurrent: Maximum unfinished tasks before rejecting creates (0 = unlimited).
+            seed: Random seed for reproducible runs.
+        """
+        self.sample_latency = parse_latency_spec(latency)
+        self.sample_api_latency = parse_latency_spec(api_latency)
+        self.failure_rate = failure_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.max_concurrent = max_concurrent
+
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.videos: Dict[str, bytes] = {}
+        self.stats = {
+            "created": 0,
+            "rate_limited": 0,
+            "concurrency_limited": 0,
+            "failed": 0,
+            "succeeded": 0,
+            "downloads": 0,
+            "peak_concurrent": 0,
+        }
+
+    def api_delay(self) -> None:
+        """Sleep for a sampled per-request latency."""
+        with self.lock:
+            delay = self.sample_api_latency(self.rng)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _active_count(self, now: float) -> int:
+        """Count tasks that are still submitted or processing."""
+        return sum(1 for task in self.tasks.values() if task["finish_at"] > now)
+
+    def create_task(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Create a simulated task.
+
+        Args:
+            body: Parsed request body.
+
+        Returns:
+            Tuple of (HTTP status, response envelope).
+        """
+        if not body.get("image"):
+            return 400, envelope(CODE_BAD_REQUEST, "image is required")
+
+        now = time.time()
+        with self.lock:
+            if self.rng.random() < self.rate_limit_rate:
+                self.stats["rate_limited"] += 1
+                return 429, envelope(CODE_RATE_LIMITED, "rate limit exceeded")
+
+            active = self._active_count(now)
+            if self.max_concurrent and active >= self.max_concurrent:
+                self.stats["concurrency_limited"] += 1
+                return 429, envelope(
+                    CODE_CONCURRENCY_LIMITED,
+                    "parallel task over resource pack limit",
+                )
+
+            task_id = uuid.uuid4().hex
+            latency = self.sample_latency(self.rng)
+            self.tasks[task_id] = {
+                "task_id": task_id,
+                "created_at": now,
+                "finish_at": now + latency,
+                "will_fail": self.rng.random() < self.failure_rate,
+                "duration": str(body.get("duration", "5")),
+                "counted": False,
+            }
+            self.stats["created"] += 1
+            self.stats["peak_concurrent"] = max(self.stats["peak_concurrent"], active + 1)
+
+        return 200, envelope(CODE_SUCCEED, "SUCCEED", {
+            "task_id": task_id,
+            "task_status": "submitted",
+            "created_at": int(now * 1000),
+            "updated_at": int(now * 1000),
+        })
+
+    def query_task(self, task_id: str, base_url: str) -> Tuple[int, Dict[str, Any]]:
+        """
+        Query a simulated task, resolving its status from elapsed time.
+
+        Args:
+            task_id: Task ID to query.
+            base_url: Server base URL used to build download links.
+
+        Returns:
+            Tuple of (HTTP status, response envelope).
+        """
+        now = time.time()
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if not task:
+                return 404, envelope(CODE_NOT_FOUND, f"task not found: {task_id}")
+
+            lifetime = task["finish_at"] - task["created_at"]
+            data: Dict[str, Any] = {
+                "task_id": task_id,
+                "created_at": int(task["created_at"] * 1000),
+                "updated_at": int(now * 1000),
+            }
+
+            if now < task["created_at"] + lifetime * SUBMITTED_FRACTION:
+                data["task_status"] = "submitted"
+            elif now < task["finish_at"]:
+                data["task_status"] = "processing"
+            elif task["will_fail"]:
+                data["task_status"] = "failed"
+                data["task_status_msg"] = "Simulated generation failure"
+            else:
+                data["task_status"] = "succeed"
+                data["task_result"] = {
+                    "videos": [{
+                        "id": task_id,
+                        "url": f"{base_url}/videos/{task_id}.mp4",
+                        "duration": task["duration"],
+                    }],
+                }
+
+            if data["task_status"] in ("failed", "succeed") and not task["counted"]:
+                task["counted"] = True
+                self.stats["failed" if task["will_fail"] else "succeeded"] += 1
+
+        return 200, envelope(CODE_SUCCEED, "SUCCEED", data)
+
+    def get_video(self, task_id: str, **video_kwargs: Any) -> Optional[bytes]:
+        """
+        Get the video payload for a finished task.
+
+        Args:
+            task_id: Task ID of the video.
+            **video_kwargs: Arguments for build_synthetic_video().
+
+        Returns:
+            Video bytes, or None if the task has no video.
+        """
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if not task or task["will_fail"] or task["finish_at"] > time.time():
+                return None
+            duration = task["duration"]
+            self.stats["downloads"] += 1
+
+        # Build once per duration; encoding is slow relative to serving
+        if duration not in self.videos:
+            payload = build_synthetic_video(int(duration), **video_kwargs)
+            with self.lock:
+                self.videos.setdefault(duration, payload)
+        return self.videos[duration]
+
+
+def envelope(code: int, message: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build a Kling-style response envelope."""
+    return {
+        "code": code,
+        "message": message,
+        "request_id": uuid.uuid4().hex,
+        "data": data,
+    }
+
+
+# =============================================================================
+# HTTP Handler
+# =============================================================================
+
+class FakeKlingHandler(BaseHTTPRequestHandler):
+    """HTTP request handler for the fake Kling API."""
+
+    backend: FakeKlingBackend
+    video_options: Dict[str, Any] = {}
+    quiet: bool = False
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests unless running quietly."""
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def _base_url(self) -> str:
+        """Build the base URL clients used to reach this server."""
+        host = self.headers.get("Host") or "%s:%d" % self.server.server_address[:2]
+        return f"http://{host}"
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        """Send a JSON response."""
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self) -> bool:
+        """Check for a bearer token (contents are not verified)."""
+        if self.headers.get("Authorization", "").startswith("Bearer "):
+            return True
+        self._send_json(401, envelope(CODE_AUTH_FAILED, "authorization header missing"))
+        return False
+
+    def do_POST(self) -> None:
+        """Handle task creation."""
+        self.backend.api_delay()
+
+        if self.path != API_CREATE_TASK:
+            self._send_json(404, envelope(CODE_NOT_FOUND, f"unknown path: {self.path}"))
+            return
+        if not self._authorized():
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, envelope(CODE_BAD_REQUEST, "invalid JSON body"))
+            return
+
+        self._send_json(*self.backend.create_task(body))
+
+    def do_GET(self) -> None:
+        """Handle task query and video download."""
+        self.backend.api_delay()
+
+        match = QUERY_PATH_PATTERN.match(self.path)
+        if match:
+            if self._authorized():
+                self._send_json(*self.backend.query_task(match.group(1), self._base_url()))
+            return
+
+        match = VIDEO_PATH_PATTERN.match(self.path)
+        if match:
+            payload = self.backend.get_video(match.group(1), **self.video_options)
+            if payload is None:
+                self.send_error(404, "Video not available")
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "video/mp4")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        self._send_json(404, envelope(CODE_NOT_FOUND, f"unknown path: {self.path}"))
+
+
+# =============================================================================
+# Server
+# =============================================================================
+
+def create_server(
+    backend: FakeKlingBackend,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    video_options: Optional[Dict[str, Any]] = None,
+    quiet: bool = False,
+) -> ThreadingHTTPServer:
+    """
+    Create a fake Kling HTTP server.
+
+    Args:
+        backend: Task store backing the server.
+        host: Bind address.
+        port: Bind port (0 picks a free port).
+        video_options: Arguments for build_synthetic_video().
+        quiet: Whether to suppress per-request logging.
+
+    Returns:
+        Configured (not yet serving) HTTP server.
+    """
+    handler = type("BoundFakeKlingHandler", (FakeKlingHandler,), {
+        "backend": backend,
+        "video_options": video_options or {},
+        "quiet": quiet,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """Create and configure argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Fake Kling API server for offline load testing",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Latency specs (seconds):
+  fixed:S | uniform:MIN,MAX | normal:MEAN,STDDEV | lognormal:MEDIAN,SIGMA
+
+Example:
+  python fake_kling_server.py --latency lognormal:20,0.4 --failure-rate 0.05 \\
+    --rate-limit-rate 0.1 --max-concurrent 5
+  export KLING_API_BASE_URL=http://127.0.0.1:8765
+""",
+    )
+
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Bind address (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Bind port (default: {DEFAULT_PORT})")
+    parser.add_argument(
+        "--latency",
+        default=DEFAULT_LATENCY,
+        help=f"Task completion latency distribution (default: {DEFAULT_LATENCY})",
+    )
+    parser.add_argument(
+        "--api-latency",
+        default=DEFAULT_API_LATENCY,
+        help=f"Per-request HTTP latency distribution (default: {DEFAULT_API_LATENCY})",
+    )
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of tasks that fail")
+    parser.add_argument(
+        "--rate-limit-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of create requests rejected with HTTP 429",
+    )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENT,
+        help=f"Maximum unfinished tasks, 0 for unlimited (default: {DEFAULT_MAX_CONCURRENT})",
+    )
+    parser.add_argument(
+        "--video-resolution",
+        default=DEFAULT_VIDEO_RESOLUTION,
+        help=f"Synthetic video resolution (default: {DEFAULT_VIDEO_RESOLUTION})",
+    )
+    parser.add_argument(
+        "--video-size-kb",
+        type=int,
+        default=DEFAULT_VIDEO_SIZE_KB,
+        help=f"Payload size when FFmpeg is unavailable (default: {DEFAULT_VIDEO_SIZE_KB})",
+    )
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+    parser.add_argument("--quiet", action="store_true", help="Suppress per-request logging")
+
+    return parser
+
+
+def main() -> None:
+    """Main entry point."""
+    args = create_argument_parser().parse_args()
+
+    backend = FakeKlingBackend(
+        latency=args.latency,
+        api_latency=args.api_latency,
+        failure_rate=args.failure_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        max_concurrent=args.max_concurrent,
+        seed=args.seed,
+    )
+    server = create_server(
+        backend,
+        host=args.host,
+        port=args.port,
+        video_options={
+            "resolution": args.video_resolution,
+            "size_kb": args.video_size_kb,
+        },
+        quiet=args.quiet,
+    )
+
+    host, port = server.server_address[:2]
+    print("=" * 60)
+    print("Fake Kling API Server")
+    print("=" * 60)
+    print(f"  Listening: http://{host}:{port}")
+    print(f"  Latency: {args.latency}")
+    print(f"  Failure rate: {args.failure_rate}")
+    print(f"  429 rate: {args.rate_limit_rate}")
+    print(f"  Max concurrent: {args.max_concurrent or 'unlimited'}")
+    print(f"\n  export KLING_API_BASE_URL=http://{host}:{port}")
+    print("=" * 60)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("\nServer stats:")
+        for key, value in backend.stats.items():
+            print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+File Cache Module.
+
+Content-addressed, size-capped file store with LRU eviction. Used to keep
+generated media across runs so identical work is not repeated.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_CACHE_ROOT = os.path.join(Path.home(), ".cache", "ppt-video")
+
+
+# =============================================================================
+# Hashing
+# =============================================================================
+
+_hash_memo: Dict[Tuple[str, int, int], str] = {}
+_hash_memo_lock = threading.Lock()
+
+
+def hash_file(path: str) -> str:
+    """
+    Compute SHA-256 of a file's contents.
+
+    Results are memoized per (path, mtime, size), so repeated lookups of the
+    same slide image do not re-read it.
+
+    Args:
+        path: File path.
+
+    Returns:
+        Hex digest string.
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+    with _hash_memo_lock:
+        if memo_key in _hash_memo:
+            return _hash_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    result = digest.hexdigest()
+    with _hash_memo_lock:
+        _hash_memo[memo_key] = result
+    return result
+
+
+def hash_text(text: str) -> str:
+    """Compute SHA-256 of a UTF-8 string."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def copy_file(src: str, dest: str) -> str:
+    """
+    Place a private copy of a file at dest, replacing it atomically.
+
+    Cache entries are never hard-linked into place: tools that rewrite an
+    output in place (FFmpeg -y truncates the existing inode) would corrupt
+    the shared entry through the link.
+
+    Args:
+        src: Source file path.
+        dest: Destination path (replaced if it exists).
+
+    Returns:
+        Destination path.
+    """
+    Path(dest).parent.mkdir(parents=True, exist_ok=True)
+    temp_path = f"{dest}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        shutil.copy2(src, temp_path)
+        os.replace(temp_path, dest)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return dest
+
+
+# =============================================================================
+# File Cache
+# =============================================================================
+
+class FileCache:
+    """Size-capped content-addressed file store with LRU eviction."""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_size_bytes: int,
+        suffix: str = "",
+    ) -> None:
+        """
+        Initialize file cache.
+
+        Args:
+            cache_dir: Directory holding cached files.
+            max_size_bytes: Total size cap; least recently used entries are
+                evicted once it is exceeded.
+            suffix: File extension for cached entries (e.g. ".mp4").
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        """Get the storage path for a key."""
+        return os.path.join(self.cache_dir, key[:2], f"{key}{self.suffix}")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached file, marking it as recently used.
+
+        Args:
+            key: Cache key (hex digest).
+
+        Returns:
+            Path to the cached file, or None on miss.
+        """
+        path = self.path_for(key)
+
+        with self._lock:
+            if os.path.exists(path):
+                now = time.time()
+                os.utime(path, (now, now))
+                self.hits += 1
+                return path
+            self.misses += 1
+            return None
+
+    def put(self, key: str, src_path: str) -> Optional[str]:
+        """
+        Store a copy of a file under a key.
+
+        Args:
+            key: Cache key (hex digest).
+            src_path: File to store.
+
+        Returns:
+            Path to the cached file, or None if it could not be stored.
+        """
+        path = self.path_for(key)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            # Always copy: a hard link would let later in-place writes to the
+            # source corrupt the cached entry
+            shutil.copy2(src_path, temp_path)
+            now = time.time()
+            os.utime(temp_path, (now, now))
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"  Cache store failed ({Path(src_path).name}): {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+
+        self.evict()
+        return path if os.path.exists(path) else None
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """List cached entries as (last_used, size, path)."""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self) -> int:
+        """Get total size of cached entries in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """
+        Evict least recently used entries until under the size cap.
+
+        Returns:
+            Number of entries removed.
+        """
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+
+            for _, size, path in entries:
+                if total <= self.max_size_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+
+        if removed:
+            print(f"  Cache evicted {removed} entr{'y' if removed == 1 else 'ies'} "
+                  f"({self.cache_dir})")
+        return removed
+
+
+# =============================================================================
+# Media Cache
+# =============================================================================
+
+class MediaCache:
+    """
+    Persistent media cache keyed by a hash of descriptive fields.
+
+    Subclasses set the class attributes below and build their key with
+    make_key(), passing their own fields to hash_fields().
+    """
+
+    label = "Media cache"
+    default_dir = os.path.join(DEFAULT_CACHE_ROOT, "media")
+    default_max_gb = 5.0
+    suffix = ".mp4"
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size_gb: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize media cache.
+
+        Args:
+            cache_dir: Cache directory shared across decks and runs
+                (default_dir if None).
+            max_size_gb: Size cap in GB; least recently used files are
+                evicted (default_max_gb if None).
+        """
+        cache_dir = cache_dir or self.default_dir
+        max_size_gb = self.default_max_gb if max_size_gb is None else max_size_gb
+        self.files = FileCache(cache_dir, int(max_size_gb * 1024 ** 3), suffix=self.suffix)
+        print(f"{self.label}: {cache_dir} (max {max_size_gb:g} GB)")
+
+    @staticmethod
+    def hash_fields(fields: Dict[str, Any]) -> str:
+        """Build a content-addressed key from JSON-serializable fields."""
+        return hash_text(json.dumps(fields, sort_keys=True, ensure_ascii=False))
+
+    def fetch(self, key: str, output_path: str) -> bool:
+        """
+        Copy a cached file into place.
+
+        Args:
+            key: Cache key.
+            output_path: Destination path.
+
+        Returns:
+            True on cache hit.
+        """
+        cached_path = self.files.get(key)
+        if not cached_path:
+            return False
+        try:
+            copy_file(cached_path, output_path)
+        except OSError as e:
+            print(f"  Cache fetch failed ({Path(output_path).name}): {e}")
+            return False
+        return True
+
+    def put(self, key: str, path: str) -> None:
+        """Add a freshly produced file to the cache."""
+        self.files.put(key, path)
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Frame Renderer Module.
+
+In-process NumPy transition renderer. Loads two slide images once, computes
+blended frames in vectorized batches and streams them as raw video into an
+FFmpeg encoder started by VideoComposer, without writing frames to disk.
+
+Supports effects that FFmpeg filters cannot express directly: parallax pans,
+glass-blur wipes and zoom-through.
+"""
+
+import subprocess
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from video_composer import (
+    DEFAULT_FPS,
+    DEFAULT_LOCAL_TRANSITION_DURATION,
+    DEFAULT_RESOLUTION,
+    VideoComposer,
+)
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+RENDERED_EFFECTS = ("crossfade", "parallax", "glass_wipe", "zoom_through")
+
+# Working memory budget per batch; bounds how many frames are computed per operation
+DEFAULT_BATCH_BYTES = 256 * 1024 * 1024
+# Approximate working bytes per output byte (uint16 intermediates, gathers, masks)
+BATCH_WORK_FACTOR = 10
+
+PARALLAX_BACKGROUND_SHIFT = 0.3
+GLASS_BAND_RATIO = 0.18
+GLASS_BLUR_RATIO = 1 / 80
+ZOOM_OUT_SCALE = 1.5
+ZOOM_IN_SCALE = 1.25
+
+
+# =============================================================================
+# Exceptions
+# =============================================================================
+
+class FrameRendererError(Exception):
+    """Exception for frame rendering errors."""
+    pass
+
+
+def _require_numpy() -> None:
+    """Raise a helpful error if NumPy is not installed."""
+    if np is None:
+        raise FrameRendererError(
+            "NumPy not installed, required for rendered transitions.\n"
+            "Please run: pip install numpy"
+        )
+
+
+# =============================================================================
+# Image Helpers
+# =============================================================================
+
+def load_image_array(
+    image_path: str,
+    width: int,
+    height: int,
+    ffmpeg_path: str = "ffmpeg",
+) -> "np.ndarray":
+    """
+    Decode an image into an RGB array, letterboxed to the target size.
+
+    Decoding goes through FFmpeg with the same scale/pad as VideoComposer, so
+    rendered frames line up exactly with static clips.
+
+    Args:
+        image_path: Path to image file.
+        width: Target width.
+        height: Target height.
+        ffmpeg_path: Path to FFmpeg executable.
+
+    Returns:
+        uint8 array of shape (height, width, 3).
+
+    Raises:
+        FrameRendererError: If the image cannot be decoded.
+    """
+    _require_numpy()
+
+    result = subprocess.run(
+        [
+            ffmpeg_path,
+            "-v", "error",
+            "-i", image_path,
+            "-vf", (
+                f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1"
+            ),
+            "-frames:v", "1",
+            "-f", "rawvideo",
+            "-pix_fmt", "rgb24",
+            "pipe:1",
+        ],
+        capture_output=True,
+        timeout=60,
+    )
+
+    expected = width * height * 3
+    if result.returncode != 0 or len(result.stdout) != expected:
+        raise FrameRendererError(
+            f"Failed to decode image: {image_path}\n"
+            f"  {result.stderr.decode('utf-8', 'replace')[:200]}"
+        )
+
+    return np.frombuffer(result.stdout, dtype=np.uint8).reshape(height, width, 3)
+
+
+def box_blur(image: "np.ndarray", radius: int) -> "np.ndarray":
+    """
+    Separable box blur using cumulative sums (O(1) per pixel for any radius).
+
+    Args:
+        image: uint8 array of shape (H, W, 3).
+        radius: Blur radius in pixels.
+
+    Returns:
+        Blurred uint8 array of the same shape.
+    """
+    if radius < 1:
+        return image.copy()
+
+    result = image.astype(np.float32)
+    for axis in (0, 1):
+        size = result.shape[axis]
+        pad = [(0, 0)] * result.ndim
+        pad[axis] = (radius + 1, radius)
+        cumsum = np.cumsum(np.pad(result, pad, mode="edge"), axis=axis)
+        upper = np.take(cumsum, np.arange(2 * radius + 1, size + 2 * radius + 1), axis=axis)
+        lower = np.take(cumsum, np.arange(0, size), axis=axis)
+        result = (upper - lower) / (2 * radius + 1)
+
+    return np.clip(result, 0, 255).astype(np.uint8)
+
+
+def _smoothstep(t: "np.ndarray") -> "np.ndarray":
+    """Ease-in-out curve for transition progress."""
+    return t * t * (3.0 - 2.0 * t)
+
+
+# =============================================================================
+# Transition Renderer
+# =============================================================================
+
+class TransitionRenderer:
+    """Vectorized NumPy renderer for slide-to-slide transitions."""
+
+    def __init__(
+        self,
+        image_from: "np.ndarray",
+        image_to: "np.ndarray",
+        batch_frames: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize renderer from two decoded frames.
+
+        Args:
+            image_from: Source frame, uint8 array of shape (H, W, 3).
+            image_to: Target frame, same shape as image_from.
+            batch_frames: Frames computed per vectorized operation (derived
+                from DEFAULT_BATCH_BYTES if not provided).
+
+        Raises:
+            FrameRendererError: If NumPy is missing or frame shapes differ.
+        """
+        _require_numpy()
+
+        if image_from.shape != image_to.shape:
+            raise FrameRendererError(
+                f"Frame shapes differ: {image_from.shape} vs {image_to.shape}"
+            )
+
+        self.a = np.ascontiguousarray(image_from, dtype=np.uint8)
+        self.b = np.ascontiguousarray(image_to, dtype=np.uint8)
+        self.height, self.width = self.a.shape[:2]
+
+        # Widened copies let blends run in uint16 without overflow:
+        # 255 * 256 fits in 16 bits
+        self.a16 = self.a.astype(np.uint16)
+        self.b16 = self.b.astype(np.uint16)
+
+        self._blurred: Optional[Tuple["np.ndarray", "np.ndarray"]] = None
+
+        frame_bytes = self.a.nbytes
+        self.batch_frames = batch_frames or max(
+            1, DEFAULT_BATCH_BYTES // (frame_bytes * BATCH_WORK_FACTOR)
+        )
+
+    @classmethod
+    def from_images(
+        cls,
+        image_from: str,
+        image_to: str,
+        resolution: str = DEFAULT_RESOLUTION,
+        ffmpeg_path: str = "ffmpeg",
+        batch_frames: Optional[int] = None,
+    ) -> "TransitionRenderer":
+        """
+        Create renderer by decoding two slide images.
+
+        Args:
+            image_from: Path to source slide image.
+            image_to: Path to target slide image.
+            resolution: Target resolution (WxH format).
+            ffmpeg_path: Path to FFmpeg executable.
+            batch_frames: Frames computed per vectorized operation.
+
+        Returns:
+            Configured renderer.
+        """
+        width, height = (int(v) for v in resolution.split("x"))
+        return cls(
+            load_image_array(image_from, width, height, ffmpeg_path),
+            load_image_array(image_to, width, height, ffmpeg_path),
+            batch_frames=batch_frames,
+        )
+
+    # -------------------------------------------------------------------------
+    # Blending
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _blend(
+        frames_a: "np.ndarray",
+        frames_b: "np.ndarray",
+        alpha: "np.ndarray",
+    ) -> "np.ndarray":
+        """
+        Blend two frame stacks with 8-bit fixed-point weights.
+
+        Args:
+            frames_a: uint16 frames (or a single broadcastable frame).
+            frames_b: uint16 frames (or a single broadcastable frame).
+            alpha: Weight of frames_b in [0, 1], broadcastable to the output.
+
+        Returns:
+            uint8 frame stack.
+        """
+        weight = np.rint(alpha * 256).astype(np.uint16)
+        out = frames_a * (256 - weight)
+        out += frames_b * weight
+        out >>= 8
+        return out.astype(np.uint8)
+
+    def _progress(self, start: int, count: int, total: int) -> "np.ndarray":
+        """Eased progress values for frames [start, start + count)."""
+        t = np.arange(start, start + count, dtype=np.float32) / max(1, total - 1)
+        return _smoothstep(t)
+
+    # -------------------------------------------------------------------------
+    # Effects
+    # -------------------------------------------------------------------------
+
+    def _crossfade(self, t: "np.ndarray") -> "np.ndarray":
+        """Plain crossfade."""
+        return self._blend(self.a16, self.b16, t[:, None, None, None])
+
+    def _parallax(self, t: "np.ndarray") -> "np.ndarray":
+        """Target slides in over a source that pans away more slowly."""
+        cols = np.arange(self.width)
+        offset_a = (t * self.width * PARALLAX_BACKGROUND_SHIFT).astype(np.int64)
+        edge_b = ((1.0 - t) * self.width).astype(np.int64)
+
+        idx_a = np.clip(cols[None, :] + offset_a[:, None], 0, self.width - 1)
+        idx_b = np.clip(cols[None, :] - edge_b[:, None], 0, self.width - 1)
+        show_b = cols[None, :] >= edge_b[:, None]
+
+        # Gather columns for the whole batch at once: (H, k, W, 3) -> (k, H, W, 3)
+        frames_a = np.take(self.a, idx_a, axis=1).transpose(1, 0, 2, 3)
+        frames_b = np.take(self.b, idx_b, axis=1).transpose(1, 0, 2, 3)
+
+        return np.where(show_b[:, None, :, None], frames_b, frames_a)
+
+    def _glass_wipe(self, t: "np.ndarray") -> "np.ndarray":
+        """Left-to-right wipe with a frosted-glass band at the edge."""
+        if self._blurred is None:
+            radius = max(1, int(self.width * GLASS_BLUR_RATIO))
+            self._blurred = (
+                box_blur(self.a, radius).astype(np.uint16),
+                box_blur(self.b, radius).astype(np.uint16),
+            )
+        blur_a, blur_b = self._blurred
+
+        band = max(1.0, self.width * GLASS_BAND_RATIO)
+        cols = np.arange(self.width, dtype=np.float32)
+        edge = t * (self.width + band) - band
+
+        # Position relative to the band: <0 target, 0..1 glass, >1 source
+        position = (cols[None, :] - edge[:, None]) / band
+        weight_b = np.clip(1.0 - position, 0.0, 1.0)[:, None, :, None]
+        in_band = ((position >= 0.0) & (position <= 1.0))[:, None, :, None]
+
+        sharp = self._blend(self.a16, self.b16, weight_b)
+        frosted = self._blend(blur_a, blur_b, weight_b)
+        return np.where(in_band, frosted, sharp)
+
+    def _zoom_through(self, t: "np.ndarray") -> "np.ndarray":
+        """Fly into the source while the target settles from a close-up."""
+        rows = np.arange(self.height, dtype=np.float32) - self.height / 2
+        cols = np.arange(self.width, dtype=np.float32) - self.width / 2
+
+        def zoom_indices(scale: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+            row_idx = np.clip(
+                (rows[None, :] / scale[:, None] + self.height / 2).astype(np.int64),
+                0, self.height - 1,
+            )
+            col_idx = np.clip(
+                (cols[None, :] / scale[:, None] + self.width / 2).astype(np.int64),
+                0, self.width - 1,
+            )
+            return row_idx[:, :, None], col_idx[:, None, :]
+
+        scale_a = 1.0 + (ZOOM_OUT_SCALE - 1.0) * t
+        scale_b = ZOOM_IN_SCALE - (ZOOM_IN_SCALE - 1.0) * t
+
+        frames_a = self.a16[zoom_indices(scale_a)]
+        frames_b = self.b16[zoom_indices(scale_b)]
+
+        return self._blend(frames_a, frames_b, t[:, None, None, None])
+
+    # -------------------------------------------------------------------------
+    # Rendering
+    # -------------------------------------------------------------------------
+
+    def iter_batches(self, effect: str, num_frames: int) -> Iterator["np.ndarray"]:
+        """
+        Generate transition frames in batches.
+
+        Args:
+            effect: Effect name (see RENDERED_EFFECTS).
+            num_frames: Total number of frames.
+
+        Yields:
+            Contiguous uint8 arrays of shape (k, H, W, 3).
+
+        Raises:
+            FrameRendererError: If the effect is unknown.
+        """
+        if effect not in RENDERED_EFFECTS:
+            raise FrameRendererError(
+                f"Unknown rendered effect: {effect} (available: {', '.join(RENDERED_EFFECTS)})"
+            )
+        render = getattr(self, f"_{effect}")
+
+        for start in range(0, num_frames, self.batch_frames):
+            count = min(self.batch_frames, num_frames - start)
+            yield np.ascontiguousarray(render(self._progress(start, count, num_frames)))
+
+    def render_to_video(
+        self,
+        composer: VideoComposer,
+        output_path: str,
+        effect: str,
+        duration: float = DEFAULT_LOCAL_TRANSITION_DURATION,
+        fps: int = DEFAULT_FPS,
+    ) -> bool:
+        """
+        Render a transition and stream it into an FFmpeg encoder.
+
+        Args:
+            composer: Video composer providing the encoder process.
+            output_path: Output video path.
+            effect: Effect name (see RENDERED_EFFECTS).
+            duration: Transition duration in seconds.
+            fps: Output frame rate.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        num_frames = max(2, int(round(duration * fps)))
+
+        # Contiguous arrays expose their buffer directly; no extra copy
+        return composer.encode_raw_frames(
+            (memoryview(batch).cast("B") for batch in self.iter_batches(effect, num_frames)),
+            output_path,
+            self.width,
+            self.height,
+            fps,
+        )
+
+
+# =============================================================================
+# High-Level API
+# =============================================================================
+
+def render_transition(
+    composer: VideoComposer,
+    image_from: str,
+    image_to: str,
+    output_path: str,
+    effect: str,
+    duration: float = DEFAULT_LOCAL_TRANSITION_DURATION,
+    resolution: str = DEFAULT_RESOLUTION,
+    fps: int = DEFAULT_FPS,
+) -> Optional[str]:
+    """
+    Render a NumPy transition between two slide images.
+
+    Args:
+        composer: Video composer providing FFmpeg.
+        image_from: Path to source slide image.
+        image_to: Path to target slide image.
+        output_path: Output video path.
+        effect: Effect name (see RENDERED_EFFECTS).
+        duration: Transition duration in seconds.
+        resolution: Target resolution (WxH format).
+        fps: Target frame rate.
+
+    Returns:
+        Path to output video, or None if failed.
+    """
+    print(f"  Rendered {effect} transition ({Path(image_from).name} -> "
+          f"{Path(image_to).name}, {duration}s)...")
+
+    try:
+        renderer = TransitionRenderer.from_images(
+            image_from, image_to, resolution, composer.ffmpeg_path
+        )
+        start_time = time.time()
+        success = renderer.render_to_video(composer, output_path, effect, duration, fps)
+    except FrameRendererError as e:
+        print(f"  {e}")
+        return None
+
+    if success:
+        print(f"  Rendered {effect} transition complete ({time.time() - start_time:.1f}s)")
+    return output_path if success else None
@@ -10,14 +10,51 @@ import argparse
 import json
 import os
 import sys
+import time
 import traceback
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from dotenv import load_dotenv
 
-from video_composer import VideoComposer
-from video_materials import VideoMaterialsGenerator
+from generate_ppt import (
+    DEFAULT_RESOLUTION as DEFAULT_IMAGE_RESOLUTION,
+    DEFAULT_TEMPLATE_PATH as SLIDES_TEMPLATE_PATH,
+    generate_prompt as generate_slide_prompt,
+    generate_slide,
+    generate_viewer_html,
+    load_style_template,
+    save_prompts,
+)
+from local_transitions import AVAILABLE_EFFECTS, LocalTransitionGenerator
+from media_index import DEFAULT_MEDIA_INDEX_PATH, MEMORY_INDEX, MediaIndex
+from pipeline_dag import PipelineDAG
+from scratch_space import DEFAULT_SCRATCH_DIR, ScratchSpace
+from simple_transition_prompt_generator import SimpleTransitionPromptGenerator
+from video_composer import (
+    COMPOSITION_MODES,
+    DEFAULT_CLIP_CACHE_DIR,
+    DEFAULT_CLIP_CACHE_MAX_GB,
+    DEFAULT_COMPOSITION_MODE,
+    DEFAULT_CONCAT_GROUP_SIZE,
+    DEFAULT_ENCODING_PROFILE,
+    DEFAULT_LOCAL_TRANSITION_EFFECT,
+    ENCODING_PROFILES,
+    STREAMING_FORMATS,
+    FFmpegError,
+    StaticClipCache,
+    VideoComposer,
+)
+from video_materials import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_CACHE_MAX_GB,
+    DEFAULT_OPENING_BOOST,
+    PLAYABLE_PREFIX_FILENAME,
+    PlayablePrefix,
+    TransitionCache,
+    VideoMaterialsGenerator,
+)
 
 
 # =============================================================================
@@ -29,6 +66,15 @@ DEFAULT_VIDEO_DURATION = "5"
 DEFAULT_SLIDE_DURATION = 5
 DEFAULT_VIDEO_QUALITY = "pro"
 DEFAULT_MAX_CONCURRENT = 3
+DEFAULT_TRANSITION_ENGINE = "kling"
+
+# "phased" runs materials, composition and viewer one after another; "dag"
+# runs them as a dependency graph (see run_pipeline_dag())
+PIPELINE_MODES = ("phased", "dag")
+DEFAULT_PIPELINE = "phased"
+
+# Concurrent Gemini slide renders when generating from a slide plan
+DEFAULT_IMAGE_CONCURRENT = 2
 
 
 # =============================================================================
@@ -74,6 +120,122 @@ def create_output_directories(output_dir: str) -> str:
     return videos_dir
 
 
+# =============================================================================
+# Slide Rendering
+# =============================================================================
+
+def plan_slide_renders(
+    slides_plan: Dict[str, Any],
+    style_template: str,
+    output_dir: str,
+) -> List[Dict[str, Any]]:
+    """
+    Build the Gemini render task of every slide in a slide plan.
+
+    Args:
+        slides_plan: Parsed slides plan (see generate_ppt.py).
+        style_template: Base style template text.
+        output_dir: Output directory (images go to output_dir/images).
+
+    Returns:
+        Render task dicts in slide order, each with the slide prompt and the
+        path its image will be saved to.
+    """
+    slides = slides_plan["slides"]
+    os.makedirs(os.path.join(output_dir, "images"), exist_ok=True)
+
+    renders = []
+    for slide_info in slides:
+        slide_number = slide_info["slide_number"]
+        page_type = slide_info.get("page_type", "content")
+        content_text = slide_info["content"]
+        renders.append({
+            "slide_number": slide_number,
+            "page_type": page_type,
+            "content": content_text,
+            "prompt": generate_slide_prompt(
+                style_template, page_type, content_text, slide_number, len(slides)
+            ),
+            "image_path": os.path.join(output_dir, "images", f"slide-{slide_number:02d}.png"),
+        })
+    return renders
+
+
+def render_slide(
+    render: Dict[str, Any],
+    output_dir: str,
+    resolution: str,
+    resume: bool = False,
+) -> Optional[str]:
+    """
+    Render one planned slide with Gemini.
+
+    Args:
+        render: Render task from plan_slide_renders().
+        output_dir: Output directory.
+        resolution: Image resolution (2K or 4K).
+        resume: Reuse the slide image if it already exists.
+
+    Returns:
+        Path to the slide image, or None if generation failed.
+    """
+    if resume and os.path.exists(render["image_path"]):
+        print(f"  Slide {render['slide_number']} reused: {render['image_path']}")
+        return render["image_path"]
+
+    image_path = generate_slide(
+        render["prompt"], render["slide_number"], output_dir, resolution
+    )
+    if not image_path:
+        print(f"  Slide {render['slide_number']} generation failed")
+        return None
+    return image_path
+
+
+def save_slide_outputs(
+    output_dir: str,
+    slides_plan: Dict[str, Any],
+    slide_renders: List[Dict[str, Any]],
+    resolution: str,
+    style_path: str,
+) -> None:
+    """
+    Save the slide prompts and slide viewer, as generate_ppt.py does.
+
+    Args:
+        output_dir: Output directory.
+        slides_plan: Parsed slides plan.
+        slide_renders: Render tasks from plan_slide_renders().
+        resolution: Image resolution.
+        style_path: Style template path.
+    """
+    prompts_data: Dict[str, Any] = {
+        "metadata": {
+            "title": slides_plan.get("title", "Untitled Presentation"),
+            "total_slides": len(slide_renders),
+            "resolution": resolution,
+            "style": style_path,
+            "generated_at": datetime.now().isoformat(),
+        },
+        "slides": [
+            {
+                "slide_number": render["slide_number"],
+                "page_type": render["page_type"],
+                "content": render["content"],
+                "prompt": render["prompt"],
+                "image_path": (
+                    render["image_path"] if os.path.exists(render["image_path"]) else None
+                ),
+            }
+            for render in slide_renders
+        ],
+    }
+    save_prompts(output_dir, prompts_data)
+
+    if os.path.exists(SLIDES_TEMPLATE_PATH):
+        generate_viewer_html(output_dir, len(slide_renders), SLIDES_TEMPLATE_PATH)
+
+
 def generate_ppt_video_from_images(
     slides_dir: str,
     output_dir: str,
@@ -84,6 +246,31 @@ def generate_ppt_video_from_images(
     max_concurrent: int = DEFAULT_MAX_CONCURRENT,
     skip_preview: bool = False,
     prompts_file: Optional[str] = None,
+    resume: bool = False,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+    cache_max_gb: float = DEFAULT_CACHE_MAX_GB,
+    transition_engine: str = DEFAULT_TRANSITION_ENGINE,
+    local_effect: str = DEFAULT_LOCAL_TRANSITION_EFFECT,
+    local_fallback: bool = True,
+    composition_mode: str = DEFAULT_COMPOSITION_MODE,
+    freeze_last_frame: bool = False,
+    chunked_encode: bool = False,
+    clip_cache_dir: Optional[str] = DEFAULT_CLIP_CACHE_DIR,
+    clip_cache_max_gb: float = DEFAULT_CLIP_CACHE_MAX_GB,
+    concat_group_size: int = DEFAULT_CONCAT_GROUP_SIZE,
+    encoding_profile: str = DEFAULT_ENCODING_PROFILE,
+    streaming_format: Optional[str] = None,
+    media_index_path: Optional[str] = DEFAULT_MEDIA_INDEX_PATH,
+    scratch_dir: Optional[str] = DEFAULT_SCRATCH_DIR,
+    prefer_tmpfs: bool = True,
+    stream_downloads: bool = False,
+    pipeline: str = DEFAULT_PIPELINE,
+    prompt_generator: Optional[Any] = None,
+    slide_renders: Optional[List[Dict[str, Any]]] = None,
+    image_resolution: str = DEFAULT_IMAGE_RESOLUTION,
+    image_concurrent: int = DEFAULT_IMAGE_CONCURRENT,
+    opening_boost: int = DEFAULT_OPENING_BOOST,
+    on_playable: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Generate video from existing PPT images.
@@ -98,6 +285,50 @@ def generate_ppt_video_from_images(
         max_concurrent: Maximum concurrent video generation tasks.
         skip_preview: Whether to skip preview video generation.
         prompts_file: Path to transition prompts JSON file.
+        resume: Reuse valid videos already in the output directory.
+        cache_dir: Transition cache directory shared across runs (None disables it).
+        cache_max_gb: Transition cache size cap in GB.
+        transition_engine: "kling" for AI transitions, "local" for instant
+            FFmpeg transitions (no Kling keys or prompts needed).
+        local_effect: Effect used by local transitions (see AVAILABLE_EFFECTS).
+        local_fallback: Render failed Kling transitions locally instead of hard cuts.
+        composition_mode: "clips" (static clip per slide, then concat),
+            "single_pass" (whole timeline in one encode), "match_source"
+            (static clips match the transition format, joined by stream copy)
+            or "incremental" (re-encode only clips changed since the last run).
+        freeze_last_frame: Hold each transition's last frame as the slide
+            instead of encoding the slide image.
+        chunked_encode: Encode the final video as parallel segments joined
+            by stream copy.
+        clip_cache_dir: Static slide clip cache directory shared across runs
+            (None disables it).
+        clip_cache_max_gb: Static clip cache size cap in GB.
+        concat_group_size: Maximum clips per re-encoding FFmpeg graph.
+        encoding_profile: x264 settings profile (draft, balanced or archival).
+        streaming_format: Also package the full video as an adaptive-bitrate
+            "hls" or "dash" ladder in output_dir/stream (None to skip).
+        media_index_path: Clip metadata index database shared across runs
+            (None keeps the index in memory for this run).
+        scratch_dir: Disk directory for composition intermediates (system
+            temp directory if None).
+        prefer_tmpfs: Put intermediates on tmpfs when they fit.
+        stream_downloads: Encode each Kling transition's composition segment
+            while it downloads (incremental composition mode only).
+        pipeline: "phased" or "dag" (overlap slide encoding and per-transition
+            composition work with Kling generation, see run_pipeline_dag();
+            always composes incrementally, so composition_mode and
+            chunked_encode do not apply).
+        prompt_generator: Transition prompt generator used when there is no
+            prompts file.
+        slide_renders: Render the slides with Gemini inside the DAG pipeline
+            instead of scanning slides_dir (see generate_ppt_video_from_plan()).
+        image_resolution: Gemini image resolution for slide_renders.
+        image_concurrent: Concurrent Gemini renders for slide_renders.
+        opening_boost: Number of opening transitions dispatched ahead of the
+            Kling preview (0 dispatches the preview first).
+        on_playable: Called with the playable prefix (see PlayablePrefix)
+            every time it grows; it is also written to
+            videos/playable_prefix.json.
 
     Returns:
         Result dictionary with generation statistics, or None on failure.
@@ -106,16 +337,20 @@ def generate_ppt_video_from_images(
     print("PPT Video Generation - Full Pipeline")
     print("=" * 80)
 
-    # Phase 1: Scan slide images
-    print(f"\nScanning slides directory: {slides_dir}")
-    try:
-        slides_paths = scan_slide_images(slides_dir)
-    except FileNotFoundError as e:
-        print(f"Error: {e}")
-        return None
+    # Phase 1: Scan slide images (or plan their renders)
+    if slide_renders:
+        slides_paths = [render["image_path"] for render in slide_renders]
+        print(f"\nRendering slides into: {os.path.dirname(slides_paths[0])}")
+    else:
+        print(f"\nScanning slides directory: {slides_dir}")
+        try:
+            slides_paths = scan_slide_images(slides_dir)
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            return None
 
     num_slides = len(slides_paths)
-    print(f"Found {num_slides} slides:")
+    print(f"{'Planned' if slide_renders else 'Found'} {num_slides} slides:")
     for i, path in enumerate(slides_paths, 1):
         print(f"  {i}. {Path(path).name}")
 
@@ -125,41 +360,150 @@ def generate_ppt_video_from_images(
     print(f"  Videos: {videos_dir}/")
 
     # Phase 3: Generate video materials
-    print("\n" + "=" * 80)
-    print("Phase 1: Generate Video Materials (Preview + Transitions)")
-    print("=" * 80)
+    composer: Optional[VideoComposer] = None
+    media_index = MediaIndex(media_index_path or MEMORY_INDEX)
+    pruned = media_index.prune()
+    if pruned:
+        print(f"  Media index: dropped {pruned} entries for deleted files")
+    composer_options = {
+        "clip_cache": (
+            StaticClipCache(clip_cache_dir, clip_cache_max_gb) if clip_cache_dir else None
+        ),
+        "concat_group_size": concat_group_size,
+        "encoding_profile": encoding_profile,
+        "media_index": media_index,
+        "scratch": ScratchSpace(scratch_dir, prefer_tmpfs),
+    }
 
-    materials_generator = VideoMaterialsGenerator(
-        max_concurrent=max_concurrent,
-        prompts_file=prompts_file,
-    )
+    if pipeline == "dag":
+        composer = VideoComposer(**composer_options)
+        materials_result = run_pipeline_dag(
+            composer=composer,
+            slides_paths=slides_paths,
+            output_dir=output_dir,
+            videos_dir=videos_dir,
+            video_mode=video_mode,
+            video_duration=video_duration,
+            slide_duration=slide_duration,
+            video_quality=video_quality,
+            max_concurrent=max_concurrent,
+            skip_preview=skip_preview,
+            prompts_file=prompts_file,
+            resume=resume,
+            cache_dir=cache_dir,
+            cache_max_gb=cache_max_gb,
+            transition_engine=transition_engine,
+            local_effect=local_effect,
+            local_fallback=local_fallback,
+            freeze_last_frame=freeze_last_frame,
+            stream_downloads=stream_downloads,
+            streaming_format=streaming_format,
+            prompt_generator=prompt_generator,
+            slide_renders=slide_renders,
+            image_resolution=image_resolution,
+            image_concurrent=image_concurrent,
+            opening_boost=opening_boost,
+            on_playable=on_playable,
+        )
+    elif transition_engine == "local":
+        print("\n" + "=" * 80)
+        print("Phase 1: Render Local Transitions")
+        print("=" * 80)
 
-    # Prepare content contexts
-    content_contexts = [
-        f"Transition from slide {i+1} to slide {i+2}"
-        for i in range(num_slides - 1)
-    ]
+        composer = VideoComposer(**composer_options)
+        local_generator = LocalTransitionGenerator(composer, effect=local_effect)
 
-    materials_result = materials_generator.generate_all_materials(
-        slides_paths=slides_paths,
-        output_dir=videos_dir,
-        content_contexts=content_contexts,
-        duration=video_duration,
-        mode=video_quality,
-        skip_preview=skip_preview,
-    )
+        start_time = time.time()
+        transition_results = local_generator.generate_transition_videos(
+            slides_paths=slides_paths,
+            output_dir=videos_dir,
+        )
+        failed_count = sum(1 for r in transition_results.values() if not r["success"])
+
+        materials_result = {
+            "preview": None,
+            "transitions": transition_results,
+            "total_duration": int(time.time() - start_time),
+            "success_count": len(transition_results) - failed_count,
+            "failed_count": failed_count,
+        }
+        VideoMaterialsGenerator.save_metadata(videos_dir, materials_result)
+    else:
+        print("\n" + "=" * 80)
+        print("Phase 1: Generate Video Materials (Preview + Transitions)")
+        print("=" * 80)
+
+        segment_stream_factory = None
+        if stream_downloads and video_mode in ("both", "local"):
+            if composition_mode == "incremental" and not freeze_last_frame:
+                composer = VideoComposer(**composer_options)
+                stream_target = os.path.join(output_dir, "full_ppt_video.mp4")
+                segment_stream_factory = (
+                    lambda path: composer.open_segment_stream(path, stream_target)
+                )
+            else:
+                print("Note: --stream-downloads needs --composition-mode incremental "
+                      "without --freeze-last-frame, downloading without streaming")
+
+        materials_generator = VideoMaterialsGenerator(
+            max_concurrent=max_concurrent,
+            prompt_generator=prompt_generator,
+            prompts_file=prompts_file,
+            cache=TransitionCache(cache_dir, cache_max_gb) if cache_dir else None,
+            media_index=media_index,
+            segment_stream_factory=segment_stream_factory,
+        )
+
+        # Prepare content contexts
+        content_contexts = [
+            f"Transition from slide {i+1} to slide {i+2}"
+            for i in range(num_slides - 1)
+        ]
+
+        materials_result = materials_generator.generate_all_materials(
+            slides_paths=slides_paths,
+            output_dir=videos_dir,
+            content_contexts=content_contexts,
+            duration=video_duration,
+            mode=video_quality,
+            skip_preview=skip_preview,
+            resume=resume,
+            opening_boost=opening_boost,
+            on_playable=on_playable,
+        )
+
+        has_failed_transitions = any(
+            not result["success"] for result in materials_result["transitions"].values()
+        )
+        if local_fallback and has_failed_transitions:
+            # Metadata keeps the Kling failures, so a later --resume retries them
+            print("\nRendering local fallbacks for failed transitions...")
+            try:
+                composer = composer or VideoComposer(**composer_options)
+                filled = LocalTransitionGenerator(
+                    composer, effect=local_effect
+                ).fill_failed_transitions(
+                    slides_paths,
+                    materials_result["transitions"],
+                    on_filled=materials_generator.playable_prefix.update,
+                )
+                print(f"  Local fallbacks: {filled}")
+                materials_result["success_count"] += filled
+                materials_result["failed_count"] -= filled
+            except FFmpegError as e:
+                print(f"Warning: Local fallback unavailable: {e}")
 
     if materials_result["failed_count"] > 0:
         print(f"\nWarning: {materials_result['failed_count']} video(s) failed")
         print("Continuing with composition, final video may be incomplete...")
 
     # Phase 4: Compose full video (if needed)
-    if video_mode in ("both", "local"):
+    if video_mode in ("both", "local") and pipeline != "dag":
         print("\n" + "=" * 80)
         print("Phase 2: Compose Full PPT Video")
         print("=" * 80)
 
-        composer = VideoComposer()
+        composer = composer or VideoComposer(**composer_options)
 
         # Build transitions dictionary
         transitions_dict = {
@@ -181,15 +525,25 @@ def generate_ppt_video_from_images(
             slide_duration=slide_duration,
             include_preview=False,
             preview_video_path=preview_video,
+            composition_mode=composition_mode,
+            freeze_last_frame=freeze_last_frame,
+            chunked_encode=chunked_encode,
+            # Local renders would impose their own encoding on the Kling clips
+            match_source_keys=[
+                key for key, result in materials_result["transitions"].items()
+                if result["success"]
+                and result.get("engine") != "local"
+                and not result.get("fallback")
+            ],
         )
 
         if compose_success:
-            print(f"Full video generated: {full_video_path}")
+            finalize_full_video(composer, full_video_path, output_dir, streaming_format)
         else:
             print("Full video composition failed")
 
     # Phase 5: Generate web viewer (if needed)
-    if video_mode in ("both", "web"):
+    if video_mode in ("both", "web") and pipeline != "dag":
         print("\n" + "=" * 80)
         print("Phase 3: Generate Web Viewer")
         print("=" * 80)
@@ -216,10 +570,14 @@ def generate_ppt_video_from_images(
     print(f"\nOutput files:")
     if video_mode in ("both", "local"):
         print(f"  Full video: {output_dir}/full_ppt_video.mp4")
+        if streaming_format:
+            print(f"  Streaming ladder: {output_dir}/stream/")
     if video_mode in ("both", "web"):
         print(f"  Web viewer: {output_dir}/video_index.html")
     print(f"  Video materials: {videos_dir}/")
     print(f"  Metadata: {videos_dir}/video_metadata.json")
+    if os.path.exists(os.path.join(videos_dir, PLAYABLE_PREFIX_FILENAME)):
+        print(f"  Playable prefix: {videos_dir}/{PLAYABLE_PREFIX_FILENAME}")
 
     print("\n" + "=" * 80 + "\n")
 
@@ -231,6 +589,469 @@ def generate_ppt_video_from_images(
     }
 
 
+def generate_ppt_video_from_plan(
+    plan_path: str,
+    style_path: str,
+    output_dir: str,
+    image_resolution: str = DEFAULT_IMAGE_RESOLUTION,
+    image_concurrent: int = DEFAULT_IMAGE_CONCURRENT,
+    prompts_file: Optional[str] = None,
+    **options: Any,
+) -> Optional[Dict[str, Any]]:
+    """
+    Generate slides and video from a slide plan in one pipeline.
+
+    Slides are rendered with Gemini inside the DAG pipeline and each
+    transition is dispatched as soon as both of its slides exist, so Gemini
+    and Kling work overlap. Without a prompts file, generic transition
+    prompts are used (SimpleTransitionPromptGenerator).
+
+    Args:
+        plan_path: Path to slides plan JSON file.
+        style_path: Path to style template file.
+        output_dir: Output directory (slide images go to output_dir/images).
+        image_resolution: Gemini image resolution (2K or 4K).
+        image_concurrent: Concurrent Gemini slide renders.
+        prompts_file: Path to transition prompts JSON file (optional).
+        **options: Video options, see generate_ppt_video_from_images().
+
+    Returns:
+        Result dictionary with generation statistics, or None on failure.
+    """
+    with open(plan_path, "r", encoding="utf-8") as f:
+        slides_plan = json.load(f)
+
+    if not slides_plan.get("slides"):
+        print(f"Error: No slides in plan: {plan_path}")
+        return None
+
+    slide_renders = plan_slide_renders(
+        slides_plan, load_style_template(style_path), output_dir
+    )
+
+    prompt_generator = None
+    if options.get("transition_engine", DEFAULT_TRANSITION_ENGINE) == "kling" and not prompts_file:
+        prompt_generator = SimpleTransitionPromptGenerator()
+
+    options["pipeline"] = "dag"
+    result = generate_ppt_video_from_images(
+        slides_dir=os.path.join(output_dir, "images"),
+        output_dir=output_dir,
+        prompts_file=prompts_file,
+        prompt_generator=prompt_generator,
+        slide_renders=slide_renders,
+        image_resolution=image_resolution,
+        image_concurrent=image_concurrent,
+        **options,
+    )
+
+    save_slide_outputs(output_dir, slides_plan, slide_renders, image_resolution, style_path)
+    return result
+
+
+def finalize_full_video(
+    composer: VideoComposer,
+    full_video_path: str,
+    output_dir: str,
+    streaming_format: Optional[str] = None,
+) -> None:
+    """
+    Post-process a composed full video for playback.
+
+    Args:
+        composer: Video composer.
+        full_video_path: Composed video path (rewritten in place).
+        output_dir: Output directory.
+        streaming_format: Also package an "hls" or "dash" ladder (None to skip).
+    """
+    # Move the moov atom to the front so playback starts immediately
+    faststart_path = os.path.join(output_dir, "full_ppt_video.faststart.mp4")
+    if composer.remux_faststart(full_video_path, faststart_path):
+        os.replace(faststart_path, full_video_path)
+    print(f"Full video generated: {full_video_path}")
+
+    if streaming_format:
+        stream_manifest = composer.package_streaming(
+            full_video_path,
+            os.path.join(output_dir, "stream"),
+            streaming_format=streaming_format,
+        )
+        if stream_manifest:
+            print(f"Streaming ladder generated: {stream_manifest}")
+        else:
+            print("Streaming packaging failed")
+
+
+# =============================================================================
+# DAG Pipeline
+# =============================================================================
+
+def run_pipeline_dag(
+    composer: VideoComposer,
+    slides_paths: List[str],
+    output_dir: str,
+    videos_dir: str,
+    video_mode: str,
+    video_duration: str,
+    slide_duration: int,
+    video_quality: str,
+    max_concurrent: int,
+    skip_preview: bool,
+    prompts_file: Optional[str],
+    resume: bool,
+    cache_dir: Optional[str],
+    cache_max_gb: float,
+    transition_engine: str,
+    local_effect: str,
+    local_fallback: bool,
+    freeze_last_frame: bool,
+    stream_downloads: bool,
+    streaming_format: Optional[str],
+    prompt_generator: Optional[Any] = None,
+    slide_renders: Optional[List[Dict[str, Any]]] = None,
+    image_resolution: str = DEFAULT_IMAGE_RESOLUTION,
+    image_concurrent: int = DEFAULT_IMAGE_CONCURRENT,
+    opening_boost: int = DEFAULT_OPENING_BOOST,
+    on_playable: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Run materials generation, composition and the web viewer as one task graph.
+
+    Slide segments start encoding immediately; each transition's segment is
+    encoded as soon as that transition lands (after a local fallback if it
+    failed); the final assembly is a stream-copy join of the prepared
+    incremental-mode segments. Metadata and the web viewer only wait on the
+    transitions. A critical-path report is printed at the end.
+
+    With slide_renders the slides themselves are rendered by Gemini inside
+    the graph: transition (i, i+1) is dispatched as soon as slides i and i+1
+    exist, so image and video generation overlap instead of running as two
+    separate passes over the deck.
+
+    Every pool dispatches in playback order (slide 1, transition 1->2,
+    slide 2, ...), so the opening of the video is ready first, and the
+    playable prefix is published as final transitions land.
+
+    Args:
+        composer: Video composer for all local work.
+        slides_paths: List of slide image paths.
+        output_dir: Output directory.
+        videos_dir: Directory for transition and preview videos.
+        slide_renders: Render tasks from plan_slide_renders() (None if the
+            slide images already exist).
+        Remaining arguments: see generate_ppt_video_from_images().
+
+    Returns:
+        Materials result dict in the same shape as generate_all_materials().
+    """
+    print("\n" + "=" * 80)
+    print("Pipeline: Dependency Graph")
+    print("=" * 80)
+
+    compose = video_mode in ("both", "local")
+    full_video_path = os.path.join(output_dir, "full_ppt_video.mp4")
+    num_transitions = len(slides_paths) - 1
+
+    materials_generator: Optional[VideoMaterialsGenerator] = None
+    previous_metadata: Dict[str, Any] = {}
+    if transition_engine == "kling":
+        segment_stream_factory = None
+        if stream_downloads and compose:
+            if not freeze_last_frame:
+                segment_stream_factory = (
+                    lambda path: composer.open_segment_stream(path, full_video_path)
+                )
+            else:
+                print("Note: --stream-downloads does not apply with --freeze-last-frame, "
+                      "downloading without streaming")
+        materials_generator = VideoMaterialsGenerator(
+            max_concurrent=max_concurrent,
+            prompt_generator=prompt_generator,
+            prompts_file=prompts_file,
+            cache=TransitionCache(cache_dir, cache_max_gb) if cache_dir else None,
+            media_index=composer.media_index,
+            segment_stream_factory=segment_stream_factory,
+        )
+        if resume:
+            previous_metadata = materials_generator.load_metadata(videos_dir) or {}
+
+    local_generator = None
+    if transition_engine == "local" or local_fallback:
+        local_generator = LocalTransitionGenerator(composer, effect=local_effect)
+
+    tasks = VideoMaterialsGenerator.plan_transitions(
+        slides_paths,
+        videos_dir,
+        [f"Transition from slide {i+1} to slide {i+2}" for i in range(num_transitions)],
+        previous_metadata.get("transitions", {}) if resume else None,
+    )
+    prefix = PlayablePrefix(tasks, slides_paths, videos_dir, on_playable)
+
+    # Dispatch priority = playback position: slide i at 2i, transition
+    # i -> i+1 at 2i + 1; the preview goes after the boosted opening transitions
+    preview_priority = 2 * min(opening_boost, num_transitions) - 0.5
+
+    TaskFn = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+    def published(fn: TaskFn) -> TaskFn:
+        """Wrap a final transition task so its result extends the playable prefix."""
+        def run(deps: Dict[str, Any]) -> Dict[str, Any]:
+            result = fn(deps)
+            prefix.update(result)
+            return result
+        return run
+
+    num_encodes = num_transitions + (0 if freeze_last_frame else num_transitions)
+    encode_workers, encode_threads = composer.plan_encode_pool(max(1, num_encodes))
+    pools = {"encode": encode_workers}
+    if materials_generator:
+        pools["kling"] = max_concurrent
+    if slide_renders:
+        pools["gemini"] = image_concurrent
+    dag = PipelineDAG(pools, on_cancel=composer.cancel)
+
+    # Gemini slide renders, dispatched in slide order
+    render_tasks: List[str] = []
+    if slide_renders:
+        for render in slide_renders:
+            render_tasks.append(dag.add_task(
+                f"render slide-{render['slide_number']:02d}",
+                lambda _, render=render: render_slide(
+                    render, output_dir, image_resolution, resume
+                ),
+                pool="gemini",
+                priority=2 * len(render_tasks),
+            ))
+
+    def slide_deps(*indexes: int) -> List[str]:
+        """Render tasks of the given slides (none when the slides exist)."""
+        return [render_tasks[i] for i in indexes] if render_tasks else []
+
+    def slides_ready(deps: Dict[str, Any], *indexes: int) -> bool:
+        """Check that the given slides were rendered (always true without renders)."""
+        return all(deps[name] for name in slide_deps(*indexes))
+
+    def unrendered(task: Dict[str, Any]) -> Dict[str, Any]:
+        """Failed transition result for a transition whose slides failed to render."""
+        return {
+            "from_to": task["key"],
+            "video_path": task["output_path"],
+            "prompt": "",
+            "duration": 0,
+            "success": False,
+            "error": "Slide image not rendered",
+        }
+
+    # Kling preview (not part of the composed video)
+    if materials_generator and not skip_preview:
+        def generate_preview(deps: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            if not slides_ready(deps, 0):
+                return {"success": False, "error": "Slide image not rendered"}
+            try:
+                return materials_generator.generate_preview_video(
+                    first_slide_path=slides_paths[0],
+                    output_dir=videos_dir,
+                    duration=video_duration,
+                    mode=video_quality,
+                    previous=(previous_metadata.get("preview") or {}) if resume else None,
+                )
+            except Exception as e:
+                print(f"Warning: Preview generation failed, continuing: {e}")
+                return {"success": False, "error": str(e)}
+
+        dag.add_task(
+            "preview", generate_preview,
+            deps=slide_deps(0), pool="kling", priority=preview_priority,
+        )
+
+    # Static slide segments do not depend on anything
+    slide_tasks = []
+    if compose and not freeze_last_frame:
+        for i, task in enumerate(tasks):
+            item = {
+                "type": "image",
+                "path": task["slide_to"],
+                "duration": slide_duration,
+                "label": f"slide-{task['key'].split('-')[-1]}",
+            }
+            slide_tasks.append(dag.add_task(
+                f"segment {item['label']}",
+                lambda deps, i=i, item=item: composer.prepare_segment(
+                    item, full_video_path, threads=encode_threads
+                ) if slides_ready(deps, i + 1) else None,
+                deps=slide_deps(i + 1),
+                pool="encode",
+                priority=2 * (i + 1),
+            ))
+
+    # Transition, optional local fallback, then its segment
+    generated_tasks = []
+    final_tasks = []
+    segment_tasks = []
+    has_fallback = materials_generator is not None and local_generator is not None
+    for i, task in enumerate(tasks):
+        key = task["key"]
+        pair_deps = slide_deps(i, i + 1)
+        priority = 2 * i + 1
+
+        if materials_generator:
+            generate = (
+                lambda deps, i=i, task=task: materials_generator.generate_transition(
+                    task, video_duration, video_quality
+                ) if slides_ready(deps, i, i + 1) else unrendered(task)
+            )
+            generated = dag.add_task(
+                f"kling {key}",
+                generate if has_fallback else published(generate),
+                deps=pair_deps,
+                pool="kling",
+                priority=priority,
+            )
+        else:
+            generated = dag.add_task(
+                f"local {key}",
+                published(lambda deps, i=i, task=task: local_generator.render_transition(
+                    task["slide_from"], task["slide_to"], task["output_path"]
+                ) if slides_ready(deps, i, i + 1) else unrendered(task)),
+                deps=pair_deps,
+                pool="encode",
+                priority=priority,
+            )
+        generated_tasks.append(generated)
+
+        final = generated
+        if has_fallback:
+            def fallback(
+                deps: Dict[str, Any],
+                i: int = i,
+                task: Dict[str, Any] = task,
+                generated: str = generated,
+            ) -> Dict[str, Any]:
+                result = deps[generated]
+                if result["success"] or not slides_ready(deps, i, i + 1):
+                    return result
+                print(f"  Falling back to local transition: {task['key']}")
+                local_result = local_generator.render_transition(
+                    task["slide_from"], task["slide_to"], task["output_path"]
+                )
+                if not local_result["success"]:
+                    return result
+                local_result["fallback"] = True
+                local_result["kling_error"] = result.get("error", "")
+                return local_result
+
+            final = dag.add_task(
+                f"fallback {key}", published(fallback),
+                deps=[generated] + pair_deps, pool="encode", priority=priority,
+            )
+        final_tasks.append(final)
+
+        if compose:
+            def prepare(
+                deps: Dict[str, Any],
+                final: str = final,
+                key: str = key,
+            ) -> Optional[str]:
+                result = deps[final]
+                if not result["success"]:
+                    return None
+                item = {"type": "video", "path": result["video_path"], "label": f"transition-{key}"}
+                if freeze_last_frame:
+                    item["hold"] = slide_duration
+                return composer.prepare_segment(item, full_video_path, threads=encode_threads)
+
+            segment_tasks.append(dag.add_task(
+                f"segment transition-{key}", prepare,
+                deps=[final], pool="encode", priority=priority,
+            ))
+
+    def materials(
+        deps: Dict[str, Any],
+        names: List[str],
+    ) -> Dict[str, Any]:
+        """Collect transition results (and the preview) into a materials result."""
+        transitions = {
+            deps[name]["from_to"]: deps[name] for name in names if deps.get(name)
+        }
+        preview = deps.get("preview")
+        success_count = sum(1 for r in transitions.values() if r["success"])
+        failed_count = len(transitions) - success_count
+        if preview is not None:
+            success_count += 1 if preview.get("success", True) else 0
+            failed_count += 0 if preview.get("success", True) else 1
+        return {
+            "preview": preview if preview and preview.get("success", True) else None,
+            "transitions": transitions,
+            "total_duration": int(time.time() - (dag.started or time.time())),
+            "success_count": success_count,
+            "failed_count": failed_count,
+        }
+
+    preview_deps = ["preview"] if "preview" in dag.tasks else []
+
+    # Metadata keeps the Kling failures, so a later --resume retries them
+    dag.add_task(
+        "metadata",
+        lambda deps: VideoMaterialsGenerator.save_metadata(
+            videos_dir, materials(deps, generated_tasks)
+        ),
+        deps=generated_tasks + preview_deps,
+        pool="encode",
+    )
+
+    if compose:
+        def compose_video(deps: Dict[str, Any]) -> bool:
+            if not slides_ready(deps, *range(len(slides_paths))):
+                print("Full video composition skipped: not every slide was rendered")
+                return False
+            result = materials(deps, final_tasks)
+            transitions_dict = {
+                key: r["video_path"] for key, r in result["transitions"].items() if r["success"]
+            }
+            success = composer.compose_full_ppt_video(
+                slides_paths=slides_paths,
+                transitions_dict=transitions_dict,
+                output_path=full_video_path,
+                slide_duration=slide_duration,
+                composition_mode="incremental",
+                freeze_last_frame=freeze_last_frame,
+            )
+            if success:
+                finalize_full_video(composer, full_video_path, output_dir, streaming_format)
+            else:
+                print("Full video composition failed")
+            return success
+
+        dag.add_task(
+            "compose", compose_video,
+            deps=render_tasks + final_tasks + slide_tasks + segment_tasks, pool="encode",
+        )
+
+    if video_mode in ("both", "web"):
+        def viewer(deps: Dict[str, Any]) -> Optional[str]:
+            result = materials(deps, final_tasks)
+            return generate_video_viewer(
+                slides_paths=slides_paths,
+                transitions_result=result["transitions"],
+                preview_result=result["preview"],
+                output_dir=output_dir,
+            )
+
+        dag.add_task(
+            "viewer", viewer, deps=render_tasks + final_tasks + preview_deps, pool="encode"
+        )
+
+    results = dag.run()
+    dag.report()
+    if prefix.first_playable_at is not None:
+        print(f"First playable: {prefix.first_playable_at:.0f}s "
+              f"({prefix.playable}/{num_transitions} transitions playable)\n")
+
+    return materials(
+        {name: results.get(name) for name in final_tasks + preview_deps}, final_tasks
+    )
+
+
 # =============================================================================
 # Web Viewer Generation
 # =============================================================================
@@ -325,6 +1146,20 @@ Examples:
     --video-quality pro \\
     --max-concurrent 3
 
+  # Slides and video in one run: each transition starts as soon as its
+  # two slides are rendered (generic prompts unless --prompts-file is given)
+  python generate_ppt_video.py \\
+    --plan slides_plan.json \\
+    --style styles/gradient-glass.md \\
+    --output-dir outputs/xxx_video
+
+  # Instant local transitions for internal review (no Kling, no prompts)
+  python generate_ppt_video.py \\
+    --slides-dir outputs/xxx/images \\
+    --output-dir outputs/xxx_review \\
+    --transition-engine local \\
+    --local-effect slide
+
 Workflow:
   1. Generate PPT images: python generate_ppt.py ...
   2. Have Claude Code analyze images and generate prompts:
@@ -339,11 +1174,34 @@ Notes:
 """,
     )
 
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--slides-dir",
-        required=True,
         help="PPT images directory (containing slide-01.png, slide-02.png, etc.)",
     )
+    source.add_argument(
+        "--plan",
+        help="Slides plan JSON file: render the slides with Gemini in the same "
+             "run, overlapping slide and transition generation (implies "
+             "--pipeline dag)",
+    )
+    parser.add_argument(
+        "--style",
+        help="Style template file (required with --plan)",
+    )
+    parser.add_argument(
+        "--image-resolution",
+        choices=["2K", "4K"],
+        default=DEFAULT_IMAGE_RESOLUTION,
+        help=f"Slide image resolution with --plan (default: {DEFAULT_IMAGE_RESOLUTION})",
+    )
+    parser.add_argument(
+        "--image-concurrent",
+        type=int,
+        default=DEFAULT_IMAGE_CONCURRENT,
+        help="Concurrent Gemini slide renders with --plan "
+             f"(default: {DEFAULT_IMAGE_CONCURRENT})",
+    )
     parser.add_argument(
         "--output-dir",
         required=True,
@@ -386,8 +1244,143 @@ Notes:
     )
     parser.add_argument(
         "--prompts-file",
-        required=True,
-        help="Path to transition prompts JSON file (generated by Claude Code)",
+        help="Path to transition prompts JSON file (generated by Claude Code, "
+             "required for the kling engine)",
+    )
+    parser.add_argument(
+        "--transition-engine",
+        choices=["kling", "local"],
+        default=DEFAULT_TRANSITION_ENGINE,
+        help="Transition engine: kling (AI video) or local (instant FFmpeg "
+             f"transitions for review) (default: {DEFAULT_TRANSITION_ENGINE})",
+    )
+    parser.add_argument(
+        "--local-effect",
+        choices=list(AVAILABLE_EFFECTS),
+        default=DEFAULT_LOCAL_TRANSITION_EFFECT,
+        help="Effect for local transitions and fallbacks "
+             f"(default: {DEFAULT_LOCAL_TRANSITION_EFFECT})",
+    )
+    parser.add_argument(
+        "--no-local-fallback",
+        action="store_true",
+        help="Hard-cut instead of rendering local transitions for failed Kling tasks",
+    )
+    parser.add_argument(
+        "--composition-mode",
+        choices=list(COMPOSITION_MODES),
+        default=None,
+        help="Full video composition: clips (static clip per slide, then concat), "
+             "single_pass (one encode straight from slide images) or "
+             "match_source (static clips encoded like the Kling clips, joined "
+             "by stream copy) or incremental (re-encode only changed clips, "
+             "reusing segments kept next to the output) "
+             f"(default: {DEFAULT_COMPOSITION_MODE})",
+    )
+    parser.add_argument(
+        "--freeze-last-frame",
+        action="store_true",
+        help="Show each slide by holding the last frame of its transition "
+             "instead of encoding the slide image",
+    )
+    parser.add_argument(
+        "--chunked-encode",
+        action="store_true",
+        help="Encode the final video as parallel segments joined by stream copy",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse valid videos from an earlier run in the output directory",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"Transition video cache directory (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-max-gb",
+        type=float,
+        default=DEFAULT_CACHE_MAX_GB,
+        help=f"Transition cache size cap in GB (default: {DEFAULT_CACHE_MAX_GB:g})",
+    )
+    parser.add_argument(
+        "--media-index",
+        default=DEFAULT_MEDIA_INDEX_PATH,
+        help=f"Clip metadata index database (default: {DEFAULT_MEDIA_INDEX_PATH})",
+    )
+    parser.add_argument(
+        "--clip-cache-dir",
+        default=DEFAULT_CLIP_CACHE_DIR,
+        help=f"Static slide clip cache directory (default: {DEFAULT_CLIP_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--clip-cache-max-gb",
+        type=float,
+        default=DEFAULT_CLIP_CACHE_MAX_GB,
+        help="Static clip cache size cap in GB "
+             f"(default: {DEFAULT_CLIP_CACHE_MAX_GB:g})",
+    )
+    parser.add_argument(
+        "--concat-group-size",
+        type=int,
+        default=DEFAULT_CONCAT_GROUP_SIZE,
+        help="Maximum clips per re-encoding FFmpeg graph; longer decks are "
+             f"encoded in groups to bound memory (default: {DEFAULT_CONCAT_GROUP_SIZE})",
+    )
+    parser.add_argument(
+        "--scratch-dir",
+        default=DEFAULT_SCRATCH_DIR,
+        help="Disk directory for composition intermediates, used when they do "
+             "not fit on tmpfs (default: $PPT_VIDEO_SCRATCH_DIR or system temp)",
+    )
+    parser.add_argument(
+        "--no-tmpfs",
+        action="store_true",
+        help="Never put composition intermediates on RAM-backed tmpfs",
+    )
+    parser.add_argument(
+        "--pipeline",
+        choices=list(PIPELINE_MODES),
+        default=DEFAULT_PIPELINE,
+        help="phased: materials, then composition, then viewer; dag: run them "
+             "as a dependency graph so slide and transition encoding overlap "
+             "Kling generation, with a critical-path report "
+             f"(default: {DEFAULT_PIPELINE})",
+    )
+    parser.add_argument(
+        "--opening-boost",
+        type=int,
+        default=DEFAULT_OPENING_BOOST,
+        help="Dispatch this many opening transitions ahead of the Kling preview; "
+             "transitions always start in playback order "
+             f"(default: {DEFAULT_OPENING_BOOST}, preview first)",
+    )
+    parser.add_argument(
+        "--stream-downloads",
+        action="store_true",
+        help="Encode each transition's segment while it downloads from Kling "
+             "(requires --composition-mode incremental)",
+    )
+    parser.add_argument(
+        "--encoding-profile",
+        choices=list(ENCODING_PROFILES),
+        default=DEFAULT_ENCODING_PROFILE,
+        help="x264 settings for every encode: draft (fast previews), balanced "
+             f"or archival (best quality) (default: {DEFAULT_ENCODING_PROFILE})",
+    )
+    parser.add_argument(
+        "--streaming",
+        choices=list(STREAMING_FORMATS),
+        default=None,
+        help="Also package the full video as an adaptive-bitrate HLS or DASH "
+             "ladder (1080p/720p/480p) in <output-dir>/stream",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the transition video and static clip caches and the "
+             "persistent media index",
     )
 
     return parser
@@ -403,10 +1396,45 @@ def validate_inputs(args: argparse.Namespace) -> bool:
     Returns:
         True if all inputs are valid, False otherwise.
     """
+    # --plan always runs the dag pipeline (see generate_ppt_video_from_plan())
+    if (args.plan or args.pipeline == "dag") and (
+        args.composition_mode not in (None, "incremental") or args.chunked_encode
+    ):
+        mode, hint = (
+            ("--plan", "") if args.plan else ("--pipeline dag", ", or use --pipeline phased")
+        )
+        print(f"Error: {mode} always composes incrementally from prepared segments")
+        print(f"  (drop --composition-mode and --chunked-encode{hint})")
+        return False
+
+    if args.plan:
+        if not os.path.exists(args.plan):
+            print(f"Error: Slides plan not found: {args.plan}")
+            return False
+        if not args.style or not os.path.exists(args.style):
+            print(f"Error: Style template not found: {args.style}")
+            print("  (--style is required with --plan)")
+            return False
+        if not os.environ.get("GEMINI_API_KEY"):
+            print("Error: GEMINI_API_KEY environment variable not set")
+            return False
+        if args.prompts_file and not os.path.exists(args.prompts_file):
+            print(f"Error: Prompts file not found: {args.prompts_file}")
+            return False
+        return True
+
     if not os.path.exists(args.slides_dir):
         print(f"Error: Slides directory not found: {args.slides_dir}")
         return False
 
+    if args.transition_engine == "local":
+        return True
+
+    if not args.prompts_file:
+        print("Error: --prompts-file is required for the kling transition engine")
+        print("  (use --transition-engine local for instant transitions without prompts)")
+        return False
+
     if not os.path.exists(args.prompts_file):
         print(f"Error: Prompts file not found: {args.prompts_file}")
         print(f"\nHow to generate prompts file:")
@@ -434,8 +1462,7 @@ def main() -> None:
 
     # Execute generation
     try:
-        result = generate_ppt_video_from_images(
-            slides_dir=args.slides_dir,
+        options: Dict[str, Any] = dict(
             output_dir=args.output_dir,
             video_mode=args.video_mode,
             video_duration=args.video_duration,
@@ -444,8 +1471,39 @@ def main() -> None:
             max_concurrent=args.max_concurrent,
             skip_preview=args.skip_preview,
             prompts_file=args.prompts_file,
+            resume=args.resume,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            cache_max_gb=args.cache_max_gb,
+            clip_cache_dir=None if args.no_cache else args.clip_cache_dir,
+            clip_cache_max_gb=args.clip_cache_max_gb,
+            media_index_path=None if args.no_cache else args.media_index,
+            concat_group_size=args.concat_group_size,
+            encoding_profile=args.encoding_profile,
+            streaming_format=args.streaming,
+            scratch_dir=args.scratch_dir,
+            prefer_tmpfs=not args.no_tmpfs,
+            stream_downloads=args.stream_downloads,
+            pipeline=args.pipeline,
+            opening_boost=args.opening_boost,
+            transition_engine=args.transition_engine,
+            local_effect=args.local_effect,
+            local_fallback=not args.no_local_fallback,
+            composition_mode=args.composition_mode or DEFAULT_COMPOSITION_MODE,
+            freeze_last_frame=args.freeze_last_frame,
+            chunked_encode=args.chunked_encode,
         )
 
+        if args.plan:
+            result = generate_ppt_video_from_plan(
+                plan_path=args.plan,
+                style_path=args.style,
+                image_resolution=args.image_resolution,
+                image_concurrent=args.image_concurrent,
+                **options,
+            )
+        else:
+            result = generate_ppt_video_from_images(slides_dir=args.slides_dir, **options)
+
         sys.exit(0 if result else 1)
 
     except KeyboardInterrupt:
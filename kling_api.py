@@ -10,7 +10,7 @@ import base64
 import os
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import jwt
 import requests
@@ -63,6 +63,7 @@ class KlingVideoGenerator:
         self,
         access_key: Optional[str] = None,
         secret_key: Optional[str] = None,
+        api_base_url: Optional[str] = None,
     ) -> None:
         """
         Initialize Kling API client.
@@ -70,12 +71,18 @@ class KlingVideoGenerator:
         Args:
             access_key: API access key. If not provided, reads from KLING_ACCESS_KEY env var.
             secret_key: API secret key. If not provided, reads from KLING_SECRET_KEY env var.
+            api_base_url: API endpoint. If not provided, reads from KLING_API_BASE_URL
+                env var, falling back to the official Beijing endpoint. Point this at
+                fake_kling_server.py for offline load testing.
 
         Raises:
             KlingConfigError: If API keys are not configured.
         """
         self.access_key = access_key or os.environ.get("KLING_ACCESS_KEY")
         self.secret_key = secret_key or os.environ.get("KLING_SECRET_KEY")
+        self.api_base_url = (
+            api_base_url or os.environ.get("KLING_API_BASE_URL") or API_BASE_URL
+        ).rstrip("/")
 
         if not self.access_key or not self.secret_key:
             raise KlingConfigError(
@@ -87,6 +94,8 @@ class KlingVideoGenerator:
 
         print("Kling API client initialized")
         print(f"  Access Key: {self.access_key[:8]}...{self.access_key[-4:]}")
+        if self.api_base_url != API_BASE_URL:
+            print(f"  Endpoint: {self.api_base_url}")
 
     # -------------------------------------------------------------------------
     # Authentication
@@ -221,7 +230,7 @@ class KlingVideoGenerator:
         print(f"  Type: {video_type}")
 
         # Send request
-        url = f"{API_BASE_URL}{API_CREATE_TASK}"
+        url = f"{self.api_base_url}{API_CREATE_TASK}"
         response = requests.post(url, json=request_body, headers=self._get_auth_headers())
 
         self._check_response(response, "create task")
@@ -248,7 +257,7 @@ class KlingVideoGenerator:
         Raises:
             KlingAPIError: If query fails.
         """
-        url = f"{API_BASE_URL}{API_QUERY_TASK.format(task_id=task_id)}"
+        url = f"{self.api_base_url}{API_QUERY_TASK.format(task_id=task_id)}"
         response = requests.get(url, headers=self._get_auth_headers())
 
         self._check_response(response, "query task")
@@ -305,13 +314,20 @@ class KlingVideoGenerator:
     # Video Download
     # -------------------------------------------------------------------------
 
-    def download_video(self, video_url: str, save_path: str) -> str:
+    def download_video(
+        self,
+        video_url: str,
+        save_path: str,
+        on_chunk: Optional[Callable[[bytes], None]] = None,
+    ) -> str:
         """
         Download generated video.
 
         Args:
             video_url: URL of the video to download.
             save_path: Path to save the video.
+            on_chunk: Called with each downloaded chunk as it arrives, so the
+                video can be processed while the transfer is still running.
 
         Returns:
             Path to saved video file.
@@ -331,10 +347,16 @@ class KlingVideoGenerator:
         if response.status_code != 200:
             raise KlingAPIError(f"Download failed with status {response.status_code}")
 
-        with open(save_path, "wb") as f:
+        # Write to a side file and swap in, so an interrupted download never
+        # leaves a truncated video (or clobbers a hard-linked cache entry)
+        partial_path = f"{save_path}.part"
+        with open(partial_path, "wb") as f:
             for chunk in response.iter_content(chunk_size=8192):
                 if chunk:
                     f.write(chunk)
+                    if on_chunk:
+                        on_chunk(chunk)
+        os.replace(partial_path, save_path)
 
         file_size_mb = os.path.getsize(save_path) / (1024 * 1024)
         print(f"Download complete! Size: {file_size_mb:.2f} MB")
@@ -351,6 +373,7 @@ class KlingVideoGenerator:
         image_end: Optional[str],
         prompt: str,
         output_path: str,
+        on_chunk: Optional[Callable[[bytes], None]] = None,
         **kwargs: Any,
     ) -> str:
         """
@@ -361,6 +384,7 @@ class KlingVideoGenerator:
             image_end: End frame image path (optional).
             prompt: Generation prompt.
             output_path: Path to save the video.
+            on_chunk: Called with each downloaded chunk (see download_video()).
             **kwargs: Additional arguments for create_video_task().
 
         Returns:
@@ -386,7 +410,7 @@ class KlingVideoGenerator:
             raise KlingAPIError("Task completed but no video returned")
 
         # Download video
-        return self.download_video(videos[0]["url"], output_path)
+        return self.download_video(videos[0]["url"], output_path, on_chunk)
 
     # -------------------------------------------------------------------------
     # Helpers
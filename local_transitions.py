@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Local Transition Generator Module.
+
+Renders slide-to-slide transitions locally with FFmpeg instead of Kling, either
+as a fast review mode for the whole deck or as a fallback for failed Kling tasks.
+Effects come from FFmpeg xfade or, for richer motion, the NumPy frame renderer.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from frame_renderer import RENDERED_EFFECTS, render_transition
+from video_composer import (
+    DEFAULT_FPS,
+    DEFAULT_LOCAL_TRANSITION_DURATION,
+    DEFAULT_LOCAL_TRANSITION_EFFECT,
+    DEFAULT_RESOLUTION,
+    LOCAL_TRANSITION_EFFECTS,
+    VideoComposer,
+)
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+# xfade effects plus NumPy-rendered effects
+AVAILABLE_EFFECTS = tuple(LOCAL_TRANSITION_EFFECTS) + RENDERED_EFFECTS
+
+
+# =============================================================================
+# Local Transition Generator
+# =============================================================================
+
+class LocalTransitionGenerator:
+    """Generator for FFmpeg-rendered transition videos."""
+
+    def __init__(
+        self,
+        composer: VideoComposer,
+        effect: str = DEFAULT_LOCAL_TRANSITION_EFFECT,
+        duration: float = DEFAULT_LOCAL_TRANSITION_DURATION,
+        resolution: str = DEFAULT_RESOLUTION,
+        fps: int = DEFAULT_FPS,
+    ) -> None:
+        """
+        Initialize local transition generator.
+
+        Args:
+            composer: Video composer used to render transitions.
+            effect: Transition effect name (see AVAILABLE_EFFECTS).
+            duration: Transition duration in seconds.
+            resolution: Output resolution (WxH format).
+            fps: Output frame rate.
+        """
+        self.composer = composer
+        self.effect = effect
+        self.duration = duration
+        self.resolution = resolution
+        self.fps = fps
+
+        print(f"Local transition generator initialized")
+        print(f"  Effect: {effect} ({duration}s)")
+
+    def render_transition(
+        self,
+        slide_from: str,
+        slide_to: str,
+        output_path: str,
+    ) -> Dict[str, Any]:
+        """
+        Render a single transition video.
+
+        Args:
+            slide_from: Source slide path.
+            slide_to: Target slide path.
+            output_path: Output video path.
+
+        Returns:
+            Result dict in the same shape as Kling transition results.
+        """
+        from_num = Path(slide_from).stem.split("-")[-1]
+        to_num = Path(slide_to).stem.split("-")[-1]
+        transition_key = f"{from_num}-{to_num}"
+
+        start_time = time.time()
+        if self.effect in RENDERED_EFFECTS:
+            result_path = render_transition(
+                self.composer,
+                image_from=slide_from,
+                image_to=slide_to,
+                output_path=output_path,
+                effect=self.effect,
+                duration=self.duration,
+                resolution=self.resolution,
+                fps=self.fps,
+            )
+        else:
+            result_path = self.composer.create_local_transition(
+                image_from=slide_from,
+                image_to=slide_to,
+                output_path=output_path,
+                effect=self.effect,
+                duration=self.duration,
+                resolution=self.resolution,
+                fps=self.fps,
+            )
+        elapsed = int(time.time() - start_time)
+
+        result: Dict[str, Any] = {
+            "from_to": transition_key,
+            "video_path": output_path,
+            "prompt": "",
+            "params": {
+                "engine": "local",
+                "effect": self.effect,
+                "duration": self.duration,
+            },
+            "duration": elapsed,
+            "success": result_path is not None,
+            "engine": "local",
+        }
+        if result_path is None:
+            result["error"] = "Local transition rendering failed"
+        return result
+
+    def generate_transition_videos(
+        self,
+        slides_paths: List[str],
+        output_dir: str,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Render all transitions of a deck.
+
+        Args:
+            slides_paths: List of slide image paths in order.
+            output_dir: Output directory.
+
+        Returns:
+            Dict mapping transition keys to result dicts.
+        """
+        print("\n" + "=" * 80)
+        print("Rendering Local Transitions")
+        print("=" * 80)
+
+        os.makedirs(output_dir, exist_ok=True)
+        start_time = time.time()
+        results: Dict[str, Dict[str, Any]] = {}
+
+        for i in range(len(slides_paths) - 1):
+            from_num = Path(slides_paths[i]).stem.split("-")[-1]
+            to_num = Path(slides_paths[i + 1]).stem.split("-")[-1]
+            output_path = os.path.join(output_dir, f"transition_{from_num}_to_{to_num}.mp4")
+
+            result = self.render_transition(slides_paths[i], slides_paths[i + 1], output_path)
+            results[result["from_to"]] = result
+
+        failed_count = sum(1 for r in results.values() if not r["success"])
+        print(f"\n  Rendered: {len(results) - failed_count}/{len(results)} "
+              f"in {time.time() - start_time:.1f}s\n")
+
+        return results
+
+    def fill_failed_transitions(
+        self,
+        slides_paths: List[str],
+        transition_results: Dict[str, Dict[str, Any]],
+        on_filled: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> int:
+        """
+        Replace failed Kling transitions with local renders, in place.
+
+        Args:
+            slides_paths: List of slide image paths in order.
+            transition_results: Kling transition results keyed by 'from-to'.
+            on_filled: Called with each local render once it replaces a
+                failed transition (e.g. PlayablePrefix.update).
+
+        Returns:
+            Number of transitions filled in.
+        """
+        filled = 0
+
+        for i in range(len(slides_paths) - 1):
+            from_num = Path(slides_paths[i]).stem.split("-")[-1]
+            to_num = Path(slides_paths[i + 1]).stem.split("-")[-1]
+            kling_result = transition_results.get(f"{from_num}-{to_num}")
+
+            if not kling_result or kling_result["success"]:
+                continue
+
+            print(f"  Falling back to local transition: {kling_result['from_to']}")
+            result = self.render_transition(
+                slides_paths[i], slides_paths[i + 1], kling_result["video_path"]
+            )
+            if result["success"]:
+                result["fallback"] = True
+                result["kling_error"] = kling_result.get("error", "")
+                transition_results[kling_result["from_to"]] = result
+                filled += 1
+                if on_filled:
+                    on_filled(result)
+
+        return filled
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Media Index Module.
+
+Small SQLite index of ffprobe results and content hashes for generated clips
+and slide images. Each file is probed and hashed once; entries are keyed by
+path and invalidated when the file's mtime or size changes, so concat
+planning, resume validation, duration lookups and cache keys never re-read an
+unchanged file or trust metadata of a rewritten one.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from file_cache import DEFAULT_CACHE_ROOT, hash_file
+from media_probe import check_decodable, probe_keyframe_interval, probe_video, validate_video
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+DEFAULT_MEDIA_INDEX_PATH = os.environ.get(
+    "PPT_VIDEO_MEDIA_INDEX",
+    os.path.join(DEFAULT_CACHE_ROOT, "media_index.sqlite3"),
+)
+
+# In-memory database (per process, nothing persisted)
+MEMORY_INDEX = ":memory:"
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    info TEXT NOT NULL,
+    keyframe_interval INTEGER,
+    decodable INTEGER,
+    updated REAL NOT NULL
+)
+"""
+
+HASH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+)
+"""
+
+
+# =============================================================================
+# Media Index
+# =============================================================================
+
+class MediaIndex:
+    """Persistent probe-once metadata index for media files."""
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_MEDIA_INDEX_PATH,
+        ffprobe_path: str = "ffprobe",
+        ffmpeg_path: str = "ffmpeg",
+    ) -> None:
+        """
+        Initialize media index.
+
+        Args:
+            db_path: SQLite database path (MEMORY_INDEX keeps it in memory).
+            ffprobe_path: Path to ffprobe executable.
+            ffmpeg_path: Path to FFmpeg executable (for decode checks).
+        """
+        self.ffprobe_path = ffprobe_path
+        self.ffmpeg_path = ffmpeg_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        try:
+            if db_path != MEMORY_INDEX:
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._conn = self._connect(db_path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"  Media index unavailable ({db_path}): {e}, using in-memory index")
+            db_path = MEMORY_INDEX
+            self._conn = self._connect(db_path)
+        self.db_path = db_path
+
+    @staticmethod
+    def _connect(db_path: str) -> sqlite3.Connection:
+        """Open the database and create the schema."""
+        conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        if db_path != MEMORY_INDEX:
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(INDEX_SCHEMA)
+        conn.execute(HASH_SCHEMA)
+        conn.commit()
+        return conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[str, int, int]]:
+        """Get (absolute path, mtime_ns, size), or None if the file is missing."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+    def _row(self, key: Tuple[str, int, int]) -> Optional[Tuple[Any, ...]]:
+        """Fetch the index row for a file if it is still current."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT info, keyframe_interval, decodable FROM media "
+                "WHERE path = ? AND mtime_ns = ? AND size = ?",
+                key,
+            ).fetchone()
+
+    def _update(self, path: str, column: str, value: Any) -> None:
+        """Set one derived column of an existing row."""
+        with self._lock:
+            self._conn.execute(f"UPDATE media SET {column} = ? WHERE path = ?", (value, path))
+            self._conn.commit()
+
+    def probe(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get clip metadata, probing the file only if it is new or changed.
+
+        Args:
+            path: Media file path.
+
+        Returns:
+            probe_video() fields plus content_hash, or None if the file is
+            missing or has no readable video stream (failures are not cached).
+        """
+        key = self._stat(path)
+        if not key:
+            return None
+
+        row = self._row(key)
+        if row:
+            self.hits += 1
+            return json.loads(row[0])
+
+        self.misses += 1
+        info = probe_video(path, self.ffprobe_path)
+        if not info:
+            return None
+        info["content_hash"] = self.content_hash(path)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO media "
+                "(path, mtime_ns, size, info, keyframe_interval, decodable, updated) "
+                "VALUES (?, ?, ?, ?, NULL, NULL, ?)",
+                (*key, json.dumps(info), time.time()),
+            )
+            self._conn.commit()
+        return info
+
+    def content_hash(self, path: str) -> str:
+        """
+        Get a file's SHA-256, reading the file only if it is new or changed.
+
+        Args:
+            path: File path (any file, e.g. a slide image).
+
+        Returns:
+            Hex digest string (see hash_file()).
+
+        Raises:
+            OSError: If the file cannot be read.
+        """
+        key = self._stat(path)
+        if key:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT sha256 FROM hashes WHERE path = ? AND mtime_ns = ? AND size = ?",
+                    key,
+                ).fetchone()
+            if row:
+                return row[0]
+
+        digest = hash_file(path)
+        if key:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO hashes (path, mtime_ns, size, sha256) "
+                    "VALUES (?, ?, ?, ?)",
+                    (*key, digest),
+                )
+                self._conn.commit()
+        return digest
+
+    def duration(self, path: str) -> float:
+        """Get a clip's duration in seconds (0 if it cannot be probed)."""
+        return (self.probe(path) or {}).get("duration") or 0.0
+
+    def keyframe_interval(self, path: str) -> Optional[int]:
+        """
+        Get a clip's keyframe interval in frames (see probe_keyframe_interval()).
+
+        Args:
+            path: Video file path.
+
+        Returns:
+            Keyframe interval, or None if it cannot be determined.
+        """
+        if not self.probe(path):
+            return None
+
+        key = self._stat(path)
+        row = self._row(key) if key else None
+        if row and row[1] is not None:
+            return row[1]
+
+        interval = probe_keyframe_interval(path, self.ffprobe_path)
+        if key and interval is not None:
+            self._update(key[0], "keyframe_interval", interval)
+        return interval
+
+    def validate(
+        self,
+        path: str,
+        expected_duration: Optional[float] = None,
+        decode: bool = True,
+    ) -> Tuple[bool, str]:
+        """
+        Check that a video file is usable, reusing indexed probe and decode results.
+
+        Args:
+            path: Video file path.
+            expected_duration: Expected duration in seconds (skip check if None).
+            decode: Whether to fully decode the stream (once per file version).
+
+        Returns:
+            Tuple of (is_valid, reason).
+        """
+        valid, reason = validate_video(
+            path, expected_duration, decode=False, info=self.probe(path)
+        )
+        if not valid or not decode:
+            return valid, reason
+
+        key = self._stat(path)
+        row = self._row(key) if key else None
+        if row and row[2] is not None:
+            decodable = bool(row[2])
+        else:
+            decodable = check_decodable(path, self.ffmpeg_path)
+            if key:
+                self._update(key[0], "decodable", int(decodable))
+
+        return (True, "ok") if decodable else (False, "decode errors")
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+
+    def forget(self, path: str) -> None:
+        """Drop a file's entry (e.g. before rewriting it in place)."""
+        with self._lock:
+            for table in ("media", "hashes"):
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE path = ?", (os.path.abspath(path),)
+                )
+            self._conn.commit()
+
+    def prune(self) -> int:
+        """
+        Remove entries whose files no longer exist.
+
+        Returns:
+            Number of entries removed.
+        """
+        removed = 0
+        with self._lock:
+            for table in ("media", "hashes"):
+                paths = [row[0] for row in self._conn.execute(f"SELECT path FROM {table}")]
+                missing = [(path,) for path in paths if not os.path.exists(path)]
+                self._conn.executemany(f"DELETE FROM {table} WHERE path = ?", missing)
+                removed += len(missing)
+            self._conn.commit()
+        return removed
+
+
+# =============================================================================
+# Main (for testing)
+# =============================================================================
+
+if __name__ == "__main__":
+    import sys
+
+    index = MediaIndex()
+    for media_path in sys.argv[1:]:
+        print(f"{media_path}: {index.probe(media_path)}")
+    print(f"Index: {index.db_path} ({index.hits} hits, {index.misses} misses)")
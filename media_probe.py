@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Media Probe Module.
+
+Thin wrappers around ffprobe/FFmpeg for reading clip parameters and checking
+that generated videos are complete and decodable.
+"""
+
+import json
+import os
+import subprocess
+from typing import Any, Dict, Optional, Tuple
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+PROBE_TIMEOUT = 30
+DECODE_CHECK_TIMEOUT = 120
+
+# Accept clips at least this fraction of the expected duration
+MIN_DURATION_RATIO = 0.9
+
+
+# =============================================================================
+# Probing
+# =============================================================================
+
+def _parse_rate(rate: Optional[str]) -> Optional[float]:
+    """Parse an ffprobe rational like '24/1' into a float."""
+    if not rate or rate == "0/0":
+        return None
+    num, _, den = rate.partition("/")
+    try:
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def probe_video(path: str, ffprobe_path: str = "ffprobe") -> Optional[Dict[str, Any]]:
+    """
+    Probe video stream parameters with ffprobe.
+
+    Args:
+        path: Video file path.
+        ffprobe_path: Path to ffprobe executable.
+
+    Returns:
+        Dict with codec, resolution, frame rate, duration and related fields of
+        the first video stream, or None if the file cannot be probed.
+    """
+    if not os.path.exists(path):
+        return None
+
+    try:
+        result = subprocess.run(
+            [
+                ffprobe_path,
+                "-v", "error",
+                "-show_streams",
+                "-show_format",
+                "-show_data_hash", "sha256",
+                "-of", "json",
+                path,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=PROBE_TIMEOUT,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+        print(f"  ffprobe error ({os.path.basename(path)}): {e}")
+        return None
+
+    if result.returncode != 0:
+        return None
+
+    try:
+        data = json.loads(result.stdout)
+    except json.JSONDecodeError:
+        return None
+
+    streams = data.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    if not video:
+        return None
+
+    fmt = data.get("format", {})
+    duration = video.get("duration") or fmt.get("duration")
+    bit_rate = video.get("bit_rate") or fmt.get("bit_rate")
+
+    return {
+        "codec_name": video.get("codec_name"),
+        "profile": video.get("profile"),
+        "level": video.get("level"),
+        "width": video.get("width"),
+        "height": video.get("height"),
+        "pix_fmt": video.get("pix_fmt"),
+        "sample_aspect_ratio": video.get("sample_aspect_ratio"),
+        "r_frame_rate": video.get("r_frame_rate"),
+        "fps": _parse_rate(video.get("r_frame_rate")),
+        "time_base": video.get("time_base"),
+        "extradata_hash": video.get("extradata_hash"),
+        "duration": float(duration) if duration else None,
+        "nb_frames": int(video["nb_frames"]) if video.get("nb_frames") else None,
+        "bit_rate": int(bit_rate) if bit_rate else None,
+        "has_audio": any(s.get("codec_type") == "audio" for s in streams),
+    }
+
+
+def probe_keyframe_interval(
+    path: str,
+    ffprobe_path: str = "ffprobe",
+) -> Optional[int]:
+    """
+    Measure the GOP length of a video from its packet keyframe flags.
+
+    Args:
+        path: Video file path.
+        ffprobe_path: Path to ffprobe executable.
+
+    Returns:
+        Frames between the first two keyframes, the total frame count if the
+        clip has a single keyframe, or None if it cannot be probed.
+    """
+    try:
+        result = subprocess.run(
+            [
+                ffprobe_path,
+                "-v", "error",
+                "-select_streams", "v:0",
+                "-show_entries", "packet=flags",
+                "-of", "csv=p=0",
+                path,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=PROBE_TIMEOUT,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+        print(f"  ffprobe error ({os.path.basename(path)}): {e}")
+        return None
+
+    if result.returncode != 0:
+        return None
+
+    flags = [line.strip() for line in result.stdout.splitlines() if line.strip()]
+    keyframes = [i for i, flag in enumerate(flags) if "K" in flag]
+    if len(keyframes) >= 2:
+        return keyframes[1] - keyframes[0]
+    return len(flags) or None
+
+
+def check_decodable(
+    path: str,
+    ffmpeg_path: str = "ffmpeg",
+    timeout: int = DECODE_CHECK_TIMEOUT,
+) -> bool:
+    """
+    Decode the full video stream to check for truncation or corruption.
+
+    Args:
+        path: Video file path.
+        ffmpeg_path: Path to FFmpeg executable.
+        timeout: Maximum decode time in seconds.
+
+    Returns:
+        True if the stream decodes without errors.
+    """
+    try:
+        result = subprocess.run(
+            [
+                ffmpeg_path,
+                "-v", "error",
+                "-xerror",
+                "-i", path,
+                "-map", "0:v:0",
+                "-f", "null",
+                "-",
+            ],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return False
+
+    return result.returncode == 0 and not result.stderr.strip()
+
+
+# =============================================================================
+# Validation
+# =============================================================================
+
+def validate_video(
+    path: str,
+    expected_duration: Optional[float] = None,
+    decode: bool = True,
+    ffmpeg_path: str = "ffmpeg",
+    ffprobe_path: str = "ffprobe",
+    info: Optional[Dict[str, Any]] = None,
+) -> Tuple[bool, str]:
+    """
+    Check that a video file is usable.
+
+    Args:
+        path: Video file path.
+        expected_duration: Expected duration in seconds (skip check if None).
+        decode: Whether to fully decode the stream.
+        ffmpeg_path: Path to FFmpeg executable.
+        ffprobe_path: Path to ffprobe executable.
+        info: probe_video() result for the file (probed if not provided).
+
+    Returns:
+        Tuple of (is_valid, reason).
+    """
+    if not os.path.exists(path):
+        return False, "file missing"
+
+    if os.path.getsize(path) == 0:
+        return False, "empty file"
+
+    info = info or probe_video(path, ffprobe_path)
+    if not info:
+        return False, "no readable video stream"
+
+    duration = info["duration"] or 0.0
+    if duration <= 0:
+        return False, "zero duration"
+
+    if expected_duration and duration < expected_duration * MIN_DURATION_RATIO:
+        return False, f"too short ({duration:.2f}s < {expected_duration}s)"
+
+    if decode and not check_decodable(path, ffmpeg_path):
+        return False, "decode errors"
+
+    return True, "ok"
+
+
+# =============================================================================
+# Main (for testing)
+# =============================================================================
+
+if __name__ == "__main__":
+    import sys
+
+    for video_path in sys.argv[1:]:
+        valid, reason = validate_video(video_path)
+        print(f"{video_path}: {'valid' if valid else 'invalid'} ({reason})")
+        print(f"  {probe_video(video_path)}")
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Pipeline DAG Module.
+
+Dependency-graph executor for the video pipeline. Each task runs as soon as
+its dependencies have finished, in a named worker pool sized for its kind of
+work (Kling API slots, CPU-bound encodes), so composition work overlaps the
+Kling wait instead of following it. Tasks are only handed to a pool when it
+has a free worker, lowest priority value first, so a task that becomes ready
+late (e.g. the segment of the opening transition) overtakes ready work that
+plays later. Every run records task timings and reports the critical path:
+the chain of dependent tasks that determined the total wall time.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+TASK_PENDING = "pending"
+TASK_RUNNING = "running"
+TASK_DONE = "done"
+TASK_FAILED = "failed"
+TASK_SKIPPED = "skipped"
+
+DEFAULT_POOL = "cpu"
+
+
+# =============================================================================
+# Pipeline DAG
+# =============================================================================
+
+class PipelineDAG:
+    """Executor for a graph of dependent tasks across named worker pools."""
+
+    def __init__(
+        self,
+        pools: Dict[str, int],
+        on_cancel: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Initialize pipeline DAG.
+
+        Args:
+            pools: Worker pool sizes by pool name (e.g. {"kling": 3, "cpu": 8}).
+            on_cancel: Called when the run is interrupted, to stop work already
+                running outside Python (e.g. VideoComposer.cancel).
+        """
+        self.pools = {name: max(1, size) for name, size in pools.items()}
+        self.on_cancel = on_cancel
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def add_task(
+        self,
+        name: str,
+        fn: Callable[[Dict[str, Any]], Any],
+        deps: Iterable[str] = (),
+        pool: str = DEFAULT_POOL,
+        priority: float = 0,
+    ) -> str:
+        """
+        Add a task to the graph.
+
+        Args:
+            name: Unique task name.
+            fn: Task function, called with a dict of its dependencies'
+                results keyed by task name.
+            deps: Names of tasks that must finish first (already added).
+            pool: Worker pool the task runs in.
+            priority: Dispatch priority within the pool, lower first (ties
+                run in the order tasks were added).
+
+        Returns:
+            Task name.
+
+        Raises:
+            ValueError: If the name is taken, a dependency is unknown or the
+                pool does not exist.
+        """
+        deps = list(deps)
+        if name in self.tasks:
+            raise ValueError(f"Duplicate task: {name}")
+        missing = [dep for dep in deps if dep not in self.tasks]
+        if missing:
+            raise ValueError(f"Unknown dependencies of {name}: {', '.join(missing)}")
+        if pool not in self.pools:
+            raise ValueError(f"Unknown pool for {name}: {pool}")
+
+        self.tasks[name] = {
+            "name": name,
+            "fn": fn,
+            "deps": deps,
+            "pool": pool,
+            "priority": priority,
+            "order": len(self.tasks),
+            "status": TASK_PENDING,
+            "result": None,
+            "error": None,
+            "ready": None,
+            "start": None,
+            "end": None,
+        }
+        return name
+
+    def result(self, name: str) -> Any:
+        """Get a finished task's result (None if it failed or was skipped)."""
+        return self.tasks[name]["result"]
+
+    # -------------------------------------------------------------------------
+    # Execution
+    # -------------------------------------------------------------------------
+
+    def _run_task(self, task: Dict[str, Any]) -> Any:
+        """Run one task with its dependencies' results."""
+        task["start"] = time.time()
+        try:
+            return task["fn"]({dep: self.tasks[dep]["result"] for dep in task["deps"]})
+        finally:
+            task["end"] = time.time()
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run all tasks, each as soon as its dependencies are done.
+
+        Whenever a pool has a free worker it takes the ready task with the
+        lowest priority value. A task that raises is marked failed and
+        everything depending on it is skipped; independent tasks keep running.
+
+        Returns:
+            Results of the finished tasks keyed by task name.
+        """
+        executors = {
+            name: ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"dag-{name}")
+            for name, size in self.pools.items()
+        }
+        running: Dict[Future, Dict[str, Any]] = {}
+        busy = {name: 0 for name in self.pools}
+        self.started = time.time()
+
+        try:
+            while True:
+                self._skip_blocked()
+                ready = []
+                for task in self.tasks.values():
+                    if task["status"] == TASK_PENDING and all(
+                        self.tasks[dep]["status"] == TASK_DONE for dep in task["deps"]
+                    ):
+                        if task["ready"] is None:
+                            task["ready"] = time.time()
+                        ready.append(task)
+
+                for task in sorted(ready, key=lambda t: (t["priority"], t["order"])):
+                    if busy[task["pool"]] >= self.pools[task["pool"]]:
+                        continue
+                    busy[task["pool"]] += 1
+                    task["status"] = TASK_RUNNING
+                    future = executors[task["pool"]].submit(self._run_task, task)
+                    running[future] = task
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    busy[task["pool"]] -= 1
+                    try:
+                        task["result"] = future.result()
+                        task["status"] = TASK_DONE
+                    except Exception as e:
+                        task["error"] = str(e)
+                        task["status"] = TASK_FAILED
+                        print(f"  Task failed: {task['name']}: {e}")
+        except BaseException:
+            for future in running:
+                future.cancel()
+            if self.on_cancel:
+                self.on_cancel()
+            raise
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+            self.finished = time.time()
+
+        return {
+            name: task["result"]
+            for name, task in self.tasks.items()
+            if task["status"] == TASK_DONE
+        }
+
+    def _skip_blocked(self) -> None:
+        """Mark pending tasks whose dependencies failed or were skipped."""
+        changed = True
+        while changed:
+            changed = False
+            for task in self.tasks.values():
+                if task["status"] == TASK_PENDING and any(
+                    self.tasks[dep]["status"] in (TASK_FAILED, TASK_SKIPPED)
+                    for dep in task["deps"]
+                ):
+                    task["status"] = TASK_SKIPPED
+                    changed = True
+
+    # -------------------------------------------------------------------------
+    # Reporting
+    # -------------------------------------------------------------------------
+
+    def critical_path(self) -> List[str]:
+        """
+        Find the chain of tasks that determined the total wall time.
+
+        Starting from the task that finished last, repeatedly follow the
+        dependency that finished last (the one the task was waiting on).
+
+        Returns:
+            Task names from the first to the last task of the chain.
+        """
+        finished = [task for task in self.tasks.values() if task["end"] is not None]
+        if not finished:
+            return []
+
+        task = max(finished, key=lambda t: t["end"])
+        path = [task["name"]]
+        while True:
+            deps = [self.tasks[dep] for dep in task["deps"] if self.tasks[dep]["end"] is not None]
+            if not deps:
+                break
+            task = max(deps, key=lambda t: t["end"])
+            path.append(task["name"])
+
+        return path[::-1]
+
+    def report(self) -> None:
+        """Print task timings and the critical path of the last run."""
+        if self.started is None:
+            return
+
+        wall = (self.finished or time.time()) - self.started
+        counts: Dict[str, int] = {}
+        for task in self.tasks.values():
+            counts[task["status"]] = counts.get(task["status"], 0) + 1
+        busy = {pool: 0.0 for pool in self.pools}
+        for task in self.tasks.values():
+            if task["start"] is not None and task["end"] is not None:
+                busy[task["pool"]] += task["end"] - task["start"]
+
+        print("\n" + "=" * 80)
+        print("Pipeline Report")
+        print("=" * 80)
+        print(f"  Wall time: {wall:.1f}s")
+        print("  Tasks: " + ", ".join(f"{count} {status}" for status, count in counts.items()))
+        for pool, size in self.pools.items():
+            print(f"  Pool {pool} ({size} workers): {busy[pool]:.1f}s busy "
+                  f"({busy[pool] / (wall * size) * 100 if wall else 0:.0f}% utilized)")
+
+        print("\n  Critical path:")
+        for name in self.critical_path():
+            task = self.tasks[name]
+            queued = task["start"] - task["ready"]
+            print(f"    {task['start'] - self.started:>7.1f}s  "
+                  f"{name:<32} {task['end'] - task['start']:>7.1f}s "
+                  f"[{task['pool']}]" + (f" (queued {queued:.1f}s)" if queued >= 0.1 else ""))
+
+        failed = [task for task in self.tasks.values() if task["status"] == TASK_FAILED]
+        if failed:
+            print("\n  Failed tasks:")
+            for task in failed:
+                print(f"    - {task['name']}: {task['error']}")
+        print("=" * 80 + "\n")
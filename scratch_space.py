@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Scratch Space Module.
+
+Chooses where composition intermediates are written. RAM-backed tmpfs is
+preferred when the estimated working set fits comfortably; otherwise a disk
+directory is used. Space is checked before any encoding starts, and usage is
+sampled while the scratch directory is in use so the peak can be reported.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from typing import List, Optional
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+# Disk scratch directory (system temp directory if unset)
+DEFAULT_SCRATCH_DIR = os.environ.get("PPT_VIDEO_SCRATCH_DIR") or None
+
+# RAM-backed filesystems tried first
+TMPFS_CANDIDATES = ("/dev/shm",)
+
+# tmpfs competes with FFmpeg for memory: only use it when the estimate fits
+# in this fraction of its free space
+TMPFS_MAX_FILL_RATIO = 0.5
+
+# Margin applied to every estimate before comparing it with free space
+SCRATCH_SAFETY_FACTOR = 1.5
+
+# Seconds between scratch usage samples
+SCRATCH_SAMPLE_INTERVAL = 0.5
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def directory_size(path: str) -> int:
+    """Get the total size of the files under a directory in bytes."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def free_bytes(path: str) -> int:
+    """
+    Get the free space of the filesystem that holds (or would hold) a path.
+
+    Args:
+        path: Directory path; missing directories are resolved to their
+            nearest existing parent.
+
+    Returns:
+        Free bytes, or 0 if unknown.
+    """
+    path = os.path.abspath(path)
+    while not os.path.exists(path) and os.path.dirname(path) != path:
+        path = os.path.dirname(path)
+
+    try:
+        return shutil.disk_usage(path).free
+    except OSError:
+        return 0
+
+
+def _format_size(num_bytes: float) -> str:
+    """Format a byte count for log lines."""
+    return f"{num_bytes / (1024 * 1024):.1f} MB"
+
+
+# =============================================================================
+# Scratch Space
+# =============================================================================
+
+class ScratchSpace:
+    """Scratch directory allocator with tmpfs preference and space checks."""
+
+    def __init__(
+        self,
+        scratch_dir: Optional[str] = DEFAULT_SCRATCH_DIR,
+        prefer_tmpfs: bool = True,
+    ) -> None:
+        """
+        Initialize scratch space manager.
+
+        Args:
+            scratch_dir: Disk directory for intermediates (system temp
+                directory if None).
+            prefer_tmpfs: Use a RAM-backed filesystem when the estimate fits.
+        """
+        self.scratch_dir = scratch_dir
+        self.prefer_tmpfs = prefer_tmpfs
+        self.current: Optional[str] = None
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    def candidates(self) -> List[str]:
+        """List candidate base directories in order of preference."""
+        dirs: List[str] = []
+        if self.prefer_tmpfs:
+            dirs += [d for d in TMPFS_CANDIDATES if os.access(d, os.W_OK)]
+        dirs.append(self.scratch_dir or tempfile.gettempdir())
+        return dirs
+
+    def allocate(self, required_bytes: int, prefix: str = "ppt_video_") -> Optional[str]:
+        """
+        Create a scratch directory on the first location with enough space.
+
+        Args:
+            required_bytes: Estimated peak size of the intermediates.
+            prefix: Directory name prefix.
+
+        Returns:
+            Path to the new scratch directory, or None if no location has
+            enough free space.
+        """
+        needed = int(required_bytes * SCRATCH_SAFETY_FACTOR)
+        disk_dir = self.candidates()[-1]
+
+        for base_dir in self.candidates():
+            available = free_bytes(base_dir)
+            if base_dir != disk_dir:
+                available = int(available * TMPFS_MAX_FILL_RATIO)
+            if available < needed:
+                continue
+
+            try:
+                os.makedirs(base_dir, exist_ok=True)
+                path = tempfile.mkdtemp(prefix=prefix, dir=base_dir)
+            except OSError as e:
+                print(f"  Scratch directory unusable ({base_dir}): {e}")
+                continue
+
+            kind = "tmpfs" if base_dir != disk_dir else "disk"
+            print(f"Scratch: {path} ({kind}, need ~{_format_size(needed)}, "
+                  f"{_format_size(free_bytes(base_dir))} free)")
+            self._start(path)
+            return path
+
+        print(f"  Not enough scratch space: need ~{_format_size(needed)}, "
+              f"{_format_size(free_bytes(disk_dir))} free in {disk_dir}")
+        print("  (use --scratch-dir or PPT_VIDEO_SCRATCH_DIR to pick a larger disk)")
+        return None
+
+    def release(self) -> None:
+        """Stop usage sampling, remove the scratch directory and report its peak size."""
+        path = self.current
+        if not path:
+            return
+
+        self._stop.set()
+        if self._monitor:
+            self._monitor.join()
+        self.peak_bytes = max(self.peak_bytes, directory_size(path))
+        self.current = None
+
+        shutil.rmtree(path, ignore_errors=True)
+        print(f"  Removed: {path} (peak scratch usage {_format_size(self.peak_bytes)})\n")
+
+    # -------------------------------------------------------------------------
+    # Usage Sampling
+    # -------------------------------------------------------------------------
+
+    def _start(self, path: str) -> None:
+        """Start sampling the size of a scratch directory."""
+        self.current = path
+        self.peak_bytes = 0
+        self._stop.clear()
+        self._monitor = threading.Thread(target=self._sample, args=(path,), daemon=True)
+        self._monitor.start()
+
+    def _sample(self, path: str) -> None:
+        """Record the peak size of a scratch directory until released."""
+        while not self._stop.wait(SCRATCH_SAMPLE_INTERVAL):
+            self.peak_bytes = max(self.peak_bytes, directory_size(path))
@@ -6,12 +6,25 @@ Responsible for converting static images to videos, concatenating video clips,
 and composing complete PPT videos.
 """
 
+import json
 import os
+import re
 import shutil
+import signal
 import subprocess
+import sys
 import tempfile
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import IO, Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from file_cache import DEFAULT_CACHE_ROOT, MediaCache, hash_file, hash_text
+from media_index import MEMORY_INDEX, MediaIndex
+from scratch_space import ScratchSpace
 
 
 # =============================================================================
@@ -21,7 +34,147 @@ from typing import Dict, List, Optional
 DEFAULT_RESOLUTION = "1920x1080"
 DEFAULT_FPS = 24
 DEFAULT_SLIDE_DURATION = 2
+DEFAULT_LOCAL_TRANSITION_DURATION = 1.0
+DEFAULT_LOCAL_TRANSITION_EFFECT = "fade"
+DEFAULT_COMPOSITION_MODE = "clips"
+COMPOSITION_MODES = ("clips", "single_pass", "match_source", "incremental")
+# Timeouts: FFMPEG_TIMEOUT applies when the output duration is unknown;
+# otherwise the budget scales with the output duration until the measured
+# encode speed gives a projection. Runs without progress for
+# FFMPEG_STALL_TIMEOUT seconds are killed regardless.
 FFMPEG_TIMEOUT = 300  # 5 minutes
+FFMPEG_MIN_TIMEOUT = 60
+FFMPEG_TIMEOUT_PER_OUTPUT_SECOND = 20  # allows encodes down to 0.05x realtime
+FFMPEG_SPEED_SAFETY_FACTOR = 3.0
+FFMPEG_TIMEOUT_GRACE = 30
+FFMPEG_STALL_TIMEOUT = 60
+FFMPEG_WATCHDOG_INTERVAL = 1.0
+
+# FFmpeg output handling: stderr lines kept for error reports, and how often
+# progress is logged when no progress callback is set
+STDERR_TAIL_LINES = 100
+STDERR_REPORT_LINES = 15
+PROGRESS_LOG_INTERVAL = 5.0  # seconds
+
+# Static clip cache (persistent across compositions)
+DEFAULT_CLIP_CACHE_DIR = os.environ.get(
+    "PPT_VIDEO_CLIP_CACHE_DIR", os.path.join(DEFAULT_CACHE_ROOT, "static_clips")
+)
+DEFAULT_CLIP_CACHE_MAX_GB = 2.0
+
+# Named x264 settings shared by every encode the composer runs. "balanced"
+# matches the original hardcoded settings; gop_seconds None keeps the x264
+# default keyframe interval; still_tune applies to static slide clips only.
+ENCODING_PROFILES = {
+    "draft": {
+        "preset": "ultrafast",
+        "crf": 28,
+        "still_tune": "stillimage",
+        "gop_seconds": 10,
+        "threads": None,
+        "x264_params": None,
+    },
+    "balanced": {
+        "preset": "medium",
+        "crf": 23,
+        "still_tune": "stillimage",
+        "gop_seconds": None,
+        "threads": None,
+        "x264_params": None,
+    },
+    "archival": {
+        "preset": "slow",
+        "crf": 18,
+        "still_tune": "stillimage",
+        "gop_seconds": 10,
+        "threads": None,
+        "x264_params": "aq-mode=3",
+    },
+}
+DEFAULT_ENCODING_PROFILE = "balanced"
+
+# x264 presets that disable CABAC, 8x8dct and B-frames (always Constrained
+# Baseline, whatever -profile:v asks for), mapped to the fastest preset that
+# keeps them for encodes matched to a Main or High source
+BASELINE_ONLY_PRESETS = {"ultrafast": "superfast"}
+
+# Settings baked into create_static_video(); change them together so stale
+# cached clips are not reused
+STATIC_CLIP_ENCODER = {
+    "codec": "libx264",
+    "pix_fmt": "yuv420p",
+    "scale": "fit-pad",
+}
+
+# Re-encoding concat opens at most this many inputs per FFmpeg graph; longer
+# timelines are encoded in groups that are then joined by stream copy
+DEFAULT_CONCAT_GROUP_SIZE = 24
+
+# Incremental recomposition: per-item segments kept next to the output
+SEGMENT_MANIFEST_VERSION = 1
+SEGMENT_ENCODER = {
+    "codec": "libx264",
+    "pix_fmt": "yuv420p",
+}
+
+# Download streaming: MP4 header bytes inspected for a leading moov atom before
+# a download is piped into its segment encoder (mdat first cannot be decoded
+# from a pipe)
+MOOV_SNIFF_LIMIT = 1024 * 1024
+
+# Adaptive streaming packaging: renditions taller than the source are skipped;
+# keyframes are forced on segment boundaries so every rendition switches cleanly
+STREAMING_FORMATS = ("hls", "dash")
+DEFAULT_STREAMING_FORMAT = "hls"
+DEFAULT_STREAMING_LADDER = (
+    {"name": "1080p", "height": 1080, "maxrate": "5000k", "bufsize": "10000k"},
+    {"name": "720p", "height": 720, "maxrate": "2800k", "bufsize": "5600k"},
+    {"name": "480p", "height": 480, "maxrate": "1400k", "bufsize": "2800k"},
+)
+STREAMING_SEGMENT_SECONDS = 4
+STREAMING_AUDIO_BITRATE = "128k"
+
+# Scratch space estimate: average encoded bits per pixel of intermediates and
+# how many copies of the timeline exist at once in clip-based modes (clips plus
+# joined groups or segments); single_pass and incremental need at most one
+SCRATCH_BITS_PER_PIXEL = 0.2
+SCRATCH_TIMELINE_COPIES = 2
+
+# Parallel encoding: workers x threads-per-job never exceeds available cores
+CPU_COUNT = os.cpu_count() or 1
+
+# Stream parameters that must match for stream-copy concatenation
+CONCAT_COPY_FIELDS = (
+    "codec_name",
+    "profile",
+    "width",
+    "height",
+    "pix_fmt",
+    "sample_aspect_ratio",
+    "r_frame_rate",
+    "level",
+    "time_base",
+)
+
+# ffprobe H.264 profile names mapped to libx264 -profile:v values
+H264_PROFILES = {
+    "Baseline": "baseline",
+    "Constrained Baseline": "baseline",
+    "Main": "main",
+    "High": "high",
+    "High 10": "high10",
+    "High 4:2:2": "high422",
+    "High 4:4:4 Predictive": "high444",
+}
+
+# Local transition effects mapped to FFmpeg xfade transition names
+LOCAL_TRANSITION_EFFECTS = {
+    "fade": "fade",
+    "dissolve": "dissolve",
+    "slide": "slideleft",
+    "zoom": "zoomin",
+    "wipe": "wipeleft",
+}
 
 
 # =============================================================================
@@ -33,6 +186,220 @@ class FFmpegError(Exception):
     pass
 
 
+# =============================================================================
+# Static Clip Cache
+# =============================================================================
+
+class StaticClipCache(MediaCache):
+    """Persistent cache of static slide clips keyed by image and encode settings."""
+
+    label = "Static clip cache"
+    default_dir = DEFAULT_CLIP_CACHE_DIR
+    default_max_gb = DEFAULT_CLIP_CACHE_MAX_GB
+
+    @classmethod
+    def make_key(
+        cls,
+        image_path: str,
+        duration: float,
+        resolution: str,
+        fps: float,
+        encoder_params: Optional[Dict[str, str]] = None,
+        profile: Optional[Dict[str, Any]] = None,
+        content_hash: Callable[[str], str] = hash_file,
+    ) -> str:
+        """
+        Build the content-addressed cache key.
+
+        Args:
+            image_path: Slide image path.
+            duration: Clip duration in seconds.
+            resolution: Clip resolution (WxH format).
+            fps: Clip frame rate.
+            encoder_params: Stream parameters the clip was matched to.
+            profile: Encoding profile settings the clip was encoded with.
+            content_hash: Image hash function (e.g. MediaIndex.content_hash,
+                which keeps digests across runs).
+
+        Returns:
+            Hex digest key.
+        """
+        return cls.hash_fields({
+            "image": content_hash(image_path),
+            "duration": duration,
+            "resolution": resolution,
+            "fps": fps,
+            "encoder": STATIC_CLIP_ENCODER,
+            "encoder_params": encoder_params or {},
+            "profile": profile or {},
+        })
+
+
+# =============================================================================
+# Segment Stream
+# =============================================================================
+
+class SegmentStream:
+    """Incremental-mode segment encoder fed with a video's download bytes."""
+
+    def __init__(
+        self,
+        composer: "VideoComposer",
+        cmd: List[str],
+        video_path: str,
+        segment_dir: str,
+        partial_path: str,
+        resolution: str,
+        fps: int,
+    ) -> None:
+        """
+        Initialize segment stream (see VideoComposer.open_segment_stream()).
+
+        Args:
+            composer: Composer computing the segment key and owning FFmpeg.
+            cmd: FFmpeg command reading the video from stdin.
+            video_path: Path the video is being downloaded to.
+            segment_dir: Incremental segment directory.
+            partial_path: Encoder output path until the segment is complete.
+            resolution: Composition resolution.
+            fps: Composition FPS.
+        """
+        self.composer = composer
+        self.cmd = cmd
+        self.video_path = video_path
+        self.segment_dir = segment_dir
+        self.partial_path = partial_path
+        self.resolution = resolution
+        self.fps = fps
+        self.process: Optional[subprocess.Popen] = None
+        self.error: Optional[str] = None
+        self._header = bytearray()
+        self._stderr_tail: Deque[str] = deque(maxlen=STDERR_TAIL_LINES)
+        self._stderr_thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _moov_first(header: bytes) -> Optional[bool]:
+        """
+        Check whether an MP4's moov atom precedes its media data.
+
+        Args:
+            header: Leading bytes of the file.
+
+        Returns:
+            True if moov comes first, False if mdat does, or None if more
+            bytes are needed to tell.
+        """
+        offset = 0
+        while offset + 8 <= len(header):
+            size = int.from_bytes(header[offset:offset + 4], "big")
+            box_type = bytes(header[offset + 4:offset + 8])
+            if box_type == b"moov":
+                return True
+            if box_type == b"mdat" or size == 0:
+                return False
+            if size == 1:
+                if offset + 16 > len(header):
+                    return None
+                size = int.from_bytes(header[offset + 8:offset + 16], "big")
+            if size < 8:
+                return False
+            offset += size
+        return None
+
+    def write(self, chunk: bytes) -> None:
+        """Feed the next downloaded bytes (ignored once streaming failed)."""
+        if self.error:
+            return
+
+        if self.process is None:
+            self._header += chunk
+            moov_first = self._moov_first(self._header)
+            if moov_first is None and len(self._header) < MOOV_SNIFF_LIMIT:
+                return
+            if not moov_first:
+                self.abort("moov atom not at the start of the file")
+                return
+            self.process = subprocess.Popen(
+                self.cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                start_new_session=True,
+            )
+            self._stderr_thread = threading.Thread(target=self._drain_stderr, daemon=True)
+            self._stderr_thread.start()
+            chunk, self._header = bytes(self._header), bytearray()
+
+        try:
+            self.process.stdin.write(chunk)
+        except (BrokenPipeError, OSError) as e:
+            self.abort(f"encoder stopped reading: {e}")
+
+    def finish(self) -> Optional[str]:
+        """
+        Complete the segment after the download finished.
+
+        Returns:
+            Path to the segment, or None if streaming failed (the segment is
+            then encoded from the downloaded file during composition).
+        """
+        if not self.error and self.process is None:
+            self.abort("download ended before the moov atom")
+        if self.error:
+            return None
+
+        try:
+            self.process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        returncode = self.process.wait()
+        self._stderr_thread.join()
+        if returncode != 0:
+            self.abort(self._stderr_tail[-1] if self._stderr_tail else "encoder failed")
+            return None
+
+        # A stream cut short can still encode cleanly; require the full clip
+        index = self.composer.media_index
+        missing = index.duration(self.video_path) - index.duration(self.partial_path)
+        if missing > 2 / self.fps:
+            self.abort(f"segment {missing:.2f}s shorter than the download")
+            return None
+
+        key = self.composer._segment_key(
+            {"type": "video", "path": self.video_path}, self.resolution, self.fps
+        )
+        segment_path = os.path.join(self.segment_dir, f"{key[:24]}.mp4")
+        os.replace(self.partial_path, segment_path)
+
+        print(f"  Segment streamed during download: {Path(self.video_path).name}")
+        return segment_path
+
+    def _drain_stderr(self) -> None:
+        """Keep the last FFmpeg stderr lines so the pipe never fills up."""
+        for line in self.process.stderr:
+            text = line.decode("utf-8", "replace").strip()
+            if text:
+                self._stderr_tail.append(text)
+
+    def abort(self, reason: str) -> None:
+        """Stop streaming and discard the partial segment."""
+        if self.error:
+            return
+        self.error = reason
+
+        if self.process is not None:
+            self.composer._kill_process(self.process)
+            try:
+                self.process.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.wait()
+        VideoComposer._remove_partial(self.partial_path)
+
+        print(f"  Segment streaming skipped for {Path(self.video_path).name} "
+              f"({reason}); encoding after download")
+
+
 # =============================================================================
 # Video Composer
 # =============================================================================
@@ -40,17 +407,61 @@ class FFmpegError(Exception):
 class VideoComposer:
     """FFmpeg-based video composer for PPT video generation."""
 
-    def __init__(self, ffmpeg_path: str = "ffmpeg") -> None:
+    def __init__(
+        self,
+        ffmpeg_path: str = "ffmpeg",
+        clip_cache: Optional[StaticClipCache] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        concat_group_size: int = DEFAULT_CONCAT_GROUP_SIZE,
+        encoding_profile: str = DEFAULT_ENCODING_PROFILE,
+        media_index: Optional[MediaIndex] = None,
+        scratch: Optional[ScratchSpace] = None,
+    ) -> None:
         """
         Initialize video composer.
 
         Args:
-            ffmpeg_path: Path to FFmpeg executable.
+            ffmpeg_path: Path to FFmpeg executable (ffprobe is expected
+                alongside it).
+            clip_cache: Persistent cache for static slide clips (optional).
+            progress_callback: Called with each FFmpeg progress event (see
+                _progress_event()); progress is logged periodically if None.
+            concat_group_size: Maximum inputs per re-encoding FFmpeg graph;
+                bounds decoder count and memory for long decks.
+            encoding_profile: Name of the ENCODING_PROFILES entry used for
+                every encode.
+            media_index: Index used for all clip probing (an in-memory index
+                for this composer if not provided).
+            scratch: Scratch space manager for intermediates (tmpfs when it
+                fits, else the system temp directory, if not provided).
 
         Raises:
             FFmpegError: If FFmpeg is not available.
+            ValueError: If the encoding profile is unknown.
         """
+        if encoding_profile not in ENCODING_PROFILES:
+            raise ValueError(
+                f"Unknown encoding profile: {encoding_profile} "
+                f"(available: {', '.join(ENCODING_PROFILES)})"
+            )
+
         self.ffmpeg_path = ffmpeg_path
+        self.clip_cache = clip_cache
+        self.progress_callback = progress_callback
+        self.concat_group_size = max(2, concat_group_size)
+        self.encoding_profile = encoding_profile
+        self.profile = ENCODING_PROFILES[encoding_profile]
+        self._cancelled = threading.Event()
+        self._active_processes: Dict[int, subprocess.Popen] = {}
+        self._active_lock = threading.Lock()
+        self.ffprobe_path = os.path.join(
+            os.path.dirname(ffmpeg_path),
+            os.path.basename(ffmpeg_path).replace("ffmpeg", "ffprobe"),
+        )
+        self.media_index = media_index or MediaIndex(
+            MEMORY_INDEX, ffprobe_path=self.ffprobe_path, ffmpeg_path=ffmpeg_path
+        )
+        self.scratch = scratch or ScratchSpace()
         self._verify_ffmpeg()
 
     def _verify_ffmpeg(self) -> None:
@@ -83,42 +494,537 @@ class VideoComposer:
         self,
         cmd: List[str],
         description: str = "",
+        total_duration: Optional[float] = None,
+        output_path: Optional[str] = None,
+        stats: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """
-        Execute FFmpeg command.
+        Execute FFmpeg command, reporting progress while it runs.
+
+        Progress is read from "-progress pipe:1" as it is written; stderr is
+        drained into a bounded ring buffer whose tail is reported on failure.
+        A watchdog kills the run when it exceeds its timeout (see
+        _timeout_budget()), stops making progress, or the composer is
+        cancelled; partial output is removed on any failure.
 
         Args:
             cmd: FFmpeg command as list of arguments.
             description: Operation description for logging.
+            total_duration: Expected output duration in seconds (enables
+                percent, ETA and duration-based timeouts).
+            output_path: Output file removed on failure (last argument of
+                cmd if not provided).
+            stats: Filled with "elapsed" seconds and "max_rss_mb" (peak
+                resident memory of the FFmpeg process, None if unavailable).
 
         Returns:
             True if successful, False otherwise.
         """
+        output_path = output_path or cmd[-1]
+        if self._cancelled.is_set():
+            print(f"  Skipped (cancelled): {description or output_path}")
+            return False
+
         if description:
             print(f"  {description}...")
 
+        cmd = [cmd[0], "-hide_banner", "-nostats", "-progress", "pipe:1", *cmd[1:]]
+        stderr_tail: Deque[str] = deque(maxlen=STDERR_TAIL_LINES)
+        state: Dict[str, Any] = {
+            "started": time.time(),
+            "last_advance": time.time(),
+            "out_time": None,
+            "speed": None,
+            "abort_reason": None,
+        }
+
         try:
-            result = subprocess.run(
+            # Own process group, so wrappers and their children die together
+            process = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=FFMPEG_TIMEOUT,
+                errors="replace",
+                start_new_session=True,
             )
+        except OSError as e:
+            print(f"  FFmpeg error: {e}")
+            return False
 
-            if result.returncode != 0:
-                print(f"  FFmpeg failed: {result.stderr[:200]}")
-                return False
+        with self._active_lock:
+            self._active_processes[process.pid] = process
 
-            if description:
-                print(f"  {description} complete")
-            return True
+        finished = threading.Event()
+        watchdog = threading.Thread(
+            target=self._watch_ffmpeg,
+            args=(process, state, total_duration, finished),
+            daemon=True,
+        )
+        stderr_reader = threading.Thread(
+            target=stderr_tail.extend, args=(process.stderr,), daemon=True
+        )
+        watchdog.start()
+        stderr_reader.start()
 
-        except subprocess.TimeoutExpired:
-            print("  FFmpeg timed out")
+        try:
+            self._read_progress(process.stdout, description, total_duration, state)
+            returncode, max_rss_mb = self._wait_process(process)
+        except BaseException:
+            state["abort_reason"] = state["abort_reason"] or "interrupted"
+            self._kill_process(process)
+            process.wait()
+            self._remove_partial(output_path)
+            raise
+        finally:
+            finished.set()
+            watchdog.join()
+            stderr_reader.join()
+            process.stdout.close()
+            process.stderr.close()
+            with self._active_lock:
+                self._active_processes.pop(process.pid, None)
+
+        if state["abort_reason"]:
+            print(f"  FFmpeg {state['abort_reason']}: {description or output_path}")
+            self._remove_partial(output_path)
             return False
-        except Exception as e:
-            print(f"  FFmpeg error: {e}")
+
+        if returncode != 0:
+            print(f"  FFmpeg failed (exit code {returncode}):")
+            for line in list(stderr_tail)[-STDERR_REPORT_LINES:]:
+                print(f"    {line.rstrip()}")
+            self._remove_partial(output_path)
+            return False
+
+        if stats is not None:
+            stats["elapsed"] = time.time() - state["started"]
+            stats["max_rss_mb"] = max_rss_mb
+
+        if description:
+            rss = f" (peak RSS {max_rss_mb:.0f} MB)" if max_rss_mb else ""
+            print(f"  {description} complete{rss}")
+        return True
+
+    @staticmethod
+    def _wait_process(process: subprocess.Popen) -> Tuple[int, Optional[float]]:
+        """
+        Wait for a process and read its peak resident memory.
+
+        Returns:
+            Tuple of (exit code, peak RSS in MB or None if unavailable).
+        """
+        if not hasattr(os, "wait4"):
+            return process.wait(), None
+
+        try:
+            _, status, rusage = os.wait4(process.pid, 0)
+        except ChildProcessError:
+            # Already reaped by a concurrent poll()
+            return process.wait(), None
+
+        process.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return process.returncode, rusage.ru_maxrss / scale
+
+    @staticmethod
+    def _timeout_budget(total_duration: Optional[float]) -> float:
+        """
+        Get the initial timeout for an FFmpeg run.
+
+        Args:
+            total_duration: Expected output duration in seconds.
+
+        Returns:
+            Seconds allowed before a speed measurement is available.
+        """
+        if not total_duration:
+            return FFMPEG_TIMEOUT
+        return max(FFMPEG_MIN_TIMEOUT, total_duration * FFMPEG_TIMEOUT_PER_OUTPUT_SECOND)
+
+    def _watch_ffmpeg(
+        self,
+        process: subprocess.Popen,
+        state: Dict[str, Any],
+        total_duration: Optional[float],
+        finished: threading.Event,
+    ) -> None:
+        """
+        Kill an FFmpeg run that times out, stalls or is cancelled.
+
+        Once progress reports an encode speed, the deadline is re-projected
+        from the remaining output duration, so long encodes that keep moving
+        are not cut off and slow-but-steady ones still get a bound.
+
+        Args:
+            process: Running FFmpeg process.
+            state: Progress state shared with _read_progress().
+            total_duration: Expected output duration in seconds.
+            finished: Set when the run has ended.
+        """
+        deadline = state["started"] + self._timeout_budget(total_duration)
+
+        while not finished.wait(FFMPEG_WATCHDOG_INTERVAL):
+            now = time.time()
+
+            if total_duration and state["speed"] and state["out_time"] is not None:
+                remaining = max(0.0, total_duration - state["out_time"]) / state["speed"]
+                deadline = now + remaining * FFMPEG_SPEED_SAFETY_FACTOR + FFMPEG_TIMEOUT_GRACE
+
+            if self._cancelled.is_set():
+                state["abort_reason"] = "cancelled"
+            elif now - state["last_advance"] > FFMPEG_STALL_TIMEOUT:
+                state["abort_reason"] = f"stalled (no progress for {FFMPEG_STALL_TIMEOUT}s)"
+            elif now > deadline:
+                state["abort_reason"] = f"timed out after {now - state['started']:.0f}s"
+            else:
+                continue
+
+            self._kill_process(process)
+            return
+
+    @staticmethod
+    def _kill_process(process: subprocess.Popen) -> None:
+        """Kill an FFmpeg process together with its process group."""
+        if process.poll() is not None:
+            return
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    @staticmethod
+    def _remove_partial(output_path: Optional[str]) -> None:
+        """Remove a partially written output file."""
+        if output_path and os.path.isfile(output_path):
+            try:
+                os.remove(output_path)
+            except OSError:
+                pass
+
+    def cancel(self) -> None:
+        """
+        Cancel all running FFmpeg jobs of this composer.
+
+        Running processes are killed and their partial outputs removed; later
+        runs on this composer fail immediately.
+        """
+        self._cancelled.set()
+        with self._active_lock:
+            processes = list(self._active_processes.values())
+        for process in processes:
+            self._kill_process(process)
+
+    def _map_jobs(
+        self,
+        fn: Callable[[Any], Any],
+        items: List[Any],
+        workers: int,
+    ) -> List[Any]:
+        """
+        Run jobs in a thread pool, preserving order.
+
+        FFmpeg runs in its own process group, so a Ctrl-C in the main thread
+        does not reach it; the pool therefore cancels the composer before
+        waiting for its workers.
+
+        Args:
+            fn: Job function.
+            items: Job arguments.
+            workers: Pool size.
+
+        Returns:
+            Job results in item order.
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                return list(executor.map(fn, items))
+            except BaseException:
+                self.cancel()
+                raise
+
+    def _read_progress(
+        self,
+        stream: IO[str],
+        description: str,
+        total_duration: Optional[float],
+        state: Dict[str, Any],
+    ) -> None:
+        """
+        Turn FFmpeg "-progress" key=value blocks into progress events.
+
+        Args:
+            stream: FFmpeg progress output.
+            description: Operation description included in events.
+            total_duration: Expected output duration in seconds.
+            state: Progress state shared with the watchdog.
+        """
+        fields: Dict[str, str] = {}
+        last_logged = time.time()
+
+        for line in stream:
+            key, sep, value = line.strip().partition("=")
+            if not sep:
+                continue
+            fields[key] = value
+            if key != "progress":
+                continue
+
+            event = self._progress_event(fields, description, total_duration)
+            fields = {}
+
+            if event["out_time"] is not None and event["out_time"] != state["out_time"]:
+                state["out_time"] = event["out_time"]
+                state["last_advance"] = time.time()
+            if event["speed"]:
+                state["speed"] = event["speed"]
+
+            if self.progress_callback:
+                self.progress_callback(event)
+            elif not event["done"] and time.time() - last_logged >= PROGRESS_LOG_INTERVAL:
+                last_logged = time.time()
+                print(f"    {self.format_progress(event)}")
+
+    @staticmethod
+    def _progress_event(
+        fields: Dict[str, str],
+        description: str,
+        total_duration: Optional[float],
+    ) -> Dict[str, Any]:
+        """
+        Build a progress event from one FFmpeg progress block.
+
+        Returns:
+            Dict with description, frame, fps, out_time (seconds), speed
+            (realtime multiple), total_duration, percent, eta (seconds) and
+            done; values FFmpeg has not reported yet are None.
+        """
+        def number(key: str, suffix: str = "") -> Optional[float]:
+            value = fields.get(key, "").strip().rstrip(suffix)
+            try:
+                return float(value)
+            except ValueError:
+                return None
+
+        out_time_us = number("out_time_us")
+        out_time = out_time_us / 1_000_000 if out_time_us is not None else None
+        speed = number("speed", "x")
+        frame = number("frame")
+
+        percent = eta = None
+        if total_duration and out_time is not None:
+            percent = min(100.0, out_time / total_duration * 100)
+            if speed:
+                eta = max(0.0, (total_duration - out_time) / speed)
+
+        return {
+            "description": description,
+            "frame": int(frame) if frame is not None else None,
+            "fps": number("fps"),
+            "out_time": out_time,
+            "speed": speed,
+            "total_duration": total_duration,
+            "percent": percent,
+            "eta": eta,
+            "done": fields.get("progress") == "end",
+        }
+
+    @staticmethod
+    def format_progress(event: Dict[str, Any]) -> str:
+        """Format a progress event as a one-line status."""
+        parts = [event["description"] or "FFmpeg"]
+        if event["out_time"] is not None:
+            if event["total_duration"]:
+                parts.append(f"{event['out_time']:.1f}s/{event['total_duration']:.1f}s "
+                             f"({event['percent']:.0f}%)")
+            else:
+                parts.append(f"{event['out_time']:.1f}s")
+        if event["fps"] is not None:
+            parts.append(f"fps={event['fps']:.1f}")
+        if event["speed"] is not None:
+            parts.append(f"speed={event['speed']:.2f}x")
+        if event["eta"] is not None:
+            parts.append(f"ETA {event['eta']:.0f}s")
+        return "  ".join(parts)
+
+    def _profile_for(self, encoder_params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Get the encoding profile settings for an encode.
+
+        Args:
+            encoder_params: Stream parameters the encode must match (see
+                source_encoder_params()).
+
+        Returns:
+            The active profile, with its preset raised if it cannot produce
+            the H.264 profile encoder_params asks for.
+        """
+        profile = self.profile
+        if (
+            (encoder_params or {}).get("profile", "baseline") != "baseline"
+            and profile["preset"] in BASELINE_ONLY_PRESETS
+        ):
+            profile = {**profile, "preset": BASELINE_ONLY_PRESETS[profile["preset"]]}
+        return profile
+
+    def _encoder_args(
+        self,
+        fps: float,
+        still: bool = False,
+        threads: Optional[int] = None,
+        encoder_params: Optional[Dict[str, str]] = None,
+    ) -> List[str]:
+        """
+        Build the libx264 output arguments for the active encoding profile.
+
+        Args:
+            fps: Output frame rate (for the keyframe interval).
+            still: Whether the output is a static slide (applies still_tune).
+            threads: Encoder threads (profile setting or FFmpeg default if
+                not provided).
+            encoder_params: Stream parameters to match (see
+                source_encoder_params()).
+
+        Returns:
+            FFmpeg output arguments.
+        """
+        profile = self._profile_for(encoder_params)
+        args = [
+            "-c:v", "libx264",
+            "-preset", profile["preset"],
+            "-crf", str(profile["crf"]),
+            "-pix_fmt", "yuv420p",
+        ]
+        if still and profile["still_tune"]:
+            args += ["-tune", profile["still_tune"]]
+        if profile["gop_seconds"]:
+            args += ["-g", str(max(1, round(fps * profile["gop_seconds"])))]
+        if profile["x264_params"]:
+            args += ["-x264-params", profile["x264_params"]]
+
+        threads = threads or profile["threads"]
+        if threads:
+            args += ["-threads", str(threads)]
+        return args + self._encoder_param_args(encoder_params)
+
+    def open_rawvideo_encoder(
+        self,
+        output_path: str,
+        width: int,
+        height: int,
+        fps: int = DEFAULT_FPS,
+        input_pix_fmt: str = "rgb24",
+    ) -> subprocess.Popen:
+        """
+        Start an FFmpeg encoder reading raw frames from stdin.
+
+        Frames are written to the returned process's stdin as packed
+        height x width x channels bytes; close stdin and wait() to finish.
+
+        Args:
+            output_path: Output video path.
+            width: Frame width in pixels.
+            height: Frame height in pixels.
+            fps: Frame rate of the incoming frames.
+            input_pix_fmt: Pixel format of the incoming frames.
+
+        Returns:
+            Running FFmpeg process.
+        """
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+        cmd = [
+            self.ffmpeg_path,
+            "-y",
+            "-loglevel", "error",
+            "-f", "rawvideo",
+            "-pix_fmt", input_pix_fmt,
+            "-s", f"{width}x{height}",
+            "-r", str(fps),
+            "-i", "pipe:0",
+            *self._encoder_args(fps),
+            output_path,
+        ]
+
+        # Own process group, so _kill_process() reaches wrapped binaries too
+        return subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+
+    def encode_raw_frames(
+        self,
+        frames: Iterable[Any],
+        output_path: str,
+        width: int,
+        height: int,
+        fps: int = DEFAULT_FPS,
+        input_pix_fmt: str = "rgb24",
+    ) -> bool:
+        """
+        Encode raw frames streamed into an FFmpeg encoder.
+
+        The encoder is registered with cancel(), and if producing frames
+        raises, it is killed and the partial output removed.
+
+        Args:
+            frames: Buffers of packed frame bytes (one or more frames each).
+            output_path: Output video path.
+            width: Frame width in pixels.
+            height: Frame height in pixels.
+            fps: Frame rate of the incoming frames.
+            input_pix_fmt: Pixel format of the incoming frames.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        if self._cancelled.is_set():
+            return False
+
+        process = self.open_rawvideo_encoder(output_path, width, height, fps, input_pix_fmt)
+        with self._active_lock:
+            self._active_processes[process.pid] = process
+
+        stderr_tail: Deque[bytes] = deque(maxlen=STDERR_TAIL_LINES)
+        stderr_reader = threading.Thread(
+            target=stderr_tail.extend, args=(process.stderr,), daemon=True
+        )
+        stderr_reader.start()
+
+        returncode = None
+        try:
+            try:
+                for frame in frames:
+                    process.stdin.write(frame)
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            returncode = process.wait()
+        finally:
+            if returncode is None:
+                self._kill_process(process)
+                process.wait()
+                self._remove_partial(output_path)
+            stderr_reader.join()
+            process.stderr.close()
+            with self._active_lock:
+                self._active_processes.pop(process.pid, None)
+
+        if returncode != 0:
+            print(f"  FFmpeg failed (exit code {returncode}):")
+            for line in list(stderr_tail)[-STDERR_REPORT_LINES:]:
+                print(f"    {line.decode('utf-8', 'replace').rstrip()}")
+            self._remove_partial(output_path)
             return False
+        return True
 
     # -------------------------------------------------------------------------
     # Static Video Creation
@@ -131,6 +1037,8 @@ class VideoComposer:
         output_path: Optional[str] = None,
         resolution: str = DEFAULT_RESOLUTION,
         fps: int = DEFAULT_FPS,
+        threads: Optional[int] = None,
+        encoder_params: Optional[Dict[str, str]] = None,
     ) -> Optional[str]:
         """
         Convert static image to video.
@@ -141,6 +1049,9 @@ class VideoComposer:
             output_path: Output video path (auto-generated if not provided).
             resolution: Target resolution (WxH format).
             fps: Target frame rate.
+            threads: Encoder thread count (FFmpeg default if not provided).
+            encoder_params: Stream parameters to match (see
+                source_encoder_params()); overrides fps when it sets a frame rate.
 
         Returns:
             Path to output video, or None if failed.
@@ -162,165 +1073,1082 @@ class VideoComposer:
             "-y",  # Overwrite output
             "-loop", "1",  # Loop input image
             "-i", image_path,
-            "-c:v", "libx264",  # H.264 codec
             "-t", str(duration),
-            "-pix_fmt", "yuv420p",
             "-vf", (
                 f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
                 f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1"
             ),
-            "-r", str(fps),
+            "-r", (encoder_params or {}).get("frame_rate", str(fps)),
+            *self._encoder_args(
+                fps, still=True, threads=threads, encoder_params=encoder_params
+            ),
             output_path,
         ]
 
         description = f"Image to video ({Path(image_path).name}, {duration}s)"
-        success = self._run_ffmpeg(cmd, description)
+        success = self._run_ffmpeg(cmd, description, duration)
 
         return output_path if success else None
 
-    # -------------------------------------------------------------------------
-    # Video Concatenation
-    # -------------------------------------------------------------------------
+    @staticmethod
+    def plan_encode_pool(
+        num_jobs: int,
+        max_workers: Optional[int] = None,
+    ) -> Tuple[int, int]:
+        """
+        Size a pool of concurrent encodes so it does not oversubscribe the CPU.
 
-    def concat_videos(
+        Args:
+            num_jobs: Number of encode jobs.
+            max_workers: Upper bound on concurrent encodes (CPU count if not provided).
+
+        Returns:
+            Tuple of (worker count, FFmpeg threads per job).
+        """
+        workers = max(1, min(num_jobs, max_workers or CPU_COUNT, CPU_COUNT))
+        return workers, max(1, CPU_COUNT // workers)
+
+    def create_static_videos(
         self,
-        video_list: List[str],
-        output_path: str,
-        normalize_params: bool = True,
-        target_resolution: str = DEFAULT_RESOLUTION,
-        target_fps: int = DEFAULT_FPS,
-    ) -> bool:
+        jobs: List[Tuple[str, str]],
+        duration: int = DEFAULT_SLIDE_DURATION,
+        resolution: str = DEFAULT_RESOLUTION,
+        fps: int = DEFAULT_FPS,
+        max_workers: Optional[int] = None,
+        encoder_params: Optional[Dict[str, str]] = None,
+    ) -> List[Optional[str]]:
         """
-        Concatenate multiple videos into one.
+        Convert several static images to videos concurrently.
 
         Args:
-            video_list: List of video paths in order.
-            output_path: Output video path.
-            normalize_params: Whether to normalize video parameters.
-            target_resolution: Target resolution for normalization.
-            target_fps: Target FPS for normalization.
+            jobs: List of (image_path, output_path) pairs.
+            duration: Video duration in seconds.
+            resolution: Target resolution (WxH format).
+            fps: Target frame rate.
+            max_workers: Maximum concurrent encodes (CPU count if not provided).
+            encoder_params: Stream parameters to match (see source_encoder_params()).
 
         Returns:
-            True if successful, False otherwise.
+            Output paths (None for failures), in the same order as jobs.
         """
-        if not video_list:
-            print("  Empty video list")
-            return False
+        if not jobs:
+            return []
+
+        results: List[Optional[str]] = [None] * len(jobs)
+        keys: List[Optional[str]] = [None] * len(jobs)
+
+        # Reuse clips encoded by earlier compositions
+        if self.clip_cache:
+            for i, (image_path, output_path) in enumerate(jobs):
+                if not os.path.exists(image_path):
+                    continue
+                keys[i] = self.clip_cache.make_key(
+                    image_path, duration, resolution, fps, encoder_params,
+                    self._profile_for(encoder_params), self.media_index.content_hash,
+                )
+                if self.clip_cache.fetch(keys[i], output_path):
+                    results[i] = output_path
+            print(f"  Clip cache hits: {sum(1 for r in results if r)}/{len(jobs)}")
+
+        pending = [i for i in range(len(jobs)) if results[i] is None]
+        if not pending:
+            return results
+
+        workers, threads = self.plan_encode_pool(len(pending), max_workers)
+        print(f"  Encode pool: {workers} worker(s) x {threads} thread(s)")
+
+        def encode(index: int) -> Optional[str]:
+            image_path, output_path = jobs[index]
+            return self.create_static_video(
+                image_path=image_path,
+                duration=duration,
+                output_path=output_path,
+                resolution=resolution,
+                fps=fps,
+                threads=threads,
+                encoder_params=encoder_params,
+            )
 
-        # Verify all videos exist
-        for video_path in video_list:
-            if not os.path.exists(video_path):
-                print(f"  Video not found: {video_path}")
-                return False
+        # map() preserves job order regardless of completion order
+        for i, result in zip(pending, self._map_jobs(encode, pending, workers)):
+            results[i] = result
+            if result and keys[i]:
+                self.clip_cache.put(keys[i], result)
 
-        if normalize_params:
-            return self._concat_with_filter(
-                video_list, output_path, target_resolution, target_fps
-            )
-        else:
-            return self._concat_with_demuxer(video_list, output_path)
+        return results
 
-    def _concat_with_demuxer(
-        self,
-        video_list: List[str],
-        output_path: str,
-    ) -> bool:
+    # -------------------------------------------------------------------------
+    # Local Transition Creation
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def source_encoder_params(
+        info: Dict[str, Any],
+        gop: Optional[int] = None,
+    ) -> Optional[Dict[str, str]]:
         """
-        Concatenate videos using concat demuxer (fast, no re-encoding).
+        Derive libx264 settings that reproduce a probed clip's stream format.
 
         Args:
-            video_list: List of video paths.
-            output_path: Output video path.
+            info: Result of probe_video() for the source clip.
+            gop: Keyframe interval in frames to match (encoder default if None).
 
         Returns:
-            True if successful, False otherwise.
+            Dict with profile, level, frame_rate, timescale and optionally gop,
+            or None if the source is not H.264.
         """
-        # Create temporary file list
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".txt", delete=False
-        ) as f:
-            concat_file = f.name
-            for video_path in video_list:
-                f.write(f"file '{os.path.abspath(video_path)}'\n")
+        if info.get("codec_name") != "h264" or not info.get("r_frame_rate"):
+            return None
 
-        try:
-            cmd = [
+        params = {"frame_rate": info["r_frame_rate"]}
+        if info.get("profile") in H264_PROFILES:
+            params["profile"] = H264_PROFILES[info["profile"]]
+        if info.get("level"):
+            params["level"] = f"{info['level'] / 10:.1f}"
+        if info.get("time_base"):
+            params["timescale"] = info["time_base"].split("/")[-1]
+        if gop:
+            params["gop"] = str(gop)
+        return params
+
+    @staticmethod
+    def _encoder_param_args(encoder_params: Optional[Dict[str, str]]) -> List[str]:
+        """Build libx264/MP4 arguments from source_encoder_params() output."""
+        if not encoder_params:
+            return []
+
+        args = []
+        if "profile" in encoder_params:
+            args += ["-profile:v", encoder_params["profile"]]
+        if "level" in encoder_params:
+            args += ["-level:v", encoder_params["level"]]
+        if "gop" in encoder_params:
+            args += ["-g", encoder_params["gop"]]
+        if "timescale" in encoder_params:
+            args += ["-video_track_timescale", encoder_params["timescale"]]
+        return args
+
+    def probe_match_source(self, video_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Probe a transition clip for match-source static clip encoding.
+
+        Args:
+            video_path: Transition video to match.
+
+        Returns:
+            Dict with "resolution", "fps" and "encoder_params", or None if the
+            clip cannot be matched.
+        """
+        info = self.media_index.probe(video_path)
+        if not info or not info.get("width") or not info.get("fps"):
+            return None
+
+        encoder_params = self.source_encoder_params(
+            info, self.media_index.keyframe_interval(video_path)
+        )
+        if not encoder_params:
+            return None
+
+        return {
+            "resolution": f"{info['width']}x{info['height']}",
+            "fps": info["fps"],
+            "encoder_params": encoder_params,
+        }
+
+    def create_local_transition(
+        self,
+        image_from: str,
+        image_to: str,
+        output_path: str,
+        effect: str = DEFAULT_LOCAL_TRANSITION_EFFECT,
+        duration: float = DEFAULT_LOCAL_TRANSITION_DURATION,
+        resolution: str = DEFAULT_RESOLUTION,
+        fps: int = DEFAULT_FPS,
+    ) -> Optional[str]:
+        """
+        Render a transition between two slide images with FFmpeg xfade.
+
+        Runs in seconds, as a fast alternative (or fallback) to Kling transitions.
+
+        Args:
+            image_from: Path to source slide image.
+            image_to: Path to target slide image.
+            output_path: Output video path.
+            effect: Effect name (see LOCAL_TRANSITION_EFFECTS).
+            duration: Transition duration in seconds.
+            resolution: Target resolution (WxH format).
+            fps: Target frame rate.
+
+        Returns:
+            Path to output video, or None if failed.
+        """
+        for image_path in (image_from, image_to):
+            if not os.path.exists(image_path):
+                print(f"  Image not found: {image_path}")
+                return None
+
+        if effect not in LOCAL_TRANSITION_EFFECTS:
+            print(f"  Unknown transition effect: {effect} "
+                  f"(available: {', '.join(LOCAL_TRANSITION_EFFECTS)})")
+            return None
+
+        width, height = resolution.split("x")
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+        normalize = (
+            f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,"
+            f"fps={fps},format=yuv420p"
+        )
+        filter_complex = (
+            f"[0:v]{normalize}[a];"
+            f"[1:v]{normalize}[b];"
+            f"[a][b]xfade=transition={LOCAL_TRANSITION_EFFECTS[effect]}:"
+            f"duration={duration}:offset=0[outv]"
+        )
+
+        # xfade drops one frame at the seam: pad each input by a frame so the
+        # output is the full requested duration
+        input_duration = f"{duration + 1 / fps:.6f}"
+        cmd = [
+            self.ffmpeg_path,
+            "-y",
+            "-loop", "1", "-framerate", str(fps), "-t", input_duration, "-i", image_from,
+            "-loop", "1", "-framerate", str(fps), "-t", input_duration, "-i", image_to,
+            "-filter_complex", filter_complex,
+            "-map", "[outv]",
+            *self._encoder_args(fps),
+            "-t", str(duration),
+            output_path,
+        ]
+
+        description = (
+            f"Local {effect} transition ({Path(image_from).name} -> "
+            f"{Path(image_to).name}, {duration}s)"
+        )
+        success = self._run_ffmpeg(cmd, description, duration)
+
+        return output_path if success else None
+
+    # -------------------------------------------------------------------------
+    # Video Concatenation
+    # -------------------------------------------------------------------------
+
+    def concat_videos(
+        self,
+        video_list: List[str],
+        output_path: str,
+        normalize_params: Optional[bool] = None,
+        target_resolution: str = DEFAULT_RESOLUTION,
+        target_fps: int = DEFAULT_FPS,
+        holds: Optional[List[float]] = None,
+        chunked: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> bool:
+        """
+        Concatenate multiple videos into one.
+
+        Args:
+            video_list: List of video paths in order.
+            output_path: Output video path.
+            normalize_params: Whether to normalize video parameters. None
+                probes the inputs and stream-copies whenever they are
+                compatible, normalizing only the clips that differ.
+            target_resolution: Target resolution for normalization.
+            target_fps: Target FPS for normalization.
+            holds: Seconds to extend each video by cloning its last frame
+                (parallel to video_list; requires normalize_params).
+            chunked: Split normalizing re-encodes into segments encoded in
+                parallel and joined by stream copy.
+            max_workers: Maximum concurrent encodes (CPU count if not provided).
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        if not video_list:
+            print("  Empty video list")
+            return False
+
+        # Verify all videos exist
+        for video_path in video_list:
+            if not os.path.exists(video_path):
+                print(f"  Video not found: {video_path}")
+                return False
+
+        if normalize_params is None:
+            if holds and any(holds):
+                print("  Concat mode: normalized (frame holds need the filter graph)")
+                normalize_params = True
+            else:
+                return self._concat_auto(
+                    video_list, output_path, target_resolution, target_fps,
+                    chunked, max_workers,
+                )
+
+        if normalize_params:
+            return self._concat_normalized(
+                video_list, output_path, target_resolution, target_fps, holds,
+                chunked, max_workers,
+            )
+        else:
+            return self._concat_with_demuxer(video_list, output_path)
+
+    @staticmethod
+    def _copy_signature(info: Dict[str, Any]) -> Tuple:
+        """
+        Get the stream parameters that must match for stream-copy concat.
+
+        Unset sample aspect ratios are treated as square pixels.
+        """
+        info = dict(info)
+        if info.get("sample_aspect_ratio") in (None, "0:1", "N/A"):
+            info["sample_aspect_ratio"] = "1:1"
+        return tuple(info.get(field) for field in CONCAT_COPY_FIELDS)
+
+    @staticmethod
+    def _meets_target(info: Dict[str, Any], resolution: str, fps: int) -> bool:
+        """Check whether a probed clip already has the target output format."""
+        width, height = resolution.split("x")
+        return (
+            info.get("codec_name") == "h264"
+            and info.get("pix_fmt") == "yuv420p"
+            and info.get("width") == int(width)
+            and info.get("height") == int(height)
+            and info.get("fps") is not None
+            and abs(info["fps"] - fps) < 0.01
+            and info.get("sample_aspect_ratio") in (None, "0:1", "N/A", "1:1")
+        )
+
+    def _concat_auto(
+        self,
+        video_list: List[str],
+        output_path: str,
+        resolution: str,
+        fps: int,
+        chunked: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> bool:
+        """
+        Concatenate with stream copy when possible, normalizing only mismatches.
+
+        Every input is probed. The most common stream signature among clips
+        already in the target format becomes the reference; the other clips
+        are re-encoded to match it and everything is joined with the concat
+        demuxer. Falls back to the filter path if that cannot be arranged.
+
+        Args:
+            video_list: List of video paths.
+            output_path: Output video path.
+            resolution: Target resolution.
+            fps: Target FPS.
+            chunked: Use segment-parallel encoding if the filter path is needed.
+            max_workers: Maximum concurrent encodes (CPU count if not provided).
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        probes = [self.media_index.probe(path) for path in video_list]
+        if any(info is None for info in probes):
+            print("  Concat mode: normalized (some inputs could not be probed)")
+            return self._concat_normalized(
+                video_list, output_path, resolution, fps,
+                chunked=chunked, max_workers=max_workers,
+            )
+
+        signatures = [self._copy_signature(info) for info in probes]
+        eligible = [
+            sig for sig, info in zip(signatures, probes)
+            if self._meets_target(info, resolution, fps)
+        ]
+        if not eligible:
+            print("  Concat mode: normalized (no input matches the target format)")
+            return self._concat_normalized(
+                video_list, output_path, resolution, fps,
+                chunked=chunked, max_workers=max_workers,
+            )
+
+        reference, _ = Counter(eligible).most_common(1)[0]
+        mismatched = [i for i, sig in enumerate(signatures) if sig != reference]
+
+        if not mismatched:
+            print(f"  Concat mode: stream copy (all {len(video_list)} inputs compatible)")
+            return self._concat_with_demuxer(video_list, output_path, video_only=True)
+
+        print(f"  Concat mode: stream copy after normalizing "
+              f"{len(mismatched)}/{len(video_list)} inputs")
+        for i in mismatched:
+            print(f"    - {Path(video_list[i]).name}")
+
+        reference_info = probes[signatures.index(reference)]
+        encoder_params = self.source_encoder_params(reference_info)
+        temp_dir = tempfile.mkdtemp(prefix="ppt_concat_", dir=self.scratch.current)
+        try:
+            workers, threads = self.plan_encode_pool(len(mismatched), max_workers)
+
+            def normalize(index: int) -> Optional[str]:
+                return self._normalize_clip(
+                    video_list[index],
+                    os.path.join(temp_dir, f"{index:04d}-{Path(video_list[index]).name}"),
+                    resolution,
+                    encoder_params,
+                    threads,
+                )
+
+            normalized = self._map_jobs(normalize, mismatched, workers)
+
+            copy_list = list(video_list)
+            for i, path in zip(mismatched, normalized):
+                info = self.media_index.probe(path) if path else None
+                if not info or self._copy_signature(info) != reference:
+                    print(f"  Concat mode: normalized "
+                          f"({Path(video_list[i]).name} could not be matched for stream copy)")
+                    return self._concat_normalized(
+                        video_list, output_path, resolution, fps,
+                        chunked=chunked, max_workers=max_workers,
+                    )
+                copy_list[i] = path
+
+            return self._concat_with_demuxer(copy_list, output_path, video_only=True)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _normalize_clip(
+        self,
+        input_path: str,
+        output_path: str,
+        resolution: str,
+        encoder_params: Dict[str, str],
+        threads: Optional[int] = None,
+    ) -> Optional[str]:
+        """
+        Re-encode a clip to the stream format of the other clips.
+
+        Args:
+            input_path: Source video path.
+            output_path: Output video path.
+            resolution: Target resolution.
+            encoder_params: Stream parameters to match (see source_encoder_params()).
+            threads: Encoder threads (FFmpeg default if not provided).
+
+        Returns:
+            Output path if successful, None otherwise.
+        """
+        width, height = resolution.split("x")
+
+        cmd = [
+            self.ffmpeg_path,
+            "-y",
+            "-i", input_path,
+            "-vf", (
+                f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,"
+                f"fps={encoder_params['frame_rate']}"
+            ),
+            *self._encoder_args(
+                float(Fraction(encoder_params["frame_rate"])),
+                threads=threads,
+                encoder_params=encoder_params,
+            ),
+            "-an",
+            output_path,
+        ]
+
+        description = f"Normalizing {Path(input_path).name} for stream copy"
+        if self._run_ffmpeg(cmd, description, self._clip_duration(input_path)):
+            return output_path
+        return None
+
+    def _concat_with_demuxer(
+        self,
+        video_list: List[str],
+        output_path: str,
+        video_only: bool = False,
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Concatenate videos using concat demuxer (fast, no re-encoding).
+
+        Clips from different encoders (different SPS/PPS) need no extra
+        handling: the demuxer's auto_convert inserts h264_mp4toannexb, which
+        carries each clip's parameter sets in-band.
+
+        Args:
+            video_list: List of video paths.
+            output_path: Output video path.
+            video_only: Drop audio streams, matching the filter path output.
+            stats: Filled with run statistics (see _run_ffmpeg()).
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        # Create temporary file list
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".txt", delete=False
+        ) as f:
+            concat_file = f.name
+            for video_path in video_list:
+                f.write(f"file '{os.path.abspath(video_path)}'\n")
+
+        try:
+            cmd = [
                 self.ffmpeg_path,
                 "-y",
                 "-f", "concat",
                 "-safe", "0",
                 "-i", concat_file,
                 "-c", "copy",
+                *(["-an"] if video_only else []),
                 output_path,
             ]
 
             description = f"Concatenating {len(video_list)} videos (fast mode)"
-            return self._run_ffmpeg(cmd, description)
+            return self._run_ffmpeg(cmd, description, stats=stats)
         finally:
             if os.path.exists(concat_file):
                 os.remove(concat_file)
 
-    def _concat_with_filter(
-        self,
-        video_list: List[str],
-        output_path: str,
-        resolution: str,
+    def _concat_with_filter(
+        self,
+        video_list: List[str],
+        output_path: str,
+        resolution: str,
+        fps: int,
+        holds: Optional[List[float]] = None,
+        threads: Optional[int] = None,
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Concatenate videos using filter_complex (re-encodes, normalizes parameters).
+
+        Lists longer than concat_group_size are encoded hierarchically (see
+        _encode_grouped()).
+
+        Args:
+            video_list: List of video paths.
+            output_path: Output video path.
+            resolution: Target resolution.
+            fps: Target FPS.
+            holds: Seconds to extend each video by cloning its last frame.
+            threads: Encoder threads (FFmpeg default if not provided).
+            stats: Filled with run statistics (see _run_ffmpeg()).
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        if len(video_list) > self.concat_group_size:
+            holds = holds or [0] * len(video_list)
+            return self._encode_grouped(
+                list(zip(video_list, holds)),
+                output_path,
+                lambda items, path, stats: self._concat_with_filter(
+                    [video for video, _ in items], path, resolution, fps,
+                    [hold for _, hold in items], threads, stats,
+                ),
+            )
+
+        width, height = resolution.split("x")
+
+        # Build input arguments
+        inputs = []
+        for video_path in video_list:
+            inputs.extend(["-i", video_path])
+
+        # Build filter for each input
+        filter_parts = []
+        for i in range(len(video_list)):
+            hold = holds[i] if holds else 0
+            filter_parts.append(
+                f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,"
+                f"fps={fps}{self._hold_filter(hold)}[v{i}]"
+            )
+
+        # Build concat filter
+        concat_inputs = "".join(f"[v{i}]" for i in range(len(video_list)))
+        filter_complex = (
+            ";".join(filter_parts) + ";"
+            f"{concat_inputs}concat=n={len(video_list)}:v=1:a=0[outv]"
+        )
+
+        cmd = [
+            self.ffmpeg_path,
+            "-y",
+            *inputs,
+            "-filter_complex", filter_complex,
+            "-map", "[outv]",
+            *self._encoder_args(fps, threads=threads),
+            output_path,
+        ]
+
+        total_duration = sum(self._clip_duration(path) for path in video_list) + sum(holds or [])
+        description = f"Concatenating {len(video_list)} videos (normalized)"
+        return self._run_ffmpeg(cmd, description, total_duration, stats=stats)
+
+    def _concat_normalized(
+        self,
+        video_list: List[str],
+        output_path: str,
+        resolution: str,
+        fps: int,
+        holds: Optional[List[float]] = None,
+        chunked: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> bool:
+        """
+        Run the re-encoding concat, optionally as parallel segments.
+
+        Args:
+            video_list: List of video paths.
+            output_path: Output video path.
+            resolution: Target resolution.
+            fps: Target FPS.
+            holds: Seconds to extend each video by cloning its last frame.
+            chunked: Encode contiguous groups of clips in parallel and join
+                them by stream copy.
+            max_workers: Maximum concurrent segment encodes.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        holds = holds or [0] * len(video_list)
+        if not chunked:
+            return self._concat_with_filter(video_list, output_path, resolution, fps, holds)
+
+        def encode_segment(
+            items: List[Tuple[str, float]],
+            segment_path: str,
+            threads: Optional[int],
+        ) -> bool:
+            return self._concat_with_filter(
+                [path for path, _ in items],
+                segment_path,
+                resolution,
+                fps,
+                [hold for _, hold in items],
+                threads,
+            )
+
+        return self._encode_segments(
+            list(zip(video_list, holds)),
+            [self._clip_duration(path) + hold for path, hold in zip(video_list, holds)],
+            output_path,
+            encode_segment,
+            max_workers,
+        )
+
+    def _clip_duration(self, video_path: str) -> float:
+        """Get a clip's duration in seconds (0 if it cannot be probed)."""
+        return self.media_index.duration(video_path)
+
+    def _item_duration(self, item: Dict[str, Any]) -> float:
+        """Get the output duration of a timeline item in seconds."""
+        if item["type"] == "image":
+            return item["duration"]
+        return self._clip_duration(item["path"]) + item.get("hold", 0)
+
+    @staticmethod
+    def _partition_by_duration(durations: List[float], parts: int) -> List[List[int]]:
+        """
+        Split items into contiguous, non-empty groups of similar total duration.
+
+        Args:
+            durations: Duration of each item in order.
+            parts: Desired number of groups.
+
+        Returns:
+            Lists of item indices, in order.
+        """
+        parts = max(1, min(parts, len(durations)))
+        total = sum(durations)
+        groups: List[List[int]] = []
+        current: List[int] = []
+        elapsed = 0.0
+
+        for i, duration in enumerate(durations):
+            current.append(i)
+            elapsed += duration
+            groups_left = parts - len(groups) - 1
+            items_left = len(durations) - i - 1
+            if groups_left > 0 and (
+                elapsed >= total * (len(groups) + 1) / parts or items_left == groups_left
+            ):
+                groups.append(current)
+                current = []
+
+        if current:
+            groups.append(current)
+        return groups
+
+    def _encode_segments(
+        self,
+        items: List[Any],
+        durations: List[float],
+        output_path: str,
+        encode_segment: Callable[[List[Any], str, Optional[int]], bool],
+        max_workers: Optional[int] = None,
+    ) -> bool:
+        """
+        Encode a timeline as parallel segments split at clip boundaries.
+
+        Every segment is encoded with the same settings, so the results can be
+        joined with the concat demuxer without re-encoding.
+
+        Args:
+            items: Timeline entries in order.
+            durations: Duration of each entry, used to balance segments.
+            output_path: Output video path.
+            encode_segment: Callable(items, segment_path, threads) encoding one
+                segment and returning success.
+            max_workers: Maximum concurrent segment encodes (CPU count if not provided).
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        workers, threads = self.plan_encode_pool(len(items), max_workers)
+        groups = self._partition_by_duration(durations, workers)
+        if len(groups) < 2:
+            return encode_segment(items, output_path, None)
+
+        print(f"  Chunked encode: {len(groups)} segment(s) x {threads} thread(s)")
+        temp_dir = tempfile.mkdtemp(prefix="ppt_segments_", dir=self.scratch.current)
+        try:
+            def encode(indexed: Tuple[int, List[int]]) -> Optional[str]:
+                number, group = indexed
+                segment_path = os.path.join(temp_dir, f"segment-{number:03d}.mp4")
+                if encode_segment([items[i] for i in group], segment_path, threads):
+                    return segment_path
+                return None
+
+            segments = self._map_jobs(encode, list(enumerate(groups)), len(groups))
+
+            if not all(segments):
+                print("  Segment encoding failed")
+                return False
+
+            return self._concat_with_demuxer(segments, output_path, video_only=True)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _encode_grouped(
+        self,
+        items: List[Any],
+        output_path: str,
+        encode_group: Callable[[List[Any], str, Dict[str, Any]], bool],
+    ) -> bool:
+        """
+        Encode a long timeline as a two-level tree to bound FFmpeg memory.
+
+        Level 0 re-encodes fixed-size groups of concat_group_size items one
+        after another, so at most that many decoders are live at once. Level 1
+        joins the group outputs, which share identical encoder settings, with
+        the concat demuxer (stream copy, one input open at a time). Peak RSS
+        is reported per level.
+
+        Args:
+            items: Timeline entries in order.
+            output_path: Output video path.
+            encode_group: Callable(items, group_path, stats) re-encoding one
+                group and returning success.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        size = self.concat_group_size
+        groups = [items[i:i + size] for i in range(0, len(items), size)]
+        print(f"  Hierarchical concat: {len(items)} inputs in "
+              f"{len(groups)} group(s) of <= {size}")
+
+        temp_dir = tempfile.mkdtemp(prefix="ppt_groups_", dir=self.scratch.current)
+        try:
+            group_paths = []
+            level0_rss: List[float] = []
+            for number, group in enumerate(groups):
+                group_path = os.path.join(temp_dir, f"group-{number:03d}.mp4")
+                stats: Dict[str, Any] = {}
+                if not encode_group(group, group_path, stats):
+                    print(f"  Group {number + 1}/{len(groups)} failed")
+                    return False
+                group_paths.append(group_path)
+                if stats.get("max_rss_mb"):
+                    level0_rss.append(stats["max_rss_mb"])
+
+            join_stats: Dict[str, Any] = {}
+            if not self._concat_with_demuxer(
+                group_paths, output_path, video_only=True, stats=join_stats
+            ):
+                return False
+
+            level1_rss = [join_stats["max_rss_mb"]] if join_stats.get("max_rss_mb") else []
+
+            def peak(values: List[float]) -> str:
+                return f"{max(values):.0f} MB" if values else "n/a"
+
+            print(f"  Level 0 (re-encode, {len(groups)} groups): peak RSS {peak(level0_rss)}")
+            print(f"  Level 1 (stream copy join): peak RSS {peak(level1_rss)}")
+            return True
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _hold_filter(hold: float) -> str:
+        """
+        Build a filter suffix that freezes the last frame for hold seconds.
+
+        Returns:
+            ",tpad=..." or an empty string when there is nothing to hold.
+        """
+        if not hold:
+            return ""
+        return f",tpad=stop_mode=clone:stop_duration={hold}"
+
+    # -------------------------------------------------------------------------
+    # Full PPT Video Composition
+    # -------------------------------------------------------------------------
+
+    def build_timeline(
+        self,
+        slides_paths: List[str],
+        transitions_dict: Dict[str, str],
+        slide_duration: int = DEFAULT_SLIDE_DURATION,
+        include_preview: bool = False,
+        preview_video_path: Optional[str] = None,
+        resolution: str = DEFAULT_RESOLUTION,
+        fps: int = DEFAULT_FPS,
+        fallback_transition_effect: Optional[str] = None,
+        work_dir: Optional[str] = None,
+        freeze_last_frame: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the ordered list of timeline items for a PPT video.
+
+        Each item is a dict with "type" ("video" or "image"), "path", "label",
+        "duration" for images, and "hold" for videos extended by freezing
+        their last frame.
+
+        Args:
+            slides_paths: List of slide image paths.
+            transitions_dict: Dict mapping 'from-to' keys to transition video paths.
+            slide_duration: Duration for each static slide.
+            include_preview: Whether to include preview video.
+            preview_video_path: Path to preview video.
+            resolution: Target resolution (for fallback transitions).
+            fps: Target FPS (for fallback transitions).
+            fallback_transition_effect: Local effect rendered in place of missing
+                transitions (hard cut if None).
+            work_dir: Directory for fallback transition renders.
+            freeze_last_frame: Hold each transition's last frame for the slide
+                duration instead of adding the slide image; slides without a
+                transition still use the image.
+
+        Returns:
+            Ordered timeline items.
+        """
+        print("Building video sequence...")
+        timeline: List[Dict[str, Any]] = []
+
+        # Optional preview
+        if include_preview and preview_video_path and os.path.exists(preview_video_path):
+            timeline.append({"type": "video", "path": preview_video_path, "label": "preview"})
+            print("  + Preview video")
+
+        # Add transitions and static slides
+        for i in range(len(slides_paths) - 1):
+            from_num = Path(slides_paths[i]).stem.split("-")[-1]
+            to_num = Path(slides_paths[i + 1]).stem.split("-")[-1]
+            transition_key = f"{from_num}-{to_num}"
+
+            # Add transition video
+            transition_item = None
+            transition_path = transitions_dict.get(transition_key)
+            if transition_path and os.path.exists(transition_path):
+                transition_item = {
+                    "type": "video",
+                    "path": transition_path,
+                    "label": f"transition-{transition_key}",
+                }
+                timeline.append(transition_item)
+                print(f"  + Transition {transition_key}")
+            elif fallback_transition_effect:
+                fallback_path = self.create_local_transition(
+                    image_from=slides_paths[i],
+                    image_to=slides_paths[i + 1],
+                    output_path=os.path.join(
+                        work_dir or tempfile.gettempdir(),
+                        f"transition-{from_num}-{to_num}-local.mp4",
+                    ),
+                    effect=fallback_transition_effect,
+                    resolution=resolution,
+                    fps=fps,
+                )
+                if fallback_path:
+                    transition_item = {
+                        "type": "video",
+                        "path": fallback_path,
+                        "label": f"transition-{transition_key}",
+                    }
+                    timeline.append(transition_item)
+                    print(f"  + Local {fallback_transition_effect} transition {transition_key}")
+                else:
+                    print(f"  ! Local transition failed: {transition_key}")
+            elif transition_path:
+                print(f"  ! Transition missing: {transition_key}")
+            else:
+                print(f"  ! Transition not defined: {transition_key}")
+
+            # The transition ends on the target slide: hold its last frame
+            if freeze_last_frame and transition_item:
+                transition_item["hold"] = slide_duration
+                print(f"  + Hold last frame of {transition_key} ({slide_duration}s)")
+                continue
+
+            # Add target slide static image
+            timeline.append({
+                "type": "image",
+                "path": slides_paths[i + 1],
+                "duration": slide_duration,
+                "label": f"slide-{to_num}",
+            })
+            print(f"  + Static slide-{to_num} ({slide_duration}s)")
+
+        print(f"\n  Total clips: {len(timeline)}\n")
+        return timeline
+
+    def _input_args(self, item: Dict[str, Any], fps: int) -> List[str]:
+        """
+        Build FFmpeg input arguments for a timeline item.
+
+        Images are read as a single frame and looped inside the filter graph,
+        so each PNG is decoded and scaled only once.
+        """
+        if item["type"] == "image":
+            return ["-framerate", str(fps), "-i", item["path"]]
+        return ["-i", item["path"]]
+
+    @staticmethod
+    def _item_filter(
+        index: int,
+        item: Dict[str, Any],
+        width: str,
+        height: str,
         fps: int,
-    ) -> bool:
+    ) -> str:
         """
-        Concatenate videos using filter_complex (re-encodes, normalizes parameters).
+        Build the normalizing filter chain for one timeline input.
 
         Args:
-            video_list: List of video paths.
-            output_path: Output video path.
-            resolution: Target resolution.
+            index: FFmpeg input index.
+            item: Timeline item.
+            width: Target width.
+            height: Target height.
             fps: Target FPS.
 
         Returns:
-            True if successful, False otherwise.
+            Filter chain labelled [v{index}].
         """
+        chain = (
+            f"[{index}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,format=yuv420p"
+        )
+
+        if item["type"] == "image":
+            # Still image: repeat the one scaled frame for the slide duration
+            frames = max(1, int(round(item["duration"] * fps)))
+            chain += f",loop=loop={frames - 1}:size=1:start=0,setpts=N/{fps}/TB"
+        else:
+            chain += f",fps={fps}" + VideoComposer._hold_filter(item.get("hold", 0))
+
+        return f"{chain}[v{index}]"
+
+    def _timeline_command(
+        self,
+        timeline: List[Dict[str, Any]],
+        output_path: str,
+        resolution: str,
+        fps: int,
+        threads: Optional[int] = None,
+    ) -> List[str]:
+        """Build the single-pass FFmpeg command encoding a timeline."""
         width, height = resolution.split("x")
 
-        # Build input arguments
         inputs = []
-        for video_path in video_list:
-            inputs.extend(["-i", video_path])
-
-        # Build filter for each input
         filter_parts = []
-        for i in range(len(video_list)):
-            filter_parts.append(
-                f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
-                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,"
-                f"fps={fps}[v{i}]"
-            )
+        for i, item in enumerate(timeline):
+            inputs.extend(self._input_args(item, fps))
+            filter_parts.append(self._item_filter(i, item, width, height, fps))
 
-        # Build concat filter
-        concat_inputs = "".join(f"[v{i}]" for i in range(len(video_list)))
+        concat_inputs = "".join(f"[v{i}]" for i in range(len(timeline)))
         filter_complex = (
             ";".join(filter_parts) + ";"
-            f"{concat_inputs}concat=n={len(video_list)}:v=1:a=0[outv]"
+            f"{concat_inputs}concat=n={len(timeline)}:v=1:a=0[outv]"
         )
 
-        cmd = [
+        return [
             self.ffmpeg_path,
             "-y",
             *inputs,
             "-filter_complex", filter_complex,
             "-map", "[outv]",
-            "-c:v", "libx264",
-            "-preset", "medium",
-            "-crf", "23",
-            "-pix_fmt", "yuv420p",
+            *self._encoder_args(fps, threads=threads),
             output_path,
         ]
 
-        description = f"Concatenating {len(video_list)} videos (normalized)"
-        return self._run_ffmpeg(cmd, description)
+    def encode_timeline(
+        self,
+        timeline: List[Dict[str, Any]],
+        output_path: str,
+        resolution: str = DEFAULT_RESOLUTION,
+        fps: int = DEFAULT_FPS,
+        threads: Optional[int] = None,
+        chunked: bool = False,
+        max_workers: Optional[int] = None,
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Encode a timeline of slide images and video clips in a single pass.
 
-    # -------------------------------------------------------------------------
-    # Full PPT Video Composition
-    # -------------------------------------------------------------------------
+        Builds one filter graph straight from the slide PNGs and transition
+        clips, so there are no intermediate static clips and only one encode.
+        Timelines longer than concat_group_size are encoded hierarchically
+        (see _encode_grouped()).
+
+        Args:
+            timeline: Timeline items from build_timeline().
+            output_path: Output video path.
+            resolution: Target resolution.
+            fps: Target FPS.
+            threads: Encoder threads (FFmpeg default if not provided).
+            chunked: Encode contiguous parts of the timeline in parallel and
+                join them by stream copy.
+            max_workers: Maximum concurrent segment encodes.
+            stats: Filled with run statistics (see _run_ffmpeg()).
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        if chunked:
+            return self._encode_segments(
+                timeline,
+                [self._item_duration(item) for item in timeline],
+                output_path,
+                lambda items, path, segment_threads: self.encode_timeline(
+                    items, path, resolution, fps, segment_threads
+                ),
+                max_workers,
+            )
+
+        if len(timeline) > self.concat_group_size:
+            return self._encode_grouped(
+                timeline,
+                output_path,
+                lambda items, path, group_stats: self.encode_timeline(
+                    items, path, resolution, fps, threads, stats=group_stats
+                ),
+            )
+
+        cmd = self._timeline_command(timeline, output_path, resolution, fps, threads)
+        total_duration = sum(self._item_duration(item) for item in timeline)
+        description = f"Encoding timeline of {len(timeline)} items (single pass)"
+        return self._run_ffmpeg(cmd, description, total_duration, stats=stats)
 
     def compose_full_ppt_video(
         self,
@@ -332,6 +2160,12 @@ class VideoComposer:
         preview_video_path: Optional[str] = None,
         resolution: str = DEFAULT_RESOLUTION,
         fps: int = DEFAULT_FPS,
+        fallback_transition_effect: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        composition_mode: str = DEFAULT_COMPOSITION_MODE,
+        freeze_last_frame: bool = False,
+        chunked_encode: bool = False,
+        match_source_keys: Optional[Iterable[str]] = None,
     ) -> bool:
         """
         Compose complete PPT video from slides and transitions.
@@ -353,6 +2187,24 @@ class VideoComposer:
             preview_video_path: Path to preview video.
             resolution: Target resolution.
             fps: Target FPS.
+            fallback_transition_effect: Local effect rendered in place of missing
+                transitions (hard cut if None).
+            max_workers: Maximum concurrent static clip encodes (CPU count if
+                not provided).
+            composition_mode: "clips" encodes a static clip per slide and then
+                concatenates; "single_pass" encodes the whole timeline straight
+                from the slide images in one FFmpeg run; "match_source" encodes
+                static clips with the first transition's stream parameters so
+                the final join is a stream copy; "incremental" keeps one encoded
+                segment per timeline item next to the output and re-encodes
+                only the items that changed since the last composition.
+            freeze_last_frame: Show each slide by holding the last frame of
+                the transition into it instead of the slide image.
+            chunked_encode: Split any full re-encode of the timeline into
+                segments encoded in parallel and joined by stream copy.
+            match_source_keys: Transition keys eligible as the match_source
+                stream (e.g. only Kling clips, not local fallback renders);
+                every transition if None.
 
         Returns:
             True if successful, False otherwise.
@@ -361,90 +2213,79 @@ class VideoComposer:
         print("Composing Full PPT Video")
         print("=" * 80)
 
+        if composition_mode not in COMPOSITION_MODES:
+            print(f"  Unknown composition mode: {composition_mode} "
+                  f"(available: {', '.join(COMPOSITION_MODES)})")
+            return False
+
+        encoder_params = None
+        if composition_mode == "match_source":
+            source = self._find_match_source(
+                slides_paths, transitions_dict, match_source_keys
+            )
+            if source:
+                resolution = source["resolution"]
+                fps = source["fps"]
+                encoder_params = source["encoder_params"]
+                print(f"\nMatching source stream: {source['path']}")
+                print("  " + ", ".join(f"{k}={v}" for k, v in encoder_params.items()))
+            else:
+                print("\n  No H.264 transition to match, using clips mode")
+                composition_mode = "clips"
+
         num_slides = len(slides_paths)
         print(f"\nParameters:")
         print(f"  Slides: {num_slides}")
         print(f"  Duration per slide: {slide_duration}s")
         print(f"  Include preview: {'Yes' if include_preview else 'No'}")
         print(f"  Resolution: {resolution}")
-        print(f"  FPS: {fps}\n")
-
-        # Create temporary directory
-        temp_dir = tempfile.mkdtemp(prefix="ppt_video_")
-        print(f"Temp directory: {temp_dir}\n")
+        print(f"  FPS: {fps}")
+        print(f"  Composition mode: {composition_mode}")
+        print(f"  Freeze last frame: {'Yes' if freeze_last_frame else 'No'}")
+        print(f"  Chunked encode: {'Yes' if chunked_encode else 'No'}\n")
+
+        # Create scratch directory, failing early if intermediates cannot fit
+        temp_dir = self.scratch.allocate(self._estimate_scratch_bytes(
+            slides_paths, transitions_dict, slide_duration,
+            preview_video_path if include_preview else None,
+            resolution, fps, composition_mode,
+        ))
+        if not temp_dir:
+            return False
+        print()
 
         try:
-            # Generate static videos (skip first slide)
-            print("Generating static video clips...")
-            static_videos = {}
-
-            for i in range(1, num_slides):
-                slide_path = slides_paths[i]
-                slide_num = Path(slide_path).stem.split("-")[-1]
-
-                static_path = os.path.join(temp_dir, f"slide-{slide_num}-static.mp4")
-                result = self.create_static_video(
-                    image_path=slide_path,
-                    duration=slide_duration,
-                    output_path=static_path,
-                    resolution=resolution,
-                    fps=fps,
-                )
-
-                if not result:
-                    print(f"  Failed to create static video for slide {slide_num}")
-                    return False
-
-                static_videos[slide_num] = static_path
-
-            print(f"  Generated {len(static_videos)} static videos\n")
-
-            # Build video sequence
-            print("Building video sequence...")
-            video_sequence = []
-
-            # Optional preview
-            if include_preview and preview_video_path and os.path.exists(preview_video_path):
-                video_sequence.append(preview_video_path)
-                print("  + Preview video")
-
-            # Add transitions and static videos
-            for i in range(num_slides - 1):
-                from_num = Path(slides_paths[i]).stem.split("-")[-1]
-                to_num = Path(slides_paths[i + 1]).stem.split("-")[-1]
-                transition_key = f"{from_num}-{to_num}"
-
-                # Add transition video
-                if transition_key in transitions_dict:
-                    transition_path = transitions_dict[transition_key]
-                    if os.path.exists(transition_path):
-                        video_sequence.append(transition_path)
-                        print(f"  + Transition {transition_key}")
-                    else:
-                        print(f"  ! Transition missing: {transition_key}")
-                else:
-                    print(f"  ! Transition not defined: {transition_key}")
-
-                # Add target slide static video
-                if to_num in static_videos:
-                    video_sequence.append(static_videos[to_num])
-                    print(f"  + Static slide-{to_num} ({slide_duration}s)")
-
-            print(f"\n  Total clips: {len(video_sequence)}\n")
+            timeline = self.build_timeline(
+                slides_paths=slides_paths,
+                transitions_dict=transitions_dict,
+                slide_duration=slide_duration,
+                include_preview=include_preview,
+                preview_video_path=preview_video_path,
+                resolution=resolution,
+                fps=fps,
+                fallback_transition_effect=fallback_transition_effect,
+                work_dir=temp_dir,
+                freeze_last_frame=freeze_last_frame,
+            )
 
-            if not video_sequence:
+            if not timeline:
                 print("  No video clips to concatenate")
                 return False
 
-            # Concatenate all videos
-            print("Concatenating videos...")
-            success = self.concat_videos(
-                video_list=video_sequence,
-                output_path=output_path,
-                normalize_params=True,
-                target_resolution=resolution,
-                target_fps=fps,
-            )
+            if composition_mode == "incremental":
+                success = self._compose_incremental(
+                    timeline, output_path, resolution, fps, max_workers
+                )
+            elif composition_mode == "single_pass":
+                success = self.encode_timeline(
+                    timeline, output_path, resolution, fps,
+                    chunked=chunked_encode, max_workers=max_workers,
+                )
+            else:
+                success = self._compose_from_clips(
+                    timeline, output_path, resolution, fps, temp_dir, max_workers,
+                    encoder_params, chunked_encode,
+                )
 
             if success:
                 file_size_mb = os.path.getsize(output_path) / (1024 * 1024)
@@ -453,19 +2294,518 @@ class VideoComposer:
                 print("=" * 80)
                 print(f"  Output: {output_path}")
                 print(f"  Size: {file_size_mb:.2f} MB")
-                print(f"  Clips: {len(video_sequence)}")
+                print(f"  Clips: {len(timeline)}")
                 print("=" * 80 + "\n")
             else:
-                print("\n  Video concatenation failed")
+                print("\n  Video composition failed")
 
             return success
 
         finally:
             # Cleanup
             print("Cleaning up temp files...")
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-                print(f"  Removed: {temp_dir}\n")
+            self.scratch.release()
+
+    def _estimate_scratch_bytes(
+        self,
+        slides_paths: List[str],
+        transitions_dict: Dict[str, str],
+        slide_duration: float,
+        preview_video_path: Optional[str],
+        resolution: str,
+        fps: int,
+        composition_mode: str,
+    ) -> int:
+        """
+        Estimate the peak size of a composition's intermediates in bytes.
+
+        Args:
+            slides_paths: List of slide image paths.
+            transitions_dict: Dict mapping 'from-to' keys to transition video paths.
+            slide_duration: Duration for each static slide.
+            preview_video_path: Preview video included in the output, if any.
+            resolution: Target resolution.
+            fps: Target FPS.
+            composition_mode: Composition mode (see COMPOSITION_MODES).
+
+        Returns:
+            Estimated bytes.
+        """
+        total_duration = len(slides_paths) * slide_duration + sum(
+            self.media_index.duration(path) for path in transitions_dict.values()
+        )
+        if preview_video_path:
+            total_duration += self.media_index.duration(preview_video_path)
+
+        width, height = (int(v) for v in resolution.split("x"))
+        bytes_per_second = width * height * fps * SCRATCH_BITS_PER_PIXEL / 8
+        copies = (
+            SCRATCH_TIMELINE_COPIES if composition_mode in ("clips", "match_source") else 1
+        )
+        return int(total_duration * bytes_per_second * copies)
+
+    @staticmethod
+    def segment_paths(output_path: str) -> Tuple[str, str]:
+        """
+        Get the segment manifest and segment directory for an output video.
+
+        Returns:
+            Tuple of (manifest path, segment directory).
+        """
+        base = os.path.splitext(output_path)[0]
+        return f"{base}.segments.json", f"{base}.segments"
+
+    def _segment_key(self, item: Dict[str, Any], resolution: str, fps: float) -> str:
+        """Build the content hash identifying an item's encoded segment."""
+        return hash_text(json.dumps({
+            "type": item["type"],
+            "content": self.media_index.content_hash(item["path"]),
+            "duration": item.get("duration"),
+            "hold": item.get("hold", 0),
+            "resolution": resolution,
+            "fps": fps,
+            "encoder": SEGMENT_ENCODER,
+            "profile": self.profile,
+        }, sort_keys=True))
+
+    def prepare_segment(
+        self,
+        item: Dict[str, Any],
+        output_path: str,
+        resolution: str = DEFAULT_RESOLUTION,
+        fps: int = DEFAULT_FPS,
+        threads: Optional[int] = None,
+    ) -> Optional[str]:
+        """
+        Encode one timeline item's incremental-mode segment ahead of composition.
+
+        Lets segments be encoded while other inputs are still being produced;
+        the next incremental composition of output_path reuses them.
+
+        Args:
+            item: Timeline item (see build_timeline()).
+            output_path: Final composed video path (locates the segment
+                directory, see segment_paths()).
+            resolution: Composition resolution.
+            fps: Composition FPS.
+            threads: Encoder threads (FFmpeg default if not provided).
+
+        Returns:
+            Path to the segment, or None if encoding failed.
+        """
+        _, segment_dir = self.segment_paths(output_path)
+        os.makedirs(segment_dir, exist_ok=True)
+
+        # Segments are only ever renamed into place once complete
+        key = self._segment_key(item, resolution, fps)
+        segment_path = os.path.join(segment_dir, f"{key[:24]}.mp4")
+        if os.path.exists(segment_path):
+            return segment_path
+
+        partial_path = os.path.join(
+            segment_dir, f"{key[:24]}.{os.getpid()}.{threading.get_ident()}.part.mp4"
+        )
+        if not self.encode_timeline([item], partial_path, resolution, fps, threads):
+            self._remove_partial(partial_path)
+            return None
+
+        os.replace(partial_path, segment_path)
+        return segment_path
+
+    def _compose_incremental(
+        self,
+        timeline: List[Dict[str, Any]],
+        output_path: str,
+        resolution: str,
+        fps: int,
+        max_workers: Optional[int] = None,
+    ) -> bool:
+        """
+        Compose by reusing encoded segments from earlier compositions.
+
+        Each timeline item is encoded into its own segment with identical
+        settings and recorded in a manifest next to the output. Items whose
+        inputs are unchanged reuse their segment; the rest are re-encoded,
+        and all segments are joined by stream copy.
+
+        Args:
+            timeline: Timeline items from build_timeline().
+            output_path: Output video path.
+            resolution: Target resolution.
+            fps: Target FPS.
+            max_workers: Maximum concurrent segment encodes.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        manifest_path, segment_dir = self.segment_paths(output_path)
+        os.makedirs(segment_dir, exist_ok=True)
+
+        entries = []
+        for item in timeline:
+            key = self._segment_key(item, resolution, fps)
+            entries.append({
+                "label": item["label"],
+                "key": key,
+                "file": f"{key[:24]}.mp4",
+            })
+
+        # Segments are renamed into place once complete, whichever run or
+        # download stream encoded them; identical items share one segment
+        pending = {}
+        for i, entry in enumerate(entries):
+            if not os.path.exists(os.path.join(segment_dir, entry["file"])):
+                pending.setdefault(entry["key"], i)
+        reused = sum(1 for entry in entries if entry["key"] not in pending)
+        print(f"Segments: {reused}/{len(entries)} reused, "
+              f"{len(pending)} to encode")
+        for i in pending.values():
+            print(f"  ~ {entries[i]['label']}")
+
+        if pending:
+            workers, threads = self.plan_encode_pool(len(pending), max_workers)
+
+            def encode(index: int) -> bool:
+                return self.prepare_segment(
+                    timeline[index], output_path, resolution, fps, threads
+                ) is not None
+
+            results = self._map_jobs(encode, list(pending.values()), workers)
+
+            if not all(results):
+                print("  Segment encoding failed")
+                return False
+
+        success = self._concat_with_demuxer(
+            [os.path.join(segment_dir, entry["file"]) for entry in entries],
+            output_path,
+            video_only=True,
+        )
+        if not success:
+            return False
+
+        temp_path = f"{manifest_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": SEGMENT_MANIFEST_VERSION,
+                "output": os.path.basename(output_path),
+                "resolution": resolution,
+                "fps": fps,
+                "segments": entries,
+            }, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, manifest_path)
+
+        # Drop segments no longer in the timeline
+        current_files = {entry["file"] for entry in entries}
+        for name in os.listdir(segment_dir):
+            if name not in current_files:
+                os.remove(os.path.join(segment_dir, name))
+
+        return True
+
+    def _find_match_source(
+        self,
+        slides_paths: List[str],
+        transitions_dict: Dict[str, str],
+        keys: Optional[Iterable[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Probe the first available transition for match-source composition.
+
+        Args:
+            slides_paths: List of slide image paths.
+            transitions_dict: Dict mapping 'from-to' keys to transition video paths.
+            keys: Transition keys that may be matched (all if None).
+
+        Returns:
+            probe_match_source() result plus "path", or None if no transition
+            can be matched.
+        """
+        eligible = None if keys is None else set(keys)
+        for i in range(len(slides_paths) - 1):
+            from_num = Path(slides_paths[i]).stem.split("-")[-1]
+            to_num = Path(slides_paths[i + 1]).stem.split("-")[-1]
+            key = f"{from_num}-{to_num}"
+            if eligible is not None and key not in eligible:
+                continue
+            transition_path = transitions_dict.get(key)
+            if not transition_path or not os.path.exists(transition_path):
+                continue
+
+            source = self.probe_match_source(transition_path)
+            if source:
+                source["path"] = transition_path
+                return source
+        return None
+
+    def _compose_from_clips(
+        self,
+        timeline: List[Dict[str, Any]],
+        output_path: str,
+        resolution: str,
+        fps: int,
+        work_dir: str,
+        max_workers: Optional[int] = None,
+        encoder_params: Optional[Dict[str, str]] = None,
+        chunked: bool = False,
+    ) -> bool:
+        """
+        Compose by encoding a static clip per slide image, then concatenating.
+
+        Args:
+            timeline: Timeline items from build_timeline().
+            output_path: Output video path.
+            resolution: Target resolution.
+            fps: Target FPS.
+            work_dir: Directory for static clips.
+            max_workers: Maximum concurrent static clip encodes.
+            encoder_params: Stream parameters static clips should match.
+            chunked: Use segment-parallel encoding for the final concat.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        print("Generating static video clips...")
+        image_items = [item for item in timeline if item["type"] == "image"]
+        static_results = self.create_static_videos(
+            jobs=[
+                (item["path"], os.path.join(work_dir, f"{item['label']}-static.mp4"))
+                for item in image_items
+            ],
+            duration=image_items[0]["duration"] if image_items else DEFAULT_SLIDE_DURATION,
+            resolution=resolution,
+            fps=fps,
+            max_workers=max_workers,
+            encoder_params=encoder_params,
+        )
+
+        static_videos = {}
+        for item, result in zip(image_items, static_results):
+            if not result:
+                print(f"  Failed to create static video for {item['label']}")
+                return False
+            static_videos[id(item)] = result
+
+        print(f"  Generated {len(static_videos)} static videos\n")
+
+        video_sequence = [
+            static_videos[id(item)] if item["type"] == "image" else item["path"]
+            for item in timeline
+        ]
+
+        # Concatenate all videos
+        print("Concatenating videos...")
+        return self.concat_videos(
+            video_list=video_sequence,
+            output_path=output_path,
+            target_resolution=resolution,
+            target_fps=fps,
+            holds=[item.get("hold", 0) for item in timeline],
+            chunked=chunked,
+            max_workers=max_workers,
+        )
+
+    def open_segment_stream(
+        self,
+        video_path: str,
+        output_path: str,
+        resolution: str = DEFAULT_RESOLUTION,
+        fps: int = DEFAULT_FPS,
+    ) -> "SegmentStream":
+        """
+        Start encoding a transition's incremental-mode segment while it downloads.
+
+        Feed the downloaded bytes to the returned stream's write() as they
+        arrive and call finish() once video_path is complete. The segment
+        is encoded exactly as _compose_incremental() would encode it, so the
+        next incremental composition of output_path reuses it.
+
+        Args:
+            video_path: Path the transition video is being downloaded to.
+            output_path: Final composed video path (locates the segment
+                directory, see segment_paths()).
+            resolution: Composition resolution.
+            fps: Composition FPS.
+
+        Returns:
+            Segment stream accepting the downloaded bytes.
+        """
+        _, segment_dir = self.segment_paths(output_path)
+        os.makedirs(segment_dir, exist_ok=True)
+        partial_path = os.path.join(
+            segment_dir, f"{Path(video_path).stem}.{os.getpid()}.{threading.get_ident()}.part"
+        )
+
+        item = {"type": "video", "path": "pipe:0", "label": Path(video_path).stem}
+        cmd = self._timeline_command([item], partial_path, resolution, fps)
+        cmd[1:1] = ["-hide_banner", "-nostats", "-loglevel", "error"]
+        cmd[-1:-1] = ["-f", "mp4"]
+
+        return SegmentStream(self, cmd, video_path, segment_dir, partial_path, resolution, fps)
+
+    # -------------------------------------------------------------------------
+    # Streaming Packaging
+    # -------------------------------------------------------------------------
+
+    def remux_faststart(
+        self,
+        input_path: str,
+        output_path: str,
+        fragmented: bool = False,
+    ) -> Optional[str]:
+        """
+        Remux an MP4 so playback can start before the download finishes.
+
+        Args:
+            input_path: Source MP4 path.
+            output_path: Output MP4 path (must differ from input_path).
+            fragmented: Write a fragmented MP4 (fragment per keyframe) instead
+                of moving the moov atom to the front.
+
+        Returns:
+            Path to output video, or None if failed.
+        """
+        movflags = (
+            "+frag_keyframe+empty_moov+default_base_moof" if fragmented else "+faststart"
+        )
+        cmd = [
+            self.ffmpeg_path,
+            "-y",
+            "-i", input_path,
+            "-map", "0",
+            "-c", "copy",
+            "-movflags", movflags,
+            output_path,
+        ]
+
+        kind = "fragmented" if fragmented else "faststart"
+        description = f"Remux {kind} ({Path(input_path).name})"
+        success = self._run_ffmpeg(cmd, description, self._clip_duration(input_path))
+
+        return output_path if success else None
+
+    def package_streaming(
+        self,
+        input_path: str,
+        output_dir: str,
+        streaming_format: str = DEFAULT_STREAMING_FORMAT,
+        ladder: Optional[List[Dict[str, Any]]] = None,
+        segment_seconds: int = STREAMING_SEGMENT_SECONDS,
+    ) -> Optional[str]:
+        """
+        Package a video as an adaptive-bitrate HLS or DASH ladder.
+
+        The source is decoded once and split into every rendition inside a
+        single FFmpeg graph. Renditions use the encoding profile's CRF capped
+        by the rung's maxrate, with keyframes aligned on segment boundaries.
+
+        Args:
+            input_path: Source video path.
+            output_dir: Directory for playlists/manifest and segments.
+            streaming_format: "hls" (master.m3u8) or "dash" (manifest.mpd).
+            ladder: Renditions as dicts with name, height, maxrate and bufsize
+                (DEFAULT_STREAMING_LADDER if not provided).
+            segment_seconds: Target segment duration in seconds.
+
+        Returns:
+            Path to the master playlist or manifest, or None if failed.
+        """
+        if streaming_format not in STREAMING_FORMATS:
+            print(f"  Unknown streaming format: {streaming_format} "
+                  f"(available: {', '.join(STREAMING_FORMATS)})")
+            return None
+
+        info = self.media_index.probe(input_path)
+        if not info or not info["height"]:
+            print(f"  Cannot probe video: {input_path}")
+            return None
+
+        # Never upscale; keep at least the smallest rung
+        ladder = list(ladder or DEFAULT_STREAMING_LADDER)
+        renditions = [rung for rung in ladder if rung["height"] <= info["height"]]
+        renditions = renditions or [min(ladder, key=lambda rung: rung["height"])]
+
+        fps = info["fps"] or DEFAULT_FPS
+        gop = str(max(1, round(fps * segment_seconds)))
+        has_audio = info["has_audio"]
+
+        # Even widths round the aspect ratio (16:9 at 480 lines is 854x480), so
+        # pin every rendition to the source's display aspect ratio; DASH
+        # rejects mixed ratios within one adaptation set
+        sar = Fraction(1)
+        if re.fullmatch(r"[1-9]\d*:[1-9]\d*", info.get("sample_aspect_ratio") or ""):
+            sar = Fraction(info["sample_aspect_ratio"].replace(":", "/"))
+        dar = Fraction(info["width"], info["height"]) * sar
+
+        # One decode, split into one scaled branch per rendition
+        labels = "".join(f"[v{i}]" for i in range(len(renditions)))
+        filters = [f"[0:v]split={len(renditions)}{labels}"]
+        for i, rung in enumerate(renditions):
+            filters.append(
+                f"[v{i}]scale=-2:{rung['height']},"
+                f"setdar={dar.numerator}/{dar.denominator}[v{i}out]"
+            )
+
+        cmd = [
+            self.ffmpeg_path,
+            "-y",
+            "-i", input_path,
+            "-filter_complex", ";".join(filters),
+        ]
+        for i, rung in enumerate(renditions):
+            cmd += ["-map", f"[v{i}out]"]
+            if has_audio:
+                cmd += ["-map", "0:a:0"]
+        cmd += self._encoder_args(fps)
+        cmd += ["-g", gop, "-keyint_min", gop, "-sc_threshold", "0"]
+        for i, rung in enumerate(renditions):
+            cmd += [f"-maxrate:v:{i}", rung["maxrate"], f"-bufsize:v:{i}", rung["bufsize"]]
+        if has_audio:
+            cmd += ["-c:a", "aac", "-b:a", STREAMING_AUDIO_BITRATE, "-ac", "2"]
+
+        os.makedirs(output_dir, exist_ok=True)
+        if streaming_format == "hls":
+            stream_map = " ".join(
+                f"v:{i},a:{i},name:{rung['name']}" if has_audio else f"v:{i},name:{rung['name']}"
+                for i, rung in enumerate(renditions)
+            )
+            for rung in renditions:
+                os.makedirs(os.path.join(output_dir, rung["name"]), exist_ok=True)
+            manifest_path = os.path.join(output_dir, "master.m3u8")
+            cmd += [
+                "-f", "hls",
+                "-hls_time", str(segment_seconds),
+                "-hls_playlist_type", "vod",
+                "-hls_segment_filename", os.path.join(output_dir, "%v", "segment_%04d.ts"),
+                "-master_pl_name", "master.m3u8",
+                "-var_stream_map", stream_map,
+                os.path.join(output_dir, "%v", "index.m3u8"),
+            ]
+        else:
+            manifest_path = os.path.join(output_dir, "manifest.mpd")
+            adaptation_sets = "id=0,streams=v" + (" id=1,streams=a" if has_audio else "")
+            cmd += [
+                "-f", "dash",
+                "-seg_duration", str(segment_seconds),
+                "-use_template", "1",
+                "-use_timeline", "1",
+                "-adaptation_sets", adaptation_sets,
+                manifest_path,
+            ]
+
+        names = "/".join(rung["name"] for rung in renditions)
+        description = f"Package {streaming_format.upper()} ladder ({names})"
+        success = self._run_ffmpeg(
+            cmd, description, info["duration"], output_path=manifest_path
+        )
+
+        # Some muxer errors still exit 0, so require the manifest itself
+        if success and not (
+            os.path.exists(manifest_path) and os.path.getsize(manifest_path) > 0
+        ):
+            print(f"  {description} wrote no manifest: {manifest_path}")
+            return None
+        return manifest_path if success else None
 
 
 # =============================================================================
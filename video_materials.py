@@ -8,12 +8,16 @@ Supports concurrent generation with configurable limits.
 
 import json
 import os
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from kling_api import KlingVideoGenerator
+from file_cache import DEFAULT_CACHE_ROOT, MediaCache, hash_file
+from kling_api import DEFAULT_MODEL as KLING_MODEL, KlingVideoGenerator
+from media_index import MEMORY_INDEX, MediaIndex
 from prompt_file_reader import PromptFileReader
 
 
@@ -24,6 +28,165 @@ from prompt_file_reader import PromptFileReader
 DEFAULT_MAX_CONCURRENT = 3
 DEFAULT_DURATION = "5"
 DEFAULT_MODE = "pro"
+METADATA_FILENAME = "video_metadata.json"
+DEFAULT_CACHE_DIR = os.environ.get(
+    "PPT_VIDEO_CACHE_DIR", os.path.join(DEFAULT_CACHE_ROOT, "transitions")
+)
+DEFAULT_CACHE_MAX_GB = 5.0
+
+# Opening transitions dispatched ahead of the preview. The preview loops on
+# the viewer's cover but is not part of the composed video (0 = preview first)
+DEFAULT_OPENING_BOOST = 0
+
+# Published while transitions render: the slides and transitions that can
+# already be played back from the start of the deck
+PLAYABLE_PREFIX_FILENAME = "playable_prefix.json"
+
+
+# =============================================================================
+# Transition Cache
+# =============================================================================
+
+class TransitionCache(MediaCache):
+    """Persistent cache of Kling videos keyed by input images, prompt and parameters."""
+
+    label = "Transition cache"
+    default_dir = DEFAULT_CACHE_DIR
+    default_max_gb = DEFAULT_CACHE_MAX_GB
+
+    @classmethod
+    def make_key(
+        cls,
+        image_start: str,
+        image_end: str,
+        prompt: str,
+        params: Dict[str, str],
+        content_hash: Callable[[str], str] = hash_file,
+    ) -> str:
+        """
+        Build the content-addressed cache key.
+
+        Args:
+            image_start: Start frame image path.
+            image_end: End frame image path.
+            prompt: Generation prompt.
+            params: Kling generation parameters (model, duration, mode).
+            content_hash: Image hash function (e.g. MediaIndex.content_hash,
+                which keeps digests across runs).
+
+        Returns:
+            Hex digest key.
+        """
+        return cls.hash_fields({
+            "image_start": content_hash(image_start),
+            "image_end": content_hash(image_end),
+            "prompt": prompt,
+            "params": params,
+        })
+
+
+# =============================================================================
+# Playable Prefix
+# =============================================================================
+
+class PlayablePrefix:
+    """Tracker of the longest playable run of segments from the start of the deck."""
+
+    def __init__(
+        self,
+        tasks: List[Dict[str, Any]],
+        slides_paths: List[str],
+        output_dir: str,
+        on_update: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        """
+        Initialize playable prefix tracker and publish the empty prefix.
+
+        Args:
+            tasks: Transition tasks from plan_transitions(), in playback order.
+            slides_paths: List of slide image paths in order.
+            output_dir: Directory for playable_prefix.json.
+            on_update: Called with the prefix dict (see snapshot()) every
+                time it grows.
+        """
+        self.keys = [task["key"] for task in tasks]
+        self.slides_paths = slides_paths
+        self.path = os.path.join(output_dir, PLAYABLE_PREFIX_FILENAME)
+        self.on_update = on_update
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.playable = 0
+        self.started = time.time()
+        self.first_playable_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+        os.makedirs(output_dir, exist_ok=True)
+        self._write(self.snapshot())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Build the current prefix.
+
+        Returns:
+            Dict with the playable segments (slide, transition, slide, ...)
+            in playback order, transition counts and a complete flag.
+        """
+        segments: List[Dict[str, Any]] = [{"type": "slide", "path": self.slides_paths[0]}]
+        for i, key in enumerate(self.keys[:self.playable]):
+            segments.append({
+                "type": "transition",
+                "key": key,
+                "path": self.results[key]["video_path"],
+            })
+            segments.append({"type": "slide", "path": self.slides_paths[i + 1]})
+
+        return {
+            "playable_transitions": self.playable,
+            "total_transitions": len(self.keys),
+            "complete": self.playable == len(self.keys),
+            "segments": segments,
+            "elapsed": round(time.time() - self.started, 1),
+            "updated_at": datetime.now().isoformat(),
+        }
+
+    def update(self, result: Dict[str, Any]) -> bool:
+        """
+        Record a transition result and publish the prefix if it grew.
+
+        Args:
+            result: Transition result dict (from_to, video_path, success).
+
+        Returns:
+            True if the prefix grew.
+        """
+        with self._lock:
+            self.results[result["from_to"]] = result
+
+            playable = 0
+            for key in self.keys:
+                if not self.results.get(key, {}).get("success"):
+                    break
+                playable += 1
+            if playable <= self.playable:
+                return False
+
+            self.playable = playable
+            if self.first_playable_at is None:
+                self.first_playable_at = time.time() - self.started
+            prefix = self.snapshot()
+            self._write(prefix)
+
+        print(f"  Playable prefix: slides 1-{playable + 1} "
+              f"({playable}/{len(self.keys)} transitions, {prefix['elapsed']:.0f}s)")
+        if self.on_update:
+            self.on_update(prefix)
+        return True
+
+    def _write(self, prefix: Dict[str, Any]) -> None:
+        """Replace playable_prefix.json atomically so readers never see a partial file."""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(prefix, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
 
 
 # =============================================================================
@@ -39,6 +202,9 @@ class VideoMaterialsGenerator:
         prompt_generator: Optional[Any] = None,
         max_concurrent: int = DEFAULT_MAX_CONCURRENT,
         prompts_file: Optional[str] = None,
+        cache: Optional[TransitionCache] = None,
+        media_index: Optional[MediaIndex] = None,
+        segment_stream_factory: Optional[Callable[[str], Any]] = None,
     ) -> None:
         """
         Initialize video materials generator.
@@ -48,12 +214,25 @@ class VideoMaterialsGenerator:
             prompt_generator: Custom prompt generator (prompts_file takes priority).
             max_concurrent: Maximum concurrent video generation tasks.
             prompts_file: Path to prompts JSON file (required if no prompt_generator).
+            cache: Transition cache to consult before calling Kling (disabled if None).
+            media_index: Index used to probe and validate clips (in-memory if
+                not provided); share it with VideoComposer to avoid re-probing.
+            segment_stream_factory: Called with a transition's output path
+                before its download; the returned stream (see
+                VideoComposer.open_segment_stream()) receives the bytes as they
+                arrive so composition work overlaps the transfer.
 
         Raises:
             ValueError: If neither prompts_file nor prompt_generator is provided.
         """
         self.kling_client = kling_client or KlingVideoGenerator()
         self.max_concurrent = max_concurrent
+        self.cache = cache
+        self.media_index = media_index or MediaIndex(MEMORY_INDEX)
+        self.segment_stream_factory = segment_stream_factory
+        # Prefix of the latest transition batch, so late fills can extend it
+        self.playable_prefix: Optional[PlayablePrefix] = None
+        self._metadata_lock = threading.Lock()
 
         # Initialize prompt generator
         if prompts_file:
@@ -91,6 +270,37 @@ class VideoMaterialsGenerator:
         output_dir: str,
         duration: str = DEFAULT_DURATION,
         mode: str = DEFAULT_MODE,
+        previous: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate preview video for the first slide and record it in the metadata.
+
+        Args:
+            first_slide_path: Path to first slide image.
+            output_dir: Output directory.
+            duration: Video duration (5 or 10 seconds).
+            mode: Generation mode (std/pro).
+            previous: Recorded result from an earlier run (resume mode).
+
+        Returns:
+            Result dict with video_path, prompt, and duration.
+
+        Raises:
+            Exception: If video generation fails.
+        """
+        result = self._generate_preview_video(
+            first_slide_path, output_dir, duration, mode, previous
+        )
+        self.record_result(output_dir, result, preview=True)
+        return result
+
+    def _generate_preview_video(
+        self,
+        first_slide_path: str,
+        output_dir: str,
+        duration: str = DEFAULT_DURATION,
+        mode: str = DEFAULT_MODE,
+        previous: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Generate preview video for the first slide (same first and last frame).
@@ -100,6 +310,8 @@ class VideoMaterialsGenerator:
             output_dir: Output directory.
             duration: Video duration (5 or 10 seconds).
             mode: Generation mode (std/pro).
+            previous: Recorded result from an earlier run (resume mode). The
+                existing preview is reused if it is still valid.
 
         Returns:
             Result dict with video_path, prompt, and duration.
@@ -115,6 +327,35 @@ class VideoMaterialsGenerator:
 
         os.makedirs(output_dir, exist_ok=True)
         output_path = os.path.join(output_dir, "preview.mp4")
+        params = self._generation_params(duration, mode)
+
+        if previous is not None and self._is_reusable(
+            output_path, preview_prompt, params, previous
+        ):
+            print(f"\nReusing existing preview video: {output_path}\n")
+            return {
+                "video_path": output_path,
+                "prompt": preview_prompt,
+                "params": params,
+                "duration": 0,
+                "reused": True,
+            }
+
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.make_key(
+                first_slide_path, first_slide_path, preview_prompt, params,
+                self.media_index.content_hash,
+            )
+            if self.cache.fetch(cache_key, output_path):
+                print(f"\nPreview video served from cache: {output_path}\n")
+                return {
+                    "video_path": output_path,
+                    "prompt": preview_prompt,
+                    "params": params,
+                    "duration": 0,
+                    "cached": True,
+                }
 
         print(f"\nGenerating preview video...")
         start_time = time.time()
@@ -125,11 +366,12 @@ class VideoMaterialsGenerator:
                 image_end=first_slide_path,  # Same as start for looping
                 prompt=preview_prompt,
                 output_path=output_path,
-                model_name="kling-v2-6",
-                duration=duration,
-                mode=mode,
+                **params,
             )
 
+            if cache_key:
+                self.cache.put(cache_key, output_path)
+
             elapsed = int(time.time() - start_time)
 
             print(f"\nPreview video generated!")
@@ -139,6 +381,7 @@ class VideoMaterialsGenerator:
             return {
                 "video_path": output_path,
                 "prompt": preview_prompt,
+                "params": params,
                 "duration": elapsed,
             }
 
@@ -158,6 +401,7 @@ class VideoMaterialsGenerator:
         content_context: Optional[str] = None,
         duration: str = DEFAULT_DURATION,
         mode: str = DEFAULT_MODE,
+        previous: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Generate a single transition video.
@@ -169,6 +413,7 @@ class VideoMaterialsGenerator:
             content_context: Content context for prompt generation.
             duration: Video duration.
             mode: Generation mode.
+            previous: Recorded result from an earlier run (resume mode).
 
         Returns:
             Result dict with success status and details.
@@ -186,18 +431,63 @@ class VideoMaterialsGenerator:
                 frame_end_path=slide_to,
                 content_context=content_context,
             )
+            params = self._generation_params(duration, mode)
+
+            if previous is not None and self._is_reusable(
+                output_path, transition_prompt, params, previous
+            ):
+                print(f"  Reusing existing transition [{transition_key}]")
+                return {
+                    "from_to": transition_key,
+                    "video_path": output_path,
+                    "prompt": transition_prompt,
+                    "params": params,
+                    "duration": 0,
+                    "clip_duration": self.media_index.duration(output_path),
+                    "success": True,
+                    "reused": True,
+                }
+
+            cache_key = None
+            if self.cache:
+                cache_key = self.cache.make_key(
+                    slide_from, slide_to, transition_prompt, params,
+                    self.media_index.content_hash,
+                )
+                if self.cache.fetch(cache_key, output_path):
+                    print(f"  Transition [{transition_key}] served from cache")
+                    return {
+                        "from_to": transition_key,
+                        "video_path": output_path,
+                        "prompt": transition_prompt,
+                        "params": params,
+                        "duration": 0,
+                        "clip_duration": self.media_index.duration(output_path),
+                        "success": True,
+                        "cached": True,
+                    }
 
             start_time = time.time()
 
-            self.kling_client.generate_and_download(
-                image_start=slide_from,
-                image_end=slide_to,
-                prompt=transition_prompt,
-                output_path=output_path,
-                model_name="kling-v2-6",
-                duration=duration,
-                mode=mode,
-            )
+            stream = self.segment_stream_factory(output_path) if self.segment_stream_factory else None
+            try:
+                self.kling_client.generate_and_download(
+                    image_start=slide_from,
+                    image_end=slide_to,
+                    prompt=transition_prompt,
+                    output_path=output_path,
+                    on_chunk=stream.write if stream else None,
+                    **params,
+                )
+            except Exception:
+                if stream:
+                    stream.abort("download failed")
+                raise
+            if stream:
+                stream.finish()
+
+            if cache_key:
+                self.cache.put(cache_key, output_path)
 
             elapsed = int(time.time() - start_time)
 
@@ -205,7 +495,9 @@ class VideoMaterialsGenerator:
                 "from_to": transition_key,
                 "video_path": output_path,
                 "prompt": transition_prompt,
+                "params": params,
                 "duration": elapsed,
+                "clip_duration": self.media_index.duration(output_path),
                 "success": True,
             }
 
@@ -219,6 +511,77 @@ class VideoMaterialsGenerator:
                 "error": str(e),
             }
 
+    @staticmethod
+    def plan_transitions(
+        slides_paths: List[str],
+        output_dir: str,
+        content_contexts: Optional[List[str]] = None,
+        previous_results: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Build one task per transition between consecutive slides.
+
+        Args:
+            slides_paths: List of slide image paths in order.
+            output_dir: Output directory.
+            content_contexts: Optional list of content contexts for each transition.
+            previous_results: Transition results of an earlier run keyed by
+                'from-to' (resume mode), or None.
+
+        Returns:
+            Task dicts with key, slide_from, slide_to, output_path,
+            content_context and previous.
+        """
+        tasks = []
+        for i in range(len(slides_paths) - 1):
+            from_num = Path(slides_paths[i]).stem.split("-")[-1]
+            to_num = Path(slides_paths[i + 1]).stem.split("-")[-1]
+
+            tasks.append({
+                "key": f"{from_num}-{to_num}",
+                "slide_from": slides_paths[i],
+                "slide_to": slides_paths[i + 1],
+                "output_path": os.path.join(output_dir, f"transition_{from_num}_to_{to_num}.mp4"),
+                "content_context": content_contexts[i] if content_contexts and i < len(content_contexts) else None,
+                "previous": (
+                    previous_results.get(f"{from_num}-{to_num}")
+                    if previous_results is not None else None
+                ),
+            })
+        return tasks
+
+    def generate_transition(
+        self,
+        task: Dict[str, Any],
+        duration: str = DEFAULT_DURATION,
+        mode: str = DEFAULT_MODE,
+    ) -> Dict[str, Any]:
+        """
+        Generate the transition video of one task from plan_transitions().
+
+        The result is recorded in the output directory's metadata as soon as
+        it is known, so an interrupted run can still be resumed.
+
+        Args:
+            task: Transition task.
+            duration: Video duration.
+            mode: Generation mode.
+
+        Returns:
+            Result dict with success status and details.
+        """
+        result = self._generate_single_transition(
+            task["slide_from"],
+            task["slide_to"],
+            task["output_path"],
+            task["content_context"],
+            duration,
+            mode,
+            task["previous"],
+        )
+        self.record_result(os.path.dirname(task["output_path"]), result)
+        return result
+
     def generate_transition_videos(
         self,
         slides_paths: List[str],
@@ -226,16 +589,35 @@ class VideoMaterialsGenerator:
         content_contexts: Optional[List[str]] = None,
         duration: str = DEFAULT_DURATION,
         mode: str = DEFAULT_MODE,
+        executor: Optional[Executor] = None,
+        resume: bool = False,
+        on_playable: Optional[Callable[[Dict[str, Any]], None]] = None,
+        dispatch_hooks: Optional[Dict[int, Callable[[], None]]] = None,
     ) -> Dict[str, Dict[str, Any]]:
         """
         Generate all transition videos with concurrent execution.
 
+        Transitions are submitted in playback order, so the executor's FIFO
+        queue starts 1->2 first, and the playable prefix (see PlayablePrefix)
+        is published to output_dir as finished transitions extend it. The
+        tracker stays available as self.playable_prefix afterwards.
+
         Args:
             slides_paths: List of slide image paths in order.
             output_dir: Output directory.
             content_contexts: Optional list of content contexts for each transition.
             duration: Video duration.
             mode: Generation mode.
+            executor: Shared executor to submit into (a private pool is created
+                if not provided). Lets other Kling tasks share the same slots.
+            resume: Reuse valid transitions recorded in an earlier run's
+                metadata instead of regenerating them.
+            on_playable: Called with the prefix dict every time the playable
+                prefix grows.
+            dispatch_hooks: Callables run just before the transition at that
+                playback position is submitted (len(slides_paths) - 1 runs
+                after the last), to slot other work (e.g. the preview) into
+                the dispatch order.
 
         Returns:
             Dict mapping transition keys to result dicts.
@@ -258,18 +640,17 @@ class VideoMaterialsGenerator:
 
         os.makedirs(output_dir, exist_ok=True)
 
-        # Prepare tasks
-        tasks = []
-        for i in range(num_transitions):
-            from_num = Path(slides_paths[i]).stem.split("-")[-1]
-            to_num = Path(slides_paths[i + 1]).stem.split("-")[-1]
+        previous_results: Dict[str, Any] = {}
+        if resume:
+            previous_results = (self.load_metadata(output_dir) or {}).get("transitions", {})
+            print(f"Resume mode: {len(previous_results)} transition(s) recorded in metadata\n")
 
-            tasks.append({
-                "slide_from": slides_paths[i],
-                "slide_to": slides_paths[i + 1],
-                "output_path": os.path.join(output_dir, f"transition_{from_num}_to_{to_num}.mp4"),
-                "content_context": content_contexts[i] if content_contexts and i < len(content_contexts) else None,
-            })
+        tasks = self.plan_transitions(
+            slides_paths, output_dir, content_contexts, previous_results if resume else None
+        )
+        prefix = PlayablePrefix(tasks, slides_paths, output_dir, on_playable)
+        self.playable_prefix = prefix
+        dispatch_hooks = dispatch_hooks or {}
 
         # Execute with thread pool
         results: Dict[str, Dict[str, Any]] = {}
@@ -279,34 +660,42 @@ class VideoMaterialsGenerator:
         print(f"Starting generation (concurrent: {self.max_concurrent})...\n")
         start_time = time.time()
 
-        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
-            future_to_task = {
-                executor.submit(
-                    self._generate_single_transition,
-                    task["slide_from"],
-                    task["slide_to"],
-                    task["output_path"],
-                    task["content_context"],
-                    duration,
-                    mode,
-                ): task
-                for task in tasks
-            }
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=self.max_concurrent)
+
+        try:
+            future_to_task = {}
+            for position, task in enumerate(tasks):
+                if position in dispatch_hooks:
+                    dispatch_hooks[position]()
+                future = executor.submit(self.generate_transition, task, duration, mode)
+                future_to_task[future] = task
+            if len(tasks) in dispatch_hooks:
+                dispatch_hooks[len(tasks)]()
 
             for future in as_completed(future_to_task):
                 result = future.result()
                 transition_key = result["from_to"]
                 results[transition_key] = result
+                prefix.update(result)
 
                 completed_count += 1
 
-                if result["success"]:
+                if result.get("reused") or result.get("cached"):
+                    source = "reused" if result.get("reused") else "from cache"
+                    print(f"  [{completed_count}/{num_transitions}] "
+                          f"Transition {transition_key} {source}")
+                elif result["success"]:
                     print(f"  [{completed_count}/{num_transitions}] "
                           f"Transition {transition_key} complete ({result['duration']}s)")
                 else:
                     failed_count += 1
                     print(f"  [{completed_count}/{num_transitions}] "
                           f"Transition {transition_key} failed: {result['error']}")
+        finally:
+            if own_executor:
+                executor.shutdown(wait=True)
 
         total_elapsed = int(time.time() - start_time)
 
@@ -315,8 +704,16 @@ class VideoMaterialsGenerator:
         print("Transition Generation Complete")
         print("=" * 80)
         print(f"  Total time: {total_elapsed}s ({total_elapsed/60:.1f}m)")
+        if prefix.first_playable_at is not None:
+            print(f"  First playable: {prefix.first_playable_at:.0f}s")
         print(f"  Success: {num_transitions - failed_count}/{num_transitions}")
         print(f"  Failed: {failed_count}/{num_transitions}")
+        if resume:
+            reused_count = sum(1 for r in results.values() if r.get("reused"))
+            print(f"  Reused: {reused_count}/{num_transitions}")
+        if self.cache:
+            cached_count = sum(1 for r in results.values() if r.get("cached"))
+            print(f"  Cache hits: {cached_count}/{num_transitions}")
 
         if failed_count > 0:
             print(f"\n  Failed transitions:")
@@ -328,29 +725,149 @@ class VideoMaterialsGenerator:
 
         return results
 
+    # -------------------------------------------------------------------------
+    # Resume Support
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _generation_params(duration: str, mode: str) -> Dict[str, str]:
+        """Build the Kling parameters recorded alongside each video."""
+        return {
+            "model_name": KLING_MODEL,
+            "duration": duration,
+            "mode": mode,
+        }
+
+    def _is_reusable(
+        self,
+        output_path: str,
+        prompt: str,
+        params: Dict[str, str],
+        previous: Dict[str, Any],
+    ) -> bool:
+        """
+        Check whether a video from an earlier run can be reused.
+
+        The recorded run must have succeeded with the same prompt (and the same
+        generation parameters, when recorded), and the file must pass ffprobe
+        and decode validation.
+
+        Args:
+            output_path: Existing video path.
+            prompt: Prompt for the current run.
+            params: Generation parameters for the current run.
+            previous: Result dict recorded in video_metadata.json.
+
+        Returns:
+            True if the existing video can be reused.
+        """
+        name = Path(output_path).name
+
+        if not os.path.exists(output_path):
+            return False
+
+        if not previous:
+            print(f"  {name}: no record in metadata, regenerating")
+            return False
+
+        if previous.get("success") is False or previous.get("prompt") != prompt:
+            print(f"  {name}: prompt changed or previous run failed, regenerating")
+            return False
+
+        if previous.get("params", params) != params:
+            print(f"  {name}: generation parameters changed, regenerating")
+            return False
+
+        valid, reason = self.media_index.validate(
+            output_path, expected_duration=float(params["duration"])
+        )
+        if not valid:
+            print(f"  {name}: invalid ({reason}), regenerating")
+            return False
+
+        return True
+
     # -------------------------------------------------------------------------
     # Metadata
     # -------------------------------------------------------------------------
 
-    def save_metadata(self, output_dir: str, metadata: Dict[str, Any]) -> str:
+    def load_metadata(self, output_dir: str) -> Optional[Dict[str, Any]]:
+        """
+        Load generation metadata from an earlier run.
+
+        Args:
+            output_dir: Output directory.
+
+        Returns:
+            Metadata dictionary, or None if missing or unreadable.
+        """
+        metadata_path = os.path.join(output_dir, METADATA_FILENAME)
+
+        if not os.path.exists(metadata_path):
+            return None
+
+        try:
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Could not read metadata {metadata_path}: {e}")
+            return None
+
+    @staticmethod
+    def save_metadata(
+        output_dir: str,
+        metadata: Dict[str, Any],
+        verbose: bool = True,
+    ) -> str:
         """
         Save generation metadata to JSON file.
 
+        The file is replaced atomically, so an interrupted run never leaves a
+        truncated metadata file behind.
+
         Args:
             output_dir: Output directory.
             metadata: Metadata dictionary.
+            verbose: Print the saved path.
 
         Returns:
             Path to saved metadata file.
         """
-        metadata_path = os.path.join(output_dir, "video_metadata.json")
+        metadata_path = os.path.join(output_dir, METADATA_FILENAME)
+        temp_path = f"{metadata_path}.{os.getpid()}.tmp"
 
-        with open(metadata_path, "w", encoding="utf-8") as f:
+        with open(temp_path, "w", encoding="utf-8") as f:
             json.dump(metadata, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, metadata_path)
 
-        print(f"Metadata saved: {metadata_path}")
+        if verbose:
+            print(f"Metadata saved: {metadata_path}")
         return metadata_path
 
+    def record_result(
+        self,
+        output_dir: str,
+        result: Dict[str, Any],
+        preview: bool = False,
+    ) -> None:
+        """
+        Merge one finished result into the output directory's metadata.
+
+        Args:
+            output_dir: Output directory.
+            result: Transition result dict (keyed by its from_to) or preview result.
+            preview: Whether the result is the preview.
+        """
+        with self._metadata_lock:
+            metadata = self.load_metadata(output_dir) or {}
+            metadata.setdefault("preview", None)
+            metadata.setdefault("transitions", {})
+            if preview:
+                metadata["preview"] = result
+            else:
+                metadata["transitions"][result["from_to"]] = result
+            self.save_metadata(output_dir, metadata, verbose=False)
+
     # -------------------------------------------------------------------------
     # High-Level API
     # -------------------------------------------------------------------------
@@ -363,6 +880,9 @@ class VideoMaterialsGenerator:
         duration: str = DEFAULT_DURATION,
         mode: str = DEFAULT_MODE,
         skip_preview: bool = False,
+        resume: bool = False,
+        opening_boost: int = DEFAULT_OPENING_BOOST,
+        on_playable: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> Dict[str, Any]:
         """
         Generate all video materials (preview + transitions) in one call.
@@ -374,6 +894,12 @@ class VideoMaterialsGenerator:
             duration: Video duration.
             mode: Generation mode.
             skip_preview: Whether to skip preview video generation.
+            resume: Reuse valid videos from an earlier run in output_dir and
+                only send missing or corrupt ones to Kling.
+            opening_boost: Number of opening transitions dispatched ahead of
+                the preview (0 dispatches the preview first).
+            on_playable: Called with the prefix dict every time the playable
+                prefix grows (see PlayablePrefix).
 
         Returns:
             Complete results dict with preview, transitions, and statistics.
@@ -392,31 +918,49 @@ class VideoMaterialsGenerator:
             "failed_count": 0,
         }
 
-        # Generate preview video
-        if not skip_preview:
-            try:
-                preview_result = self.generate_preview_video(
-                    first_slide_path=slides_paths[0],
-                    output_dir=output_dir,
-                    duration=duration,
-                    mode=mode,
+        # Preview and transitions share one pool so the preview occupies a
+        # concurrency slot instead of running serially ahead of the batch
+        previous_preview = None
+        if resume:
+            previous_preview = (self.load_metadata(output_dir) or {}).get("preview") or {}
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+            preview_futures: List[Future] = []
+            dispatch_hooks: Dict[int, Callable[[], None]] = {}
+            if not skip_preview:
+                dispatch_hooks[min(opening_boost, len(slides_paths) - 1)] = (
+                    lambda: preview_futures.append(executor.submit(
+                        self.generate_preview_video,
+                        first_slide_path=slides_paths[0],
+                        output_dir=output_dir,
+                        duration=duration,
+                        mode=mode,
+                        previous=previous_preview,
+                    ))
                 )
-                all_results["preview"] = preview_result
-                all_results["success_count"] += 1
-            except Exception as e:
-                print(f"Warning: Preview generation failed, continuing: {e}")
-                all_results["failed_count"] += 1
-        else:
-            print("Skipping preview video generation")
-
-        # Generate transition videos
-        transition_results = self.generate_transition_videos(
-            slides_paths=slides_paths,
-            output_dir=output_dir,
-            content_contexts=content_contexts,
-            duration=duration,
-            mode=mode,
-        )
+            else:
+                print("Skipping preview video generation")
+
+            # Generate transition videos
+            transition_results = self.generate_transition_videos(
+                slides_paths=slides_paths,
+                output_dir=output_dir,
+                content_contexts=content_contexts,
+                duration=duration,
+                mode=mode,
+                executor=executor,
+                resume=resume,
+                on_playable=on_playable,
+                dispatch_hooks=dispatch_hooks,
+            )
+
+            for preview_future in preview_futures:
+                try:
+                    all_results["preview"] = preview_future.result()
+                    all_results["success_count"] += 1
+                except Exception as e:
+                    print(f"Warning: Preview generation failed, continuing: {e}")
+                    all_results["failed_count"] += 1
 
         all_results["transitions"] = transition_results
 